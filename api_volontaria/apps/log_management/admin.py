@@ -4,6 +4,7 @@ from api_volontaria.apps.log_management.models import (
     Log,
     EmailLog,
 )
+from api_volontaria.pagination import CountPaginator
 
 
 class LogAdmin(admin.ModelAdmin):
@@ -49,6 +50,10 @@ class EmailLogAdmin(admin.ModelAdmin):
         'user_email',
     )
     date_hierarchy = 'created'
+    # The email logs are the largest table, do not count them twice
+    # when filtered and use the cached or estimated counts
+    paginator = CountPaginator
+    show_full_result_count = False
 
 
 admin.site.register(Log, LogAdmin)
@@ -1,7 +1,9 @@
 from django.contrib import admin
 
 from api_volontaria.apps.notification.models import (
-    Notification
+    Notification,
+    OutboxEmail,
 )
 
 admin.site.register(Notification)
+admin.site.register(OutboxEmail)
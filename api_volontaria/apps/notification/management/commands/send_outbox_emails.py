@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api_volontaria.apps.notification.workers import send_pending_emails
+
+
+class Command(BaseCommand):
+    help = 'Send the pending emails of the outbox.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for new emails and the failed ones to '
+                 'retry, instead of exiting.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds between two polls when looping.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            nb_sent = send_pending_emails()
+            if nb_sent:
+                self.stdout.write(f'{nb_sent} email(s) sent')
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('Done'))
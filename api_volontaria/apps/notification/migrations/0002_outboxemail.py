@@ -0,0 +1,38 @@
+# Generated by Django 2.2.12 on 2026-10-17 21:42
+
+from django.db import migrations, models
+import django.utils.timezone
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('to', jsonfield.fields.JSONField(default=list, verbose_name='Recipients')),
+                ('template', models.CharField(blank=True, max_length=150, null=True, verbose_name='Template')),
+                ('context', jsonfield.fields.JSONField(default=dict, verbose_name='Template context')),
+                ('subject', models.CharField(blank=True, max_length=1024, verbose_name='Subject')),
+                ('body', models.TextField(blank=True, verbose_name='Body')),
+                ('html_body', models.TextField(blank=True, null=True, verbose_name='HTML body')),
+                ('from_email', models.CharField(blank=True, max_length=1024, null=True, verbose_name='From')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('SENDING', 'Sending'), ('SENT', 'Sent'), ('FAILED', 'Failed')], default='PENDING', max_length=100, verbose_name='Status')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Attempts')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Next attempt at')),
+                ('last_error', models.TextField(blank=True, null=True, verbose_name='Last error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Creation Date')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Sent at')),
+            ],
+            options={
+                'verbose_name': 'Outbox email',
+                'verbose_name_plural': 'Outbox emails',
+            },
+        ),
+    ]
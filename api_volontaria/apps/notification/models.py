@@ -1,6 +1,9 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.db import models
+from django.utils import timezone
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
@@ -8,6 +11,7 @@ from django.utils.translation import ugettext_lazy as _
 from django.conf import settings
 from api_volontaria import front_end_url
 from api_volontaria.email import EmailAPI
+from jsonfield import JSONField
 
 User = get_user_model()
 
@@ -49,13 +53,26 @@ class Notification(models.Model):
         if send_email:
             self.send_email()
 
-    def send_email(self):
-        EmailAPI().send_template_email(
+    def build_email(self):
+        return EmailAPI().build_template_email(
             self.email,
             self.notification_key,
             self.notification_data
         )
 
+    def send_email(self):
+        EmailAPI().send_messages([self.build_email()])
+
+    @staticmethod
+    def send_emails(notifications):
+        """
+        Send the email of many notifications, like notifications created
+        with bulk_create, over a single email backend connection
+        """
+        EmailAPI().send_messages([
+            notification.build_email() for notification in notifications
+        ])
+
     @classmethod
     def generate_reset_password(
             cls, user):
@@ -76,3 +93,207 @@ class Notification(models.Model):
             email=user.email,
             notification_data=data
         )
+
+
+class OutboxEmail(models.Model):
+    """
+    This class represents an email waiting to be sent.
+    Emails are written to the outbox in the transaction of the action
+    triggering them, and sent by a worker once it is committed, see
+    api_volontaria.apps.notification.workers. Failed attempts are retried
+    with an exponential backoff.
+    """
+
+    STATUS_PENDING = 'PENDING'
+    STATUS_SENDING = 'SENDING'
+    STATUS_SENT = 'SENT'
+    STATUS_FAILED = 'FAILED'
+
+    STATUS_CHOICES = (
+        (STATUS_PENDING, _('Pending')),
+        (STATUS_SENDING, _('Sending')),
+        (STATUS_SENT, _('Sent')),
+        (STATUS_FAILED, _('Failed')),
+    )
+
+    class Meta:
+        verbose_name = _('Outbox email')
+        verbose_name_plural = _('Outbox emails')
+
+    to = JSONField(
+        verbose_name=_('Recipients'),
+        default=list,
+    )
+
+    # Key of the SendinBlue template in ANYMAIL['TEMPLATES'], the
+    # message is then built from the context instead of the other fields
+    template = models.CharField(
+        verbose_name=_('Template'),
+        max_length=150,
+        blank=True,
+        null=True,
+    )
+
+    context = JSONField(
+        verbose_name=_('Template context'),
+        default=dict,
+    )
+
+    subject = models.CharField(
+        verbose_name=_('Subject'),
+        max_length=1024,
+        blank=True,
+    )
+
+    body = models.TextField(
+        verbose_name=_('Body'),
+        blank=True,
+    )
+
+    html_body = models.TextField(
+        verbose_name=_('HTML body'),
+        blank=True,
+        null=True,
+    )
+
+    from_email = models.CharField(
+        verbose_name=_('From'),
+        max_length=1024,
+        blank=True,
+        null=True,
+    )
+
+    status = models.CharField(
+        verbose_name=_('Status'),
+        max_length=100,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+    )
+
+    attempts = models.PositiveIntegerField(
+        verbose_name=_('Attempts'),
+        default=0,
+    )
+
+    # While sending, the time after which the attempt is considered lost,
+    # its worker having been stopped, see claim
+    next_attempt_at = models.DateTimeField(
+        verbose_name=_('Next attempt at'),
+        default=timezone.now,
+    )
+
+    last_error = models.TextField(
+        verbose_name=_('Last error'),
+        blank=True,
+        null=True,
+    )
+
+    created_at = models.DateTimeField(
+        verbose_name=_('Creation Date'),
+        auto_now_add=True,
+    )
+
+    sent_at = models.DateTimeField(
+        verbose_name=_('Sent at'),
+        blank=True,
+        null=True,
+    )
+
+    def __str__(self):
+        return f'{", ".join(self.to)} - {self.template or self.subject}'
+
+    def claim(self):
+        """
+        Mark a pending email as being sent, unless another worker
+        already took it. An email left sending for
+        EMAIL_OUTBOX['SENDING_TIMEOUT'] seconds, its worker having been
+        stopped, can be claimed again, and may then be sent twice.
+        :return: True if the email was claimed by this call
+        """
+        now = timezone.now()
+        if self.status == self.STATUS_SENDING:
+            if self.next_attempt_at > now:
+                return False
+        elif self.status != self.STATUS_PENDING:
+            return False
+
+        lost_at = now + timedelta(
+            seconds=settings.EMAIL_OUTBOX['SENDING_TIMEOUT'],
+        )
+        # Unchanged since loaded, and not taken by another worker
+        is_claimed = OutboxEmail.objects.filter(
+            pk=self.pk,
+            status=self.status,
+            next_attempt_at=self.next_attempt_at,
+        ).update(status=self.STATUS_SENDING, next_attempt_at=lost_at)
+        if is_claimed:
+            self.status = self.STATUS_SENDING
+            self.next_attempt_at = lost_at
+        return bool(is_claimed)
+
+    def build_message(self):
+        """
+        Message to send with EmailAPI.send_messages
+        """
+        if self.template:
+            # Template emails are sent to a single recipient
+            return EmailAPI().build_template_email(
+                self.to[0],
+                self.template,
+                self.context,
+            )
+
+        return EmailAPI().build_email(
+            self.subject,
+            self.body,
+            self.from_email,
+            self.to,
+            html_message=self.html_body,
+        )
+
+    def set_attempt_result(self, error=None):
+        """
+        Record an attempt to send a claimed email, without saving it.
+        A failed attempt is retried after EMAIL_OUTBOX['RETRY_DELAY']
+        seconds, doubled after each attempt, until MAX_ATTEMPTS is reached.
+        :param error: The error that prevented the sending, if any
+        """
+        self.attempts += 1
+        if error is None:
+            self.status = self.STATUS_SENT
+            self.sent_at = timezone.now()
+        else:
+            self.last_error = repr(error)
+            if self.attempts >= settings.EMAIL_OUTBOX['MAX_ATTEMPTS']:
+                self.status = self.STATUS_FAILED
+            else:
+                self.status = self.STATUS_PENDING
+                self.next_attempt_at = timezone.now() + timedelta(
+                    seconds=settings.EMAIL_OUTBOX['RETRY_DELAY'] *
+                    2 ** (self.attempts - 1)
+                )
+
+    def send(self, connection=None):
+        """
+        Send a pending email, unless another worker already took it
+        :param connection: Email backend connection to use, a new one is
+        opened if not given
+        :return: True if the email was sent by this call
+        """
+        if not self.claim():
+            return False
+
+        try:
+            message = self.build_message()
+            EmailAPI().send_messages(
+                [message],
+                connection=connection,
+                fail_silently=True,
+            )
+        except Exception as error:
+            # A claimed email must leave SENDING, to be retried
+            self.set_attempt_result(error)
+        else:
+            self.set_attempt_result(message.send_error)
+        self.save()
+        return self.status == self.STATUS_SENT
@@ -0,0 +1,104 @@
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase
+
+from api_volontaria.apps.log_management.models import EmailLog
+from api_volontaria.apps.notification.models import Notification
+from api_volontaria.email import EmailAPI
+
+
+class EmailAPITests(TestCase):
+
+    def test_send_messages(self):
+        """
+        Ensure many messages are sent over a single connection and logged
+        with a single insert.
+        """
+        email_api = EmailAPI()
+        messages = [
+            email_api.build_email(
+                'Subject',
+                'Body',
+                'email_from@mondomain.ca',
+                [f'volunteer{i}@example.org'],
+                html_message='<p>Body</p>',
+            )
+            for i in range(3)
+        ]
+
+        with mock.patch.object(
+                EmailBackend,
+                'open',
+                autospec=True,
+                return_value=True) as open_connection, \
+                self.assertNumQueries(1):
+            nb_email_sent = email_api.send_messages(messages)
+
+        self.assertEqual(nb_email_sent, 3)
+        self.assertEqual(open_connection.call_count, 1)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(
+            mail.outbox[0].alternatives,
+            [('<p>Body</p>', 'text/html')],
+        )
+        self.assertEqual(
+            EmailLog.objects.filter(type_email='Subject').count(),
+            3,
+        )
+
+    def test_send_messages_fail_silently(self):
+        """
+        Ensure the messages that could not be sent are skipped with their
+        error when failing silently.
+        """
+        email_api = EmailAPI()
+        messages = [
+            email_api.build_email(
+                'Subject',
+                'Body',
+                'email_from@mondomain.ca',
+                [f'volunteer{i}@example.org'],
+            )
+            for i in range(2)
+        ]
+        error = ConnectionError('Provider unavailable')
+
+        with mock.patch.object(
+                EmailBackend,
+                'send_messages',
+                side_effect=[error, 1]):
+            nb_email_sent = email_api.send_messages(
+                messages,
+                fail_silently=True,
+            )
+
+        self.assertEqual(nb_email_sent, 1)
+        self.assertIs(messages[0].send_error, error)
+        self.assertIsNone(messages[1].send_error)
+        self.assertEqual(
+            list(EmailLog.objects.values_list('nb_email_sent', flat=True)),
+            [0, 1],
+        )
+
+    def test_send_notification_emails(self):
+        """
+        Ensure the emails of many notifications are sent as one batch.
+        """
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                notification_key='RESET_PASSWORD',
+                email=f'volunteer{i}@example.org',
+                notification_data={},
+            )
+            for i in range(2)
+        ])
+
+        Notification.send_emails(notifications)
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(
+            EmailLog.objects.filter(type_email='RESET_PASSWORD').count(),
+            2,
+        )
@@ -0,0 +1,156 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from api_volontaria.apps.notification.models import OutboxEmail
+from api_volontaria.apps.notification import workers
+from api_volontaria.apps.notification.workers import send_pending_emails
+
+
+@override_settings(
+    EMAIL_OUTBOX={
+        'WORKER': 'command',
+        'MAX_ATTEMPTS': 3,
+        'RETRY_DELAY': 60,
+        'SENDING_TIMEOUT': 600,
+    }
+)
+class OutboxEmailTests(TestCase):
+
+    def setUp(self):
+        self.email = OutboxEmail.objects.create(
+            to=['volunteer@example.org'],
+            subject='Subject',
+            body='Body',
+            from_email='email_from@mondomain.ca',
+        )
+
+    def test_pending_emails_are_sent(self):
+        """
+        Ensure the pending emails are sent by the management command and
+        are not sent twice.
+        """
+        call_command('send_outbox_emails', stdout=StringIO())
+        call_command('send_outbox_emails', stdout=StringIO())
+
+        self.email.refresh_from_db()
+        self.assertEqual(self.email.status, OutboxEmail.STATUS_SENT)
+        self.assertEqual(self.email.attempts, 1)
+        self.assertIsNotNone(self.email.sent_at)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['volunteer@example.org'])
+
+    @mock.patch(
+        'django.core.mail.backends.locmem.EmailBackend.send_messages',
+        side_effect=ConnectionError('Provider unavailable'),
+    )
+    def test_failed_emails_are_retried_with_backoff(self, send_messages):
+        """
+        Ensure a failed email is retried after a delay doubled after each
+        attempt, until the maximum number of attempts is reached.
+        """
+        for attempt in range(1, 4):
+            self.assertEqual(send_pending_emails(), 0)
+            # Not due yet
+            self.assertEqual(send_pending_emails(), 0)
+
+            self.email.refresh_from_db()
+            self.assertEqual(self.email.attempts, attempt)
+            self.assertIn('Provider unavailable', self.email.last_error)
+            if attempt < 3:
+                self.assertEqual(
+                    self.email.status,
+                    OutboxEmail.STATUS_PENDING,
+                )
+                expected_delay = timedelta(seconds=60 * 2 ** (attempt - 1))
+                delay = self.email.next_attempt_at - timezone.now()
+                self.assertLessEqual(delay, expected_delay)
+                self.assertGreater(
+                    delay,
+                    expected_delay - timedelta(seconds=5),
+                )
+
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+
+        self.assertEqual(self.email.status, OutboxEmail.STATUS_FAILED)
+        self.assertEqual(send_messages.call_count, 3)
+
+    def test_lost_emails_are_sent_again(self):
+        """
+        Ensure an email left sending by a stopped worker is sent again
+        after the timeout, and not before.
+        """
+        self.assertTrue(self.email.claim())
+        self.assertFalse(self.email.claim())
+
+        self.assertEqual(send_pending_emails(), 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+        OutboxEmail.objects.update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1),
+        )
+        self.assertEqual(send_pending_emails(), 1)
+
+        self.email.refresh_from_db()
+        self.assertEqual(self.email.status, OutboxEmail.STATUS_SENT)
+        self.assertEqual(len(mail.outbox), 1)
+
+    @mock.patch(
+        'django.core.mail.backends.locmem.EmailBackend.send_messages',
+        side_effect=ConnectionError('Provider unavailable'),
+    )
+    @mock.patch.object(workers, 'Timer')
+    def test_failed_emails_are_retried_by_the_thread_worker(
+            self, timer, send_messages):
+        """
+        Ensure the thread worker is started again when a failed email is
+        due for its next attempt.
+        """
+        workers._retry_timer = None
+        self.addCleanup(setattr, workers, '_retry_timer', None)
+        workers._send_in_thread()
+
+        self.assertEqual(timer.call_count, 1)
+        delay, callback = timer.call_args[0]
+        self.assertLessEqual(delay, 60)
+        self.assertGreater(delay, 55)
+        timer.return_value.start.assert_called_once_with()
+
+    @mock.patch.object(
+        OutboxEmail,
+        'build_message',
+        side_effect=KeyError('template'),
+    )
+    def test_unbuildable_emails_are_retried(self, build_message):
+        """
+        Ensure an email whose message cannot be built goes back to
+        pending for a later attempt instead of staying claimed.
+        """
+        self.assertEqual(send_pending_emails(), 0)
+
+        self.email.refresh_from_db()
+        self.assertEqual(self.email.status, OutboxEmail.STATUS_PENDING)
+        self.assertEqual(self.email.attempts, 1)
+        self.assertIn('template', self.email.last_error)
+
+    @mock.patch(
+        'api_volontaria.email.EmailAPI.send_messages',
+        side_effect=RuntimeError('Backend misconfigured'),
+    )
+    def test_emails_are_retried_when_sending_raises(self, send_messages):
+        """
+        Ensure the claimed emails go back to pending when the sending
+        raises instead of reporting the errors.
+        """
+        self.assertEqual(send_pending_emails(), 0)
+
+        self.email.refresh_from_db()
+        self.assertEqual(self.email.status, OutboxEmail.STATUS_PENDING)
+        self.assertEqual(self.email.attempts, 1)
+        self.assertIn('Backend misconfigured', self.email.last_error)
@@ -0,0 +1,141 @@
+"""
+Workers sending the emails of the outbox.
+
+With EMAIL_OUTBOX['WORKER'] set to 'thread', pending emails are sent by a
+thread of the process that queued them, once the transaction queuing them
+is committed, and again when the next failed or lost email is due. With
+'command', they are left to the send_outbox_emails management command,
+run with --loop to retry the failed and lost emails.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Timer
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from api_volontaria.apps.notification.models import OutboxEmail
+from api_volontaria.email import EmailAPI
+
+_executor = None
+
+# Timer sending the emails when the next one is due, and its due time
+_retry_timer = None
+_retry_at = None
+_retry_lock = Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        # A single thread sends the emails in the order they were queued
+        _executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix='email_outbox',
+        )
+    return _executor
+
+
+def _send_in_thread():
+    close_old_connections()
+    try:
+        send_pending_emails()
+        _schedule_next_attempt()
+    finally:
+        # Threads of the pool do not go through the request cycle
+        # which closes the connections they open
+        close_old_connections()
+
+
+def _schedule_next_attempt():
+    """
+    Send the emails again when the next of them is due, the failed emails
+    to retry and the lost ones not being queued again
+    """
+    global _retry_timer, _retry_at
+    next_attempt_at = OutboxEmail.objects.filter(
+        status__in=[OutboxEmail.STATUS_PENDING, OutboxEmail.STATUS_SENDING],
+    ).aggregate(Min('next_attempt_at'))['next_attempt_at__min']
+    if next_attempt_at is None:
+        return
+
+    with _retry_lock:
+        if _retry_timer is not None and _retry_timer.is_alive():
+            if _retry_at <= next_attempt_at:
+                return
+            _retry_timer.cancel()
+
+        delay = (next_attempt_at - timezone.now()).total_seconds()
+        _retry_timer = Timer(
+            max(delay, 0),
+            lambda: _get_executor().submit(_send_in_thread),
+        )
+        # Does not keep the process alive
+        _retry_timer.daemon = True
+        _retry_at = next_attempt_at
+        _retry_timer.start()
+
+
+def enqueue_outbox():
+    """
+    Schedule the sending of the pending emails on the configured worker,
+    once the current transaction is committed
+    """
+    if settings.EMAIL_OUTBOX['WORKER'] == 'thread':
+        transaction.on_commit(lambda: _get_executor().submit(_send_in_thread))
+
+
+def send_pending_emails(batch_size=100):
+    """
+    Send all the pending emails due for an attempt, and the ones lost by
+    a stopped worker, oldest first, by batches sent over a single email
+    backend connection
+    :param batch_size: Maximum number of emails loaded at once
+    :return: The number of emails sent
+    """
+    nb_sent = 0
+    now = timezone.now()
+    while True:
+        pending_emails = list(OutboxEmail.objects.filter(
+            status__in=[
+                OutboxEmail.STATUS_PENDING,
+                OutboxEmail.STATUS_SENDING,
+            ],
+            next_attempt_at__lte=now,
+        ).order_by('next_attempt_at', 'pk')[:batch_size])
+        if not pending_emails:
+            break
+
+        emails = [email for email in pending_emails if email.claim()]
+        sent_emails, messages = [], []
+        for email in emails:
+            try:
+                messages.append(email.build_message())
+            except Exception as error:
+                email.set_attempt_result(error)
+            else:
+                sent_emails.append(email)
+
+        try:
+            EmailAPI().send_messages(messages, fail_silently=True)
+        except Exception as error:
+            # Claimed emails must leave SENDING, to be retried
+            errors = [error] * len(messages)
+        else:
+            errors = [message.send_error for message in messages]
+
+        for email, error in zip(sent_emails, errors):
+            email.set_attempt_result(error)
+        nb_sent += sum(
+            email.status == OutboxEmail.STATUS_SENT for email in emails
+        )
+        OutboxEmail.objects.bulk_update(emails, [
+            'status',
+            'attempts',
+            'next_attempt_at',
+            'last_error',
+            'sent_at',
+        ])
+
+    return nb_sent
@@ -1,6 +1,34 @@
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 
+from api_volontaria.caches import LRUCache, invalidate_on_commit
+from api_volontaria.response_cache import invalidate_on_change
+
+# Pages by key, see Page.get_by_key
+_pages_by_key = LRUCache(
+    maxsize=settings.PAGE_CACHE['MAXSIZE'],
+    timeout=settings.PAGE_CACHE['LOCAL_TIMEOUT'],
+)
+
+# Cached for the keys without page
+_MISSING = 'missing'
+
+
+def _shared_cache():
+    alias = settings.PAGE_CACHE['SHARED_CACHE']
+    return caches[alias] if alias else None
+
+
+def _shared_key(key):
+    # Page keys can have characters that memcached does not allow
+    return 'page_by_key:' + md5(key.encode()).hexdigest()
+
 
 class Page(models.Model):
 
@@ -25,5 +53,60 @@ class Page(models.Model):
         auto_now=True,
     )
 
+    def __init__(self, *args, **kwargs):
+        super(Page, self).__init__(*args, **kwargs)
+        # The key the page is cached under, invalidated if it changes
+        self._cached_key = self.__dict__.get('key')
+
     def __str__(self):
         return self.key
+
+    @classmethod
+    def get_by_key(cls, key):
+        """
+        Page of the key, cached in memory by each process and in the
+        shared cache when configured, see the PAGE_CACHE setting.
+        The returned page is shared and should not be modified.
+        :return: The page, None if there is no page with this key
+        """
+        page = _pages_by_key.get(key)
+        if page is not None:
+            return None if page == _MISSING else page
+
+        shared_cache = _shared_cache()
+        if shared_cache is not None:
+            page = shared_cache.get(_shared_key(key))
+        if page is None:
+            page = cls.objects.filter(key=key).first() or _MISSING
+            if shared_cache is not None:
+                shared_cache.set(
+                    _shared_key(key),
+                    page,
+                    settings.PAGE_CACHE['SHARED_TIMEOUT'],
+                )
+
+        _pages_by_key.set(key, page)
+        return None if page == _MISSING else page
+
+    @staticmethod
+    def invalidate_key(key):
+        _pages_by_key.delete(key)
+        shared_cache = _shared_cache()
+        if shared_cache is not None:
+            shared_cache.delete(_shared_key(key))
+
+
+invalidate_on_change(Page)
+
+
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+def invalidate_page_keys(sender, instance, **kwargs):
+    keys = {instance.key, instance._cached_key} - {None}
+    instance._cached_key = instance.key
+
+    def invalidate():
+        for key in keys:
+            Page.invalidate_key(key)
+
+    invalidate_on_commit(invalidate)
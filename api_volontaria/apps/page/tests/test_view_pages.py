@@ -0,0 +1,151 @@
+import json
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.urls import reverse
+from django.test.utils import override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api_volontaria.apps.page.models import Page, _pages_by_key
+from api_volontaria.factories import AdminFactory
+from api_volontaria.testClasses import CustomAPITestCase
+
+
+class PagesTests(CustomAPITestCase):
+
+    ATTRIBUTES = [
+        'id',
+        'url',
+        'key',
+        'content',
+        'created_at',
+        'updated_at',
+    ]
+
+    def setUp(self):
+        self.client = APIClient()
+
+        self.admin = AdminFactory()
+        self.admin.set_password('Test123!')
+        self.admin.save()
+
+        self.page = Page.objects.create(
+            key='home',
+            content='Welcome',
+        )
+        _pages_by_key.clear()
+        self.addCleanup(_pages_by_key.clear)
+
+    def test_retrieve_page_by_key(self):
+        """
+        Ensure we can get a page by its key without being logged in, the
+        page being cached.
+        """
+        url = reverse('page-by-key', args=['home'])
+        response = self.client.get(url)
+
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.check_attributes(content)
+        self.assertEqual(content['content'], 'Welcome')
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_page_by_unknown_key(self):
+        """
+        Ensure a missing page is not found, until it is created.
+        """
+        url = reverse('page-by-key', args=['about'])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        Page.objects.create(key='about', content='About us')
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)['content'], 'About us')
+
+    def test_retrieve_page_by_key_after_change(self):
+        """
+        Ensure the cached page is invalidated when it is updated, renamed
+        or deleted.
+        """
+        url = reverse('page-by-key', args=['home'])
+        self.client.get(url)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.patch(
+            reverse('page-detail', args=[self.page.id]),
+            {'content': 'Welcome back'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(url)
+        self.assertEqual(
+            json.loads(response.content)['content'],
+            'Welcome back',
+        )
+
+        self.page.refresh_from_db()
+        self.page.key = 'index'
+        self.page.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        url = reverse('page-by-key', args=['index'])
+        self.client.get(url)
+        self.page.delete()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(PAGE_CACHE={
+        'MAXSIZE': 256,
+        'LOCAL_TIMEOUT': 10,
+        'SHARED_CACHE': 'default',
+        'SHARED_TIMEOUT': 60,
+    })
+    def test_retrieve_page_by_key_from_shared_cache(self):
+        """
+        Ensure the pages missing from the memory of the process are read
+        from the shared cache, which is invalidated on change.
+        """
+        self.addCleanup(caches['default'].clear)
+        url = reverse('page-by-key', args=['home'])
+        self.client.get(url)
+        _pages_by_key.clear()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(json.loads(response.content)['content'], 'Welcome')
+
+        _pages_by_key.clear()
+        self.page.content = 'Welcome back'
+        self.page.save()
+        response = self.client.get(url)
+        self.assertEqual(
+            json.loads(response.content)['content'],
+            'Welcome back',
+        )
+
+    def test_page_cache_timeout(self):
+        """
+        Ensure the pages are read again once the timeout of the memory
+        of the process is over.
+        """
+        with patch('api_volontaria.caches.monotonic', return_value=0):
+            Page.get_by_key('home')
+        Page.objects.filter(pk=self.page.pk).update(content='Welcome back')
+
+        with patch('api_volontaria.caches.monotonic', return_value=5):
+            self.assertEqual(Page.get_by_key('home').content, 'Welcome')
+        with patch('api_volontaria.caches.monotonic', return_value=10):
+            self.assertEqual(Page.get_by_key('home').content, 'Welcome back')
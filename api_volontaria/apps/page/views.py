@@ -1,10 +1,14 @@
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
 from dry_rest_permissions.generics import (
     DRYPermissions,
     DRYPermissionFiltersBase,
 )
+from api_volontaria.conditional import ConditionalGetMixin
+from api_volontaria.response_cache import CachedResponseMixin
 from api_volontaria.apps.page.serializers import (
     PageSerializer,
 )
@@ -13,19 +17,32 @@ from .models import (
 )
 
 
-class PageViewSet(viewsets.ModelViewSet):
+class PageViewSet(ConditionalGetMixin, CachedResponseMixin,
+                  viewsets.ModelViewSet):
 
     serializer_class = PageSerializer
     queryset = Page.objects.all()
+    cached_models = (Page,)
     filterset_fields = {
         'key': ['exact'],
     }
     permission_classes = (DRYPermissions, DjangoFilterBackend)
 
     def get_permissions(self):
-        if self.action in ['list']:
+        if self.action in ['list', 'by_key']:
             permission_classes = []
         else:
             permission_classes = [IsAdminUser]
 
         return [permission() for permission in permission_classes]
+
+    @action(detail=False, url_path=r'by-key/(?P<key>[^/]+)')
+    def by_key(self, request, key=None):
+        """
+        Page of the key, from the cache of Page.get_by_key and without
+        the filter backends of the list
+        """
+        page = Page.get_by_key(key)
+        if page is None:
+            raise NotFound()
+        return self.get_instance_response(request, page)
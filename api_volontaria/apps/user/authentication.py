@@ -1,6 +1,9 @@
 from rest_framework import exceptions
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.authentication import get_authorization_header
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.permissions import AllowAny, SAFE_METHODS
 
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
@@ -46,10 +49,8 @@ class APITokenAuthentication(BaseAuthentication):
         return self.authenticate_credentials(token)
 
     def authenticate_credentials(self, key):
-        model = self.get_model()
-        try:
-            token = model.objects.select_related('user').get(key=key)
-        except model.DoesNotExist:
+        token = self.get_model().get_by_key(key)
+        if token is None:
             raise exceptions.AuthenticationFailed(_('Invalid token.'))
 
         if not token.user.is_active:
@@ -59,3 +60,61 @@ class APITokenAuthentication(BaseAuthentication):
 
     def authenticate_header(self, request):
         return self.keyword
+
+
+class DispatchingAuthentication(BaseAuthentication):
+    """
+    Single authentication class reading the scheme of the Authorization
+    header once and only calling the token authentication of this
+    scheme, instead of trying each authentication class in turn.
+
+    Requests without token fall back to the session authentication,
+    except the safe requests to the endpoints allowing anonymous access,
+    which are not authenticated so that their session is not loaded.
+    """
+
+    token_authentication_classes = (
+        APITokenAuthentication,
+        TokenAuthentication,
+    )
+    session_authentication_class = SessionAuthentication
+
+    def __init__(self):
+        self.token_authentications = {
+            authentication_class.keyword.lower().encode():
+                authentication_class()
+            for authentication_class in self.token_authentication_classes
+        }
+        self.session_authentication = self.session_authentication_class()
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if auth:
+            authentication = self.token_authentications.get(auth[0].lower())
+            if authentication is not None:
+                return authentication.authenticate(request)
+
+        if self.allows_anonymous(request):
+            return None
+        return self.session_authentication.authenticate(request)
+
+    @staticmethod
+    def allows_anonymous(request):
+        """
+        Whether the request is a safe one to an endpoint without
+        permissions, or only allowing anyone
+        """
+        if request.method not in SAFE_METHODS:
+            return False
+        view = request.parser_context.get('view')
+        if view is None:
+            return False
+        return all(
+            isinstance(permission, AllowAny)
+            for permission in view.get_permissions()
+        )
+
+    def authenticate_header(self, request):
+        # The one of the first authentication class, as before
+        authentication = self.token_authentication_classes[0]
+        return authentication().authenticate_header(request)
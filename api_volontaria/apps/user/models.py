@@ -1,8 +1,12 @@
 import binascii
 import os
+from hashlib import md5
 
 from django.contrib.auth.models import AbstractUser
+from django.core.cache import caches
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from django.utils.translation import ugettext_lazy as _
 
@@ -13,6 +17,50 @@ from django.conf import settings
 from dry_rest_permissions.generics import DRYPermissions,\
     authenticated_users
 
+from api_volontaria.caches import (
+    LRUCache,
+    get_generation,
+    invalidate_on_commit,
+    new_generations,
+)
+
+# API tokens by key, see APIToken.get_by_key
+_api_tokens = LRUCache(
+    maxsize=settings.API_TOKEN_CACHE['MAXSIZE'],
+    timeout=settings.API_TOKEN_CACHE['TIMEOUT'],
+)
+
+
+def _shared_cache():
+    alias = settings.API_TOKEN_CACHE['SHARED_CACHE']
+    return caches[alias] if alias else None
+
+
+def _generation_key(key):
+    return 'api_token:generation:' + md5(key.encode()).hexdigest()
+
+
+def _get_generation(key):
+    # Changed when the token or its user changes in any process, the
+    # tokens cached in memory under another generation being read again
+    shared_cache = _shared_cache()
+    if shared_cache is None:
+        return None
+    return get_generation(shared_cache, _generation_key(key))
+
+
+def _new_generations(keys):
+    shared_cache = _shared_cache()
+    if shared_cache is not None:
+        new_generations(shared_cache, map(_generation_key, keys))
+
+
+def _field_values(instance):
+    return [
+        getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+    ]
+
 
 class User(AbstractUser):
     """Abstraction of the base User model. Needed to extend in the future."""
@@ -265,6 +313,11 @@ class APIToken(models.Model):
 
         unique_together = [['user', 'purpose']]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The key the token is cached under, invalidated if it changes
+        self._cached_key = self.__dict__.get('key')
+
     def save(self, *args, **kwargs):
         if not self.key:
             self.key = self.generate_key()
@@ -274,6 +327,36 @@ class APIToken(models.Model):
     def generate_key(cls):
         return binascii.hexlify(os.urandom(20)).decode()
 
+    @classmethod
+    def get_by_key(cls, key):
+        """
+        Token of the key with its user, cached in memory by each process
+        and checked against its generation in the shared cache, see the
+        API_TOKEN_CACHE setting. The cache keeps the values of their
+        fields, each call returning new instances.
+        :return: The token, None if there is no token with this key
+        """
+        # Read before the database, a change in between being seen by the
+        # next call
+        generation = _get_generation(key)
+        cached = _api_tokens.get(key)
+        if cached is None or cached[0] != generation:
+            token = cls.objects.select_related('user').filter(key=key).first()
+            if token is not None:
+                _api_tokens.set(key, (
+                    generation,
+                    token._state.db,
+                    _field_values(token),
+                    _field_values(token.user),
+                ))
+            return token
+
+        _, db, token_values, user_values = cached
+        token = cls.from_db(db, None, token_values)
+        user_model = cls._meta.get_field('user').related_model
+        token.user = user_model.from_db(db, None, user_values)
+        return token
+
     # Permissions: 
     # Only an admin can create, update and destroy API tokens
     # Users can only see a list of their own API tokens
@@ -298,3 +381,32 @@ class APIToken(models.Model):
 
     def __str__(self):
         return self.key
+
+
+def _invalidate_api_tokens(keys):
+    def invalidate():
+        for key in keys:
+            _api_tokens.delete(key)
+        # The tokens cached by the other processes
+        _new_generations(keys)
+
+    invalidate_on_commit(invalidate)
+
+
+@receiver(post_save, sender=APIToken)
+@receiver(post_delete, sender=APIToken)
+def invalidate_api_token(sender, instance, **kwargs):
+    _invalidate_api_tokens({instance.key, instance._cached_key} - {None})
+    instance._cached_key = instance.key
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_api_tokens(sender, instance, created, update_fields,
+                               **kwargs):
+    # Like a deactivation, any change of the user is cached with its
+    # tokens, except its last login
+    if created or update_fields and set(update_fields) == {'last_login'}:
+        return
+    _invalidate_api_tokens(list(
+        APIToken.objects.filter(user=instance).values_list('key', flat=True)
+    ))
@@ -6,6 +6,7 @@ import pytz
 # Third-party libraries
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 from django.conf import settings
 from django.test import TestCase
@@ -20,7 +21,7 @@ from api_volontaria.apps.position.models import (
     Application,
 )
 from api_volontaria.testClasses import CustomAPITestCase
-from ..models import APIToken
+from ..models import APIToken, User, _new_generations
 
 
 LOCAL_TIMEZONE = pytz.timezone(settings.TIME_ZONE)
@@ -321,3 +322,142 @@ class CustomAPITokenAuthTests(BaseTokenAuthTests, TestCase):
     model = APIToken
     path = '/applications/'
     header_prefix = 'APIToken '
+
+    def test_post_json_with_cached_token_makes_no_db_query(self):
+        """
+        Ensure the token is read from the cache once used
+        """
+        auth = self.header_prefix + self.key
+        self.csrf_client.post(
+            self.path, {'example': 'example'},
+            format='json', HTTP_AUTHORIZATION=auth
+        )
+
+        def func_to_test():
+            return self.csrf_client.post(
+                self.path, {'example': 'example'},
+                format='json', HTTP_AUTHORIZATION=auth
+            )
+
+        self.assertNumQueries(0, func_to_test)
+
+    def test_fail_post_with_deleted_cached_token(self):
+        """
+        Ensure a cached token can't be used once deleted
+        """
+        auth = self.header_prefix + self.key
+        self.csrf_client.post(
+            self.path, {'example': 'example'},
+            format='json', HTTP_AUTHORIZATION=auth
+        )
+
+        self.token.delete()
+        response = self.csrf_client.post(
+            self.path, {'example': 'example'},
+            format='json', HTTP_AUTHORIZATION=auth
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_fail_post_with_cached_token_of_deactivated_user(self):
+        """
+        Ensure a cached token can't be used once its user is deactivated
+        """
+        auth = self.header_prefix + self.key
+        self.csrf_client.post(
+            self.path, {'example': 'example'},
+            format='json', HTTP_AUTHORIZATION=auth
+        )
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.csrf_client.post(
+            self.path, {'example': 'example'},
+            format='json', HTTP_AUTHORIZATION=auth
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_fail_post_with_token_revoked_by_another_process(self):
+        """
+        Ensure a cached token can't be used once its user is deactivated
+        by another process, which only changes its shared generation
+        """
+        auth = self.header_prefix + self.key
+        self.csrf_client.post(
+            self.path, {'example': 'example'},
+            format='json', HTTP_AUTHORIZATION=auth
+        )
+
+        # Without the signals of this process
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        _new_generations([self.key])
+        response = self.csrf_client.post(
+            self.path, {'example': 'example'},
+            format='json', HTTP_AUTHORIZATION=auth
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class DispatchingAuthenticationTests(TestCase):
+    """ Testing the authentication of the requests by the scheme of
+    their Authorization header, or by their session
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserFactory()
+        self.api_token = APIToken.objects.create(
+            key='abcd1234',
+            user=self.user,
+            purpose="Helpful service",
+        )
+        self.token = Token.objects.create(user=self.user)
+
+    def test_authenticate_with_each_token_scheme(self):
+        """
+        Ensure the API tokens and the tokens are both accepted
+        """
+        for auth in ['APIToken abcd1234', f'Token {self.token.key}']:
+            response = self.client.get(
+                reverse('participation-list'),
+                HTTP_AUTHORIZATION=auth,
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(
+            reverse('participation-list'),
+            HTTP_AUTHORIZATION='Token abcd1234',
+        )
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.assertEqual(response['WWW-Authenticate'], 'APIToken')
+
+    def test_authenticate_with_session(self):
+        """
+        Ensure the requests without token are authenticated by their
+        session, whatever their other Authorization schemes
+        """
+        self.client.force_login(self.user)
+
+        for auth in ['', 'Basic dXNlcjpwYXNzd29yZA==']:
+            response = self.client.get(
+                reverse('participation-list'),
+                HTTP_AUTHORIZATION=auth,
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_session_not_loaded_for_anonymous_endpoints(self):
+        """
+        Ensure the session is not loaded by the safe requests to the
+        endpoints allowing anonymous access
+        """
+        self.client.force_login(self.user)
+
+        # One query for the version of the list, one for the count, one
+        # for the page, without the ones of the session and its user
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('cell-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Cache'], 'MISS')
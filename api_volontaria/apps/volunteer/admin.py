@@ -6,6 +6,7 @@ from api_volontaria.apps.volunteer.models import (
     TaskType,
     Participation,
     Cell,
+    BulkImport,
 )
 
 
@@ -126,3 +127,4 @@ admin.site.register(Event, EventAdmin)
 admin.site.register(TaskType)
 admin.site.register(Participation, ParticipationAdmin)
 admin.site.register(Cell)
+admin.site.register(BulkImport)
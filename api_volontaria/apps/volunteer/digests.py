@@ -0,0 +1,142 @@
+"""
+Digests reminding the volunteers of their upcoming participations.
+
+Instead of one email per participation, the participations starting soon
+that were not reminded yet are read in a single query ordered by user,
+and each user is sent one email listing all of them. Meant to be run on a
+schedule (cron, systemd timer...) with the send_reminder_digests
+management command.
+"""
+from itertools import groupby
+from operator import attrgetter
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from api_volontaria.apps.notification.models import OutboxEmail
+from api_volontaria.apps.notification.workers import enqueue_outbox
+from api_volontaria.apps.volunteer.models import Participation
+from api_volontaria.email import render_email
+
+
+def get_participations_to_remind(start, end):
+    """
+    Participations to events starting between start and end that were not
+    part of a digest yet, ordered by user
+    """
+    return Participation.objects.filter(
+        event__start_time__gte=start,
+        event__start_time__lt=end,
+        reminded_at__isnull=True,
+    ).select_related(
+        'user',
+        'event__cell',
+        'event__task_type',
+    ).order_by(
+        'user_id',
+        'event__start_time',
+        'pk',
+    )
+
+
+def build_reminder_digest(user, participations):
+    """
+    Email reminding the user of the given participations, not yet queued
+    :return: The unsaved outbox email
+    """
+    context = {
+        'USER': {
+            'FIRST_NAME': user.first_name,
+            'LAST_NAME': user.last_name,
+        },
+        'PARTICIPATIONS': [
+            participation.get_email_context()
+            for participation in participations
+        ],
+        'ORGANIZATION_NAME': settings.LOCAL_SETTINGS['ORGANIZATION'],
+    }
+
+    TEMPLATES = settings.ANYMAIL.get('TEMPLATES')
+    id = TEMPLATES.get('REMINDER_DIGEST')
+    if id:
+        return OutboxEmail(
+            to=[user.email],
+            template='REMINDER_DIGEST',
+            context=context,
+        )
+    else:
+        plain_msg, msg_html = render_email(
+            'participation_reminder_digest',
+            context,
+        )
+
+        return OutboxEmail(
+            to=[user.email],
+            subject="Objet: Rappel de vos prochaines activités",
+            body=plain_msg,
+            from_email="email_from@mondomain.ca",
+            html_body=msg_html,
+        )
+
+
+def _queue(emails, participation_ids, batch_size):
+    with transaction.atomic():
+        OutboxEmail.objects.bulk_create(emails)
+        now = timezone.now()
+        for i in range(0, len(participation_ids), batch_size):
+            Participation.objects.filter(
+                pk__in=participation_ids[i:i + batch_size],
+            ).update(reminded_at=now)
+        enqueue_outbox()
+
+
+def queue_reminder_digests(start, end, batch_size=None):
+    """
+    Queue in the outbox one digest per user having participations to
+    remind between start and end, and mark these participations as
+    reminded.
+
+    The participations are streamed from a single query, and the digests
+    are queued every batch_size participations, so that the memory used
+    does not depend on the number of participations.
+    :return: The number of digests queued and of participations reminded
+    """
+    batch_size = batch_size or settings.REMINDER_DIGESTS['BATCH_SIZE']
+    participations = get_participations_to_remind(start, end)
+
+    nb_digests = 0
+    nb_reminded = 0
+    emails = []
+    participation_ids = []
+
+    # The participations already read are the only ones updated while
+    # iterating, and they no longer match the query anyway
+    users_participations = groupby(
+        participations.iterator(chunk_size=batch_size),
+        key=attrgetter('user_id'),
+    )
+    for user_id, user_participations in users_participations:
+        user_participations = list(user_participations)
+        emails.append(build_reminder_digest(
+            user_participations[0].user,
+            user_participations,
+        ))
+        participation_ids += [
+            participation.pk for participation in user_participations
+        ]
+
+        # Digests of a user are never split between two batches
+        if len(participation_ids) >= batch_size:
+            _queue(emails, participation_ids, batch_size)
+            nb_digests += len(emails)
+            nb_reminded += len(participation_ids)
+            emails = []
+            participation_ids = []
+
+    if emails:
+        _queue(emails, participation_ids, batch_size)
+        nb_digests += len(emails)
+        nb_reminded += len(participation_ids)
+
+    return nb_digests, nb_reminded
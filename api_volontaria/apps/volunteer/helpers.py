@@ -1,9 +1,45 @@
+import json
+from bisect import bisect_right
+from collections.abc import Sequence
+from contextlib import nullcontext
 from csv import DictReader
-from dataclasses import dataclass
-from typing import Dict, List, Type, TextIO
+from dataclasses import dataclass, field
+from io import TextIOBase, TextIOWrapper
+from itertools import chain, islice
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TextIO,
+)
+from urllib import parse
+from zipfile import BadZipFile
 
-from django.db import transaction
-from rest_framework.serializers import Serializer
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Model
+from django.dispatch import Signal
+from django.urls import Resolver404, get_script_prefix, resolve
+from django.utils.encoding import uri_to_iri
+from rest_framework.relations import (
+    HyperlinkedRelatedField,
+    PrimaryKeyRelatedField,
+)
+from rest_framework.serializers import ModelSerializer, Serializer
+from rest_framework.utils import model_meta
+from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
+
+
+# Sent with the elements inserted or updated by a bulk adding, for which
+# the post_save signal is not sent
+post_bulk_create = Signal(providing_args=['instances'])
+post_bulk_update = Signal(providing_args=['instances'])
 
 
 class InvalidBulkUpdate(Exception):
@@ -23,76 +59,714 @@ class AddBulkConfig:
     serializer: Type[Serializer]
     format: str
     mapping: Dict[str, str]
+    # Maximum number of elements inserted per query
+    batch_size: int = 500
+    # Fields identifying an existing element, which is then updated
+    # with the data of the row instead of adding a new element
+    upsert_key: Tuple[str, ...] = ()
+    # Context given to the serializer, like the request
+    context: Dict[str, Any] = field(default_factory=dict)
+
+
+class IdRanges(Sequence):
+    """
+    Read-only sequence of the ids contained in a list of [first, last]
+    ranges, which can be paginated without expanding all the ids
+    """
+    def __init__(self, ranges: List[List[int]]):
+        self.ranges = ranges
+        # Index of the first id of each range in the sequence
+        self.offsets = [0]
+        for first, last in ranges:
+            self.offsets.append(self.offsets[-1] + last - first + 1)
 
+    def __len__(self):
+        return self.offsets[-1]
 
-def add_bulk_from_file(file_data: TextIO, config: AddBulkConfig) -> List[int]:
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('id index out of range')
+
+        range_index = bisect_right(self.offsets, index) - 1
+        first, _ = self.ranges[range_index]
+        return first + index - self.offsets[range_index]
+
+
+@dataclass
+class BulkAddSummary:
+    """
+    Summary of a bulk adding, the created ids being stored as ranges
+    of consecutive ids
+    """
+    nb_rows: int = 0
+    nb_created: int = 0
+    nb_updated: int = 0
+    nb_unchanged: int = 0
+    created_ranges: List[List[int]] = field(default_factory=list)
+
+    def add_ids(self, ids: Iterable[int]):
+        for id_ in ids:
+            self.nb_created += 1
+            if self.created_ranges and self.created_ranges[-1][1] + 1 == id_:
+                self.created_ranges[-1][1] = id_
+            else:
+                self.created_ranges.append([id_, id_])
+
+    @property
+    def created_ids(self) -> IdRanges:
+        return IdRanges(self.created_ranges)
+
+
+def add_bulk_from_file(file_data: IO, config: AddBulkConfig) -> List[int]:
     """
     Add all the elements defined in the file_data according to the
     given configuration
-    Supported formats: csv
+    Supported formats: the ones registered in BULK_READERS
 
-    :param file_data: Sequence of lines containing the events
+    :param file_data: Text or binary file containing the events
     :param config: Configuration that should be used for the adding
     :return: The ids of the added events
     """
+    return list(stream_bulk_from_file(file_data, config).created_ids)
+
+
+def stream_bulk_from_file(
+        file_data: IO,
+        config: AddBulkConfig,
+        progress: Optional[Callable[[BulkAddSummary], None]] = None,
+        atomic: bool = True) -> BulkAddSummary:
+    """
+    Add all the elements defined in the file_data according to the
+    given configuration, reading and inserting config.batch_size elements
+    at a time so that memory use does not depend on the size of the file.
+    Supported formats: the ones registered in BULK_READERS
+
+    :param file_data: Text or binary file containing the events
+    :param config: Configuration that should be used for the adding
+    :param progress: Called with the summary after each chunk
+    :param atomic: If True nothing is added if any of the elements is
+    invalid, otherwise each chunk is committed on its own, and the
+    elements of the chunks preceding an invalid element are kept
+    :return: The summary of the added and updated events
+    """
+    try:
+        reader = BULK_READERS[config.format]
+    except KeyError:
+        raise InvalidBulkUpdate(f"Unknown file type {config.format}")
 
-    if config.format == "csv":
-        return _add_bulk_from_csv(file_data, config)
+    check_upsert_key(config)
+    rows = reader(file_data, config)
+
+    summary = BulkAddSummary()
+    # Related objects already fetched, shared by all the chunks
+    resolved_objects = {}
+    with transaction.atomic() if atomic else nullcontext():
+        while True:
+            chunk = list(islice(rows, config.batch_size))
+            if not chunk:
+                break
+
+            # Without a global transaction each chunk is committed alone
+            with nullcontext() if atomic else transaction.atomic():
+                created, updated, unchanged = _save_elements(
+                    chunk,
+                    config,
+                    resolved_objects,
+                )
+            summary.add_ids(element.pk for element in created)
+            summary.nb_updated += len(updated)
+            summary.nb_unchanged += len(unchanged)
+            summary.nb_rows += len(chunk)
 
-    raise InvalidBulkUpdate(f"Unknown file type {config.format}")
+            if progress is not None:
+                progress(summary)
 
+    return summary
 
-def _add_bulk_from_csv(file_data: TextIO, config: AddBulkConfig) -> List[int]:
+
+# Line number and data of an element read from a file
+Row = Tuple[int, Dict[str, Any]]
+
+# Readers of the supported file formats, by format. A reader checks that
+# the file can be used with the configuration then lazily yields its rows.
+BULK_READERS: Dict[str, Callable[[IO, AddBulkConfig], Iterator[Row]]] = {}
+
+
+def bulk_reader(format_: str):
     """
-    Add all the elements defined in the csv file represented by file_data,
-    according to the given configuration
+    Register the decorated function as the reader of the files of the
+    given format
 
-    :param file_data: Sequence of lines containing the events
+    :param format_: Value of AddBulkConfig.format handled by the reader
+    """
+    def register(reader):
+        BULK_READERS[format_] = reader
+        return reader
+
+    return register
+
+
+@bulk_reader('csv')
+def _read_csv(file_data: IO, config: AddBulkConfig) -> Iterator[Row]:
+    """
+    Lazily read the elements defined in the csv file represented by
+    file_data, according to the given configuration
+
+    :param file_data: Text or binary file containing the events
     :param config: Configuration that should be used for the adding
-    :return: The ids of the added events
+    :return: Iterator on the line number and the data of each element
+    """
+    reader = DictReader(_text_stream(file_data))
+    _check_keys(reader.fieldnames or [], config)
+
+    # The first line of a csv file is its header
+    return (
+        (line, _map_row(data, config.mapping))
+        for line, data in enumerate(reader, 2)
+    )
+
+
+@bulk_reader('jsonl')
+def _read_jsonl(file_data: IO, config: AddBulkConfig) -> Iterator[Row]:
     """
+    Lazily read the elements defined in the JSON Lines file represented by
+    file_data, one JSON object per line, according to the given
+    configuration. The keys of the first object are checked like the
+    header of a csv file.
+
+    :param file_data: Text or binary file containing the events
+    :param config: Configuration that should be used for the adding
+    :return: Iterator on the line number and the data of each element
+    """
+    rows = _iter_jsonl(_text_stream(file_data))
+    first_row = next(rows, None)
+    _check_keys(first_row[1] if first_row else [], config)
+
+    if first_row is None:
+        return iter([])
+
+    return (
+        (line, _map_row(data, config.mapping))
+        for line, data in chain([first_row], rows)
+    )
+
+
+def _iter_jsonl(lines: Iterable[str]) -> Iterator[Row]:
+    for line, text in enumerate(lines, 1):
+        if not text.strip():
+            continue
+
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise InvalidBulkUpdate(
+                f"Line {line} of the jsonl file is not valid json: {e}"
+            )
+        if not isinstance(data, dict):
+            raise InvalidBulkUpdate(
+                f"Line {line} of the jsonl file should be a json object"
+            )
+
+        yield line, data
+
+
+@bulk_reader('xlsx')
+def _read_xlsx(file_data: IO, config: AddBulkConfig) -> Iterator[Row]:
+    """
+    Lazily read the elements defined in the first worksheet of the xlsx
+    file represented by file_data, according to the given configuration.
+    The first row of the worksheet is its header, and empty cells are
+    treated as missing values.
+
+    :param file_data: Binary file containing the events
+    :param config: Configuration that should be used for the adding
+    :return: Iterator on the line number and the data of each element
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise InvalidBulkUpdate("openpyxl is required to read xlsx files")
+
+    if isinstance(file_data, TextIOBase):
+        if not hasattr(file_data, 'buffer'):
+            raise InvalidBulkUpdate("xlsx files should be read as binary")
+        file_data = file_data.buffer
+
+    try:
+        # The read-only mode loads the rows as they are iterated on
+        workbook = load_workbook(file_data, read_only=True, data_only=True)
+    except (BadZipFile, KeyError, ValueError) as e:
+        raise InvalidBulkUpdate(f"Invalid xlsx file: {e}")
+
+    rows = workbook.active.iter_rows(values_only=True)
+    header = [
+        str(key) if key is not None else ''
+        for key in next(rows, ())
+    ]
+    try:
+        _check_keys(header, config)
+    except InvalidBulkUpdate:
+        workbook.close()
+        raise
+
+    return _iter_xlsx(workbook, header, rows, config)
+
+
+def _iter_xlsx(workbook, header, rows, config) -> Iterator[Row]:
+    try:
+        for line, values in enumerate(rows, 2):
+            data = {
+                key: value
+                for key, value in zip(header, values)
+                if value is not None
+            }
+            if data:
+                yield line, _map_row(data, config.mapping)
+    finally:
+        workbook.close()
+
+
+def _text_stream(file_data: IO) -> TextIO:
+    """
+    Text stream of file_data, decoding it as utf-8 if it is binary
+    """
+    if isinstance(file_data, TextIOBase):
+        return file_data
+    return TextIOWrapper(file_data, encoding='utf-8')
+
+
+def _map_row(data: Dict[str, Any], mapping: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Rename the keys of data according to the mapping, dropping the keys
+    that are not mapped. Without a mapping data is returned unchanged.
+    """
+    if not mapping:
+        return data
+
+    return {
+        mapping[key]: value
+        for key, value in data.items()
+        if key in mapping
+    }
+
+
+def check_upsert_key(config: AddBulkConfig):
+    """
+    Ensure that the upsert key of the configuration can be used to match
+    existing elements: its fields should be writable fields of a model
+    serializer named like the fields of the model
+
+    :param config: Configuration that should be used for the adding
+    :raise: InvalidBulkUpdate if the upsert key cannot be used
+    """
+    if not config.upsert_key:
+        return
+
+    serializer = config.serializer()
+    if (not isinstance(serializer, ModelSerializer) or
+            type(serializer).create is not ModelSerializer.create):
+        raise InvalidBulkUpdate(
+            "Upsert is not supported for these elements"
+        )
 
-    reader = DictReader(file_data)
-    _check_csv_keys(reader, config)
+    info = model_meta.get_field_info(serializer.Meta.model)
+    if any(
+            relation_info.to_many and
+            field_name in serializer.fields and
+            not serializer.fields[field_name].read_only
+            for field_name, relation_info in info.relations.items()):
+        raise InvalidBulkUpdate(
+            "Upsert is not supported for elements with many-to-many "
+            "relations"
+        )
 
-    ids = []
-    with transaction.atomic():
-        for i, data in enumerate(reader, 2):
-            if config.mapping:
-                data = {
-                    config.mapping[key]: value
-                    for key, value in data.items()
-                    if key in config.mapping
-                }
+    invalid_keys = {
+        name
+        for name in config.upsert_key
+        if name not in serializer.fields or
+        serializer.fields[name].read_only or
+        serializer.fields[name].source != name or
+        name not in info.fields and name not in info.forward_relations
+    }
+    if invalid_keys:
+        raise InvalidBulkUpdate(
+            "The following fields of the upsert key cannot be used to "
+            f"identify the elements: {invalid_keys}"
+        )
 
-            serializer = config.serializer(data=data)
-            if not serializer.is_valid():
+
+def _save_elements(
+        rows: List[Row],
+        config: AddBulkConfig,
+        resolved_objects: Dict[str, Dict]
+) -> Tuple[List[Model], List[Model], List[Model]]:
+    """
+    Validate all the rows at once then insert or update the resulting
+    elements with as few queries as possible
+
+    :param rows: Line number and data of the elements to save
+    :param config: Configuration that should be used for the adding
+    :param resolved_objects: Related objects already fetched, by field
+    :return: The created, updated and unchanged elements
+    """
+    lines = [line for line, _ in rows]
+    data = [row for _, row in rows]
+    serializer = config.serializer(
+        data=data,
+        many=True,
+        context=config.context,
+    )
+    _resolve_related_fields(serializer.child, data, resolved_objects)
+    if config.upsert_key:
+        _remove_upsert_key_validators(serializer.child, config.upsert_key)
+
+    if not serializer.is_valid():
+        for line, errors in zip(lines, serializer.errors):
+            if errors:
                 raise InvalidBulkUpdate(
                     f"The following error happened during deserialization "
-                    f"of line {i} of the csv file: {serializer.errors}"
+                    f"of line {line} of the {config.format} file: {errors}"
                 )
-            element = serializer.save()
-            ids.append(element.id)
 
-    return ids
+    # Serializers with their own creation logic create the elements
+    # one by one, as serializer.save() would
+    if (not isinstance(serializer.child, ModelSerializer) or
+            type(serializer.child).create is not ModelSerializer.create):
+        created = [
+            serializer.child.create(validated_data)
+            for validated_data in serializer.validated_data
+        ]
+        return created, [], []
+
+    model = serializer.child.Meta.model
+    validated_data = serializer.validated_data
+    updated = unchanged = []
+    try:
+        if config.upsert_key:
+            validated_data, updated, unchanged = _update_existing(
+                model,
+                list(zip(lines, validated_data)),
+                config,
+            )
+
+        created = _bulk_insert(model, validated_data, config.batch_size)
+    except IntegrityError as e:
+        # Like duplicates within the file, which the validation of each
+        # row against the database cannot detect
+        raise InvalidBulkUpdate(
+            f"The following error happened during the insertion of lines "
+            f"{lines[0]} to {lines[-1]} of the {config.format} file: {e}"
+        )
+
+    return created, updated, unchanged
+
+
+def _remove_upsert_key_validators(
+        serializer: ModelSerializer,
+        upsert_key: Tuple[str, ...]):
+    """
+    Remove the validators rejecting the rows whose upsert key matches an
+    existing element, as these rows update the element
+    """
+    serializer.validators = [
+        validator
+        for validator in serializer.validators
+        if not isinstance(validator, UniqueTogetherValidator) or
+        set(validator.fields) != set(upsert_key)
+    ]
+
+    if len(upsert_key) == 1:
+        field = serializer.fields[upsert_key[0]]
+        field.validators = [
+            validator
+            for validator in field.validators
+            if not isinstance(validator, UniqueValidator)
+        ]
+
 
+def _update_existing(
+        model: Type[Model],
+        rows: List[Tuple[int, Dict[str, Any]]],
+        config: AddBulkConfig
+) -> Tuple[List[Dict[str, Any]], List[Model], List[Model]]:
+    """
+    Update the elements matching the upsert key of the validated rows,
+    fetching them with one query and saving the changed ones with
+    bulk_update
 
-def _check_csv_keys(reader: DictReader, config: AddBulkConfig):
+    :param model: Model of the elements
+    :param rows: Line number and validated data of the elements
+    :param config: Configuration that should be used for the adding
+    :return: The validated data of the rows without matching element,
+    the updated elements and the unchanged ones
     """
-    Ensure that the given csv file can be used to create the desired objects
+    key_fields = [model._meta.get_field(name) for name in config.upsert_key]
+
+    def get_key(data):
+        return tuple(_db_value(data.get(field.name)) for field in key_fields)
+
+    lines_by_key = {}
+    for line, data in rows:
+        key = get_key(data)
+        if key in lines_by_key:
+            raise InvalidBulkUpdate(
+                f"Line {line} of the {config.format} file has the same "
+                f"upsert key as line {lines_by_key[key]}"
+            )
+        lines_by_key[key] = line
+
+    # Filtering each field of the key separately keeps the query simple,
+    # elements are then matched on the whole key
+    candidates = model.objects.filter(**{
+        f'{field.attname}__in': {key[i] for key in lines_by_key}
+        for i, field in enumerate(key_fields)
+    })
+    existing = {
+        tuple(getattr(element, field.attname) for field in key_fields):
+            element
+        for element in candidates
+    }
+
+    new_data = []
+    updated = []
+    unchanged = []
+    changed_fields = set()
+    for _, data in rows:
+        element = existing.get(get_key(data))
+        if element is None:
+            new_data.append(data)
+            continue
+
+        is_changed = False
+        for field_name, value in data.items():
+            attname = model._meta.get_field(field_name).attname
+            if getattr(element, attname) != _db_value(value):
+                setattr(element, field_name, value)
+                changed_fields.add(field_name)
+                is_changed = True
+
+        if is_changed:
+            updated.append(element)
+        else:
+            unchanged.append(element)
+
+    if updated:
+        # Unlike save(), bulk_update does not set the auto_now fields
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                for element in updated:
+                    field.pre_save(element, add=False)
+                changed_fields.add(field.name)
+        model.objects.bulk_update(
+            updated,
+            changed_fields,
+            batch_size=config.batch_size,
+        )
+        post_bulk_update.send(sender=model, instances=updated)
+
+    return new_data, updated, unchanged
+
+
+def _db_value(value):
+    """
+    Value of a validated field as stored on the model, the primary key
+    for related objects
+    """
+    if isinstance(value, Model):
+        return value.pk
+    return value
+
+
+def _bulk_insert(
+        model: Type[Model],
+        validated_data: List[Dict[str, Any]],
+        batch_size: int) -> List[Model]:
+    """
+    Insert the elements described by validated_data using bulk_create,
+    mirroring ModelSerializer.create for many-to-many relations.
+    The model signals are not sent for the elements inserted with
+    bulk_create, post_bulk_create is sent for them instead.
+
+    :param model: Model of the elements
+    :param validated_data: Validated data of each element
+    :param batch_size: Maximum number of elements inserted per query
+    :return: The created elements, with their primary key set
+    """
+    info = model_meta.get_field_info(model)
+    elements = []
+    many_to_many = []
+    for data in validated_data:
+        data = dict(data)
+        relations = {
+            field_name: data.pop(field_name)
+            for field_name, relation_info in info.relations.items()
+            if relation_info.to_many and field_name in data
+        }
+        elements.append(model(**data))
+        many_to_many.append(relations)
+
+    connection = connections[router.db_for_write(model)]
+    fields = model._meta.concrete_fields
+    batch_size = max(
+        min(batch_size, connection.ops.bulk_batch_size(fields, elements)),
+        1,
+    )
+
+    bulk_created = []
+    for i in range(0, len(elements), batch_size):
+        batch = elements[i:i + batch_size]
+        if connection.features.can_return_ids_from_bulk_insert:
+            model.objects.bulk_create(batch)
+            bulk_created.extend(batch)
+        elif connection.vendor == 'sqlite' and connection.in_atomic_block:
+            model.objects.bulk_create(batch)
+            _set_inserted_ids(model, batch)
+            bulk_created.extend(batch)
+        else:
+            # No way to know the ids of the inserted elements
+            for element in batch:
+                element.save(force_insert=True)
+
+    for element, relations in zip(elements, many_to_many):
+        for field_name, value in relations.items():
+            getattr(element, field_name).set(value)
+
+    if bulk_created:
+        post_bulk_create.send(sender=model, instances=bulk_created)
+
+    return elements
+
+
+def _set_inserted_ids(model, batch):
+    """
+    Set the primary key of elements inserted by a bulk_create on SQLite,
+    which does not return them.
+    The database is locked for writing until the end of the current
+    transaction and primary keys are always increasing, so the newest
+    elements are the ones of the batch.
+    """
+    ids = model.objects.order_by('-pk').values_list('pk', flat=True)
+    for element, id_ in zip(batch, reversed(ids[:len(batch)])):
+        element.pk = id_
+
+
+def _resolve_related_fields(
+        serializer: Serializer,
+        rows: List[Dict],
+        resolved_objects: Dict[str, Dict]):
+    """
+    Fetch all the objects referenced by the related fields of the rows
+    with one query per field, and make these fields use the fetched objects
+    instead of querying the database for every row.
+
+    :param serializer: Serializer used to validate each row
+    :param rows: Data of the elements to create
+    :param resolved_objects: Objects already fetched for previous rows,
+    by field, updated with the newly fetched ones
+    """
+    for field_name, field in serializer.fields.items():
+        if field.read_only or not isinstance(
+                field,
+                (HyperlinkedRelatedField, PrimaryKeyRelatedField)):
+            continue
+
+        resolved = resolved_objects.setdefault(field_name, {})
+
+        lookup_values = {}
+        for row in rows:
+            value = row.get(field_name)
+            try:
+                if value not in resolved:
+                    lookup_values[value] = _get_lookup_value(field, value)
+            except (LookupError, TypeError):
+                # Invalid or unhashable values are reported by the field
+                continue
+
+        if lookup_values:
+            lookup_field = getattr(field, 'lookup_field', 'pk')
+            objects = {
+                str(getattr(obj, lookup_field)): obj
+                for obj in field.get_queryset().filter(**{
+                    f'{lookup_field}__in': set(lookup_values.values())
+                })
+            }
+            resolved.update({
+                value: objects[lookup_value]
+                for value, lookup_value in lookup_values.items()
+                if lookup_value in objects
+            })
+
+        field.to_internal_value = _resolved_to_internal_value(
+            field.to_internal_value,
+            resolved,
+        )
+
+
+def _get_lookup_value(field, value) -> str:
+    """
+    Value identifying the object referenced by value in the field,
+    as HyperlinkedRelatedField and PrimaryKeyRelatedField parse it
+
+    :raise: LookupError if the value does not reference any object
+    """
+    if isinstance(field, PrimaryKeyRelatedField):
+        if isinstance(value, (str, int)) and not isinstance(value, bool):
+            return str(value)
+        raise LookupError(value)
+
+    if not isinstance(value, str):
+        raise LookupError(value)
+
+    if value.startswith(('http:', 'https:')):
+        value = parse.urlparse(value).path
+        prefix = get_script_prefix()
+        if value.startswith(prefix):
+            value = '/' + value[len(prefix):]
+
+    try:
+        match = resolve(uri_to_iri(parse.unquote(value)))
+    except Resolver404:
+        raise LookupError(value)
+
+    if match.view_name != field.view_name:
+        raise LookupError(value)
+
+    return match.kwargs[field.lookup_url_kwarg]
+
+
+def _resolved_to_internal_value(to_internal_value, resolved):
+    def resolved_to_internal_value(data):
+        try:
+            return resolved[data]
+        except (KeyError, TypeError):
+            return to_internal_value(data)
+
+    return resolved_to_internal_value
+
+
+def _check_keys(keys: Iterable[str], config: AddBulkConfig):
+    """
+    Ensure that the given file can be used to create the desired objects
     by checking that the required keys are available
 
-    :param reader: CSV dictionary reader that wraps the file
+    :param keys: Keys available in the file, like the header of a csv file
     :param config: Post bulk configuration
-    :raise: InvalidBulkUpdate if the csv file cannot be used
+    :raise: InvalidBulkUpdate if the file cannot be used
     """
+    keys = set(keys)
 
-    required_keys = set(config.serializer().fields)
-    # id nor url are required for the creation of an element
-    required_keys.remove("id")
-
-    if "url" in required_keys:
-        required_keys.remove("url")
+    # Read-only fields, like id and url, are not used for the creation
+    # of an element
+    required_keys = {
+        field_name
+        for field_name, field in config.serializer().fields.items()
+        if not field.read_only and field.required
+    }
 
     if config.mapping:
         missing_keys = required_keys.difference(config.mapping.values())
@@ -102,16 +776,18 @@ def _check_csv_keys(reader: DictReader, config: AddBulkConfig):
                 f"to be able to create the objects: {missing_keys}"
             )
     else:
-        missing_keys = required_keys.difference(reader.fieldnames)
+        missing_keys = required_keys.difference(keys)
         if missing_keys:
             raise InvalidBulkUpdate(
-                "The following field are missing from the given csv file"
-                f"to be able to create the objects: {missing_keys}"
+                f"The following field are missing from the given "
+                f"{config.format} file to be able to create the objects: "
+                f"{missing_keys}"
             )
 
-    missing_keys = set(config.mapping).difference(reader.fieldnames)
+    missing_keys = set(config.mapping).difference(keys)
     if missing_keys:
         raise InvalidBulkUpdate(
             "The following source field that were given for mapping are not "
-            f"available in the header of the given csv file: {missing_keys}"
+            f"available in the header of the given {config.format} file: "
+            f"{missing_keys}"
         )
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api_volontaria.apps.volunteer.workers import (
+    fail_stale_bulk_imports,
+    run_pending_bulk_imports,
+)
+
+
+class Command(BaseCommand):
+    help = 'Run the pending asynchronous bulk imports, and fail the ' \
+           'ones left running by a stopped worker.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for new bulk imports instead of exiting.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds between two polls when looping.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            nb_failed = fail_stale_bulk_imports()
+            if nb_failed:
+                self.stdout.write(f'{nb_failed} stale bulk import(s) failed')
+
+            nb_run = run_pending_bulk_imports()
+            if nb_run:
+                self.stdout.write(f'{nb_run} bulk import(s) run')
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('Done'))
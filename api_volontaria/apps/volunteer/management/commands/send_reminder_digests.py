@@ -0,0 +1,46 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api_volontaria.apps.volunteer.digests import queue_reminder_digests
+
+
+class Command(BaseCommand):
+    help = 'Send each volunteer one email reminding them of their ' \
+           'upcoming participations. Participations are only reminded ' \
+           'once, so this can be run as often as needed (daily with cron ' \
+           'for instance).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.REMINDER_DIGESTS['DAYS'],
+            help='Remind the participations to events starting within '
+                 'this number of days.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.REMINDER_DIGESTS['BATCH_SIZE'],
+            help='Number of participations read and reminded per batch.',
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        now = timezone.now()
+
+        nb_digests, nb_reminded = queue_reminder_digests(
+            now,
+            now + timedelta(days=options['days']),
+            batch_size=options['batch_size'],
+        )
+
+        duration = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'{nb_digests} digest(s) queued for {nb_reminded} '
+            f'participation(s) in {duration:.2f}s'
+        ))
@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from api_volontaria.apps.volunteer.models import Event, Participation
+from api_volontaria.response_cache import invalidate
+
+
+def _headcount_subquery(is_standby):
+    participations = Participation.objects.filter(
+        event=OuterRef('pk'),
+        is_standby=is_standby,
+    ).order_by().values('event').annotate(count=Count('pk'))
+
+    return Coalesce(Subquery(participations.values('count')), 0)
+
+
+class Command(BaseCommand):
+    help = 'Recompute the headcounts stored on the events from their ' \
+           'participations and report the events that had drifted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report the drifted events, do not fix them.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of events updated per query.',
+        )
+
+    def handle(self, *args, **options):
+        drifted_ids = []
+        events = Event.objects.with_participation_counts().only(
+            'id',
+            'nb_volunteers',
+            'nb_volunteers_standby',
+        )
+
+        for event in events.iterator(chunk_size=options['batch_size']):
+            nb_volunteers = event.annotated_nb_volunteers
+            nb_volunteers_standby = event.annotated_nb_volunteers_standby
+
+            if (event.nb_volunteers == nb_volunteers and
+                    event.nb_volunteers_standby == nb_volunteers_standby):
+                continue
+
+            self.stdout.write(
+                f'Event {event.id}: '
+                f'nb_volunteers {event.nb_volunteers} -> {nb_volunteers}, '
+                f'nb_volunteers_standby {event.nb_volunteers_standby} -> '
+                f'{nb_volunteers_standby}'
+            )
+            drifted_ids.append(event.id)
+
+        if not options['dry_run']:
+            # Recount in the UPDATE itself so that participations
+            # created in the meantime are not overwritten
+            batch_size = options['batch_size']
+            for i in range(0, len(drifted_ids), batch_size):
+                Event.objects.filter(
+                    pk__in=drifted_ids[i:i + batch_size],
+                ).update(
+                    nb_volunteers=_headcount_subquery(False),
+                    nb_volunteers_standby=_headcount_subquery(True),
+                    headcounts_updated_at=timezone.now(),
+                )
+            if drifted_ids:
+                invalidate(Event)
+
+        if options['dry_run']:
+            message = f'{len(drifted_ids)} event(s) with drifted headcounts'
+        else:
+            message = f'{len(drifted_ids)} event(s) headcounts fixed'
+        self.stdout.write(self.style.SUCCESS(message))
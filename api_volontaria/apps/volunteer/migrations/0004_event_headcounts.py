@@ -0,0 +1,45 @@
+# Generated by Django 2.2.12 on 2026-10-17 21:16
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def compute_headcounts(apps, schema_editor):
+    Event = apps.get_model('volunteer', 'Event')
+
+    events = Event.objects.annotate(
+        annotated_nb_volunteers=Count(
+            'participations',
+            filter=Q(participations__is_standby=False),
+        ),
+        annotated_nb_volunteers_standby=Count(
+            'participations',
+            filter=Q(participations__is_standby=True),
+        ),
+    )
+
+    for event in events.iterator():
+        event.nb_volunteers = event.annotated_nb_volunteers
+        event.nb_volunteers_standby = event.annotated_nb_volunteers_standby
+        event.save(update_fields=['nb_volunteers', 'nb_volunteers_standby'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteer', '0003_event_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='nb_volunteers',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of volunteers'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='nb_volunteers_standby',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of volunteers on hold'),
+        ),
+        migrations.RunPython(compute_headcounts, migrations.RunPython.noop),
+    ]
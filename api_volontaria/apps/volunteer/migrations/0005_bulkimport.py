@@ -0,0 +1,32 @@
+# Generated by Django 2.2.12 on 2026-10-17 21:22
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('volunteer', '0004_event_headcounts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkImport',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('element_view_name', models.CharField(max_length=100, verbose_name='Element view name')),
+                ('nb_created', models.PositiveIntegerField(default=0, verbose_name='Number of created elements')),
+                ('created_ranges', jsonfield.fields.JSONField(default=list, verbose_name='Ranges of created ids')),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bulk_imports', to=settings.AUTH_USER_MODEL, verbose_name='Created by')),
+            ],
+            options={
+                'verbose_name': 'Bulk import',
+                'verbose_name_plural': 'Bulk imports',
+            },
+        ),
+    ]
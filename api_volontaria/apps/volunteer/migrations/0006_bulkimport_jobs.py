@@ -0,0 +1,60 @@
+# Generated by Django 2.2.12 on 2026-10-17 21:27
+
+from django.db import migrations, models
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteer', '0005_bulkimport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkimport',
+            name='error',
+            field=models.TextField(blank=True, null=True, verbose_name='Error'),
+        ),
+        migrations.AddField(
+            model_name='bulkimport',
+            name='file',
+            field=models.FileField(blank=True, null=True, upload_to='bulk_imports', verbose_name='File'),
+        ),
+        migrations.AddField(
+            model_name='bulkimport',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Finished at'),
+        ),
+        migrations.AddField(
+            model_name='bulkimport',
+            name='format',
+            field=models.CharField(default='csv', max_length=100, verbose_name='Format'),
+        ),
+        migrations.AddField(
+            model_name='bulkimport',
+            name='mapping',
+            field=jsonfield.fields.JSONField(default=dict, verbose_name='Mapping'),
+        ),
+        migrations.AddField(
+            model_name='bulkimport',
+            name='nb_rows_processed',
+            field=models.PositiveIntegerField(default=0, verbose_name='Number of processed rows'),
+        ),
+        migrations.AddField(
+            model_name='bulkimport',
+            name='serializer_class',
+            field=models.CharField(default='api_volontaria.apps.volunteer.serializers.EventSerializer', max_length=255, verbose_name='Serializer class'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='bulkimport',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Started at'),
+        ),
+        migrations.AddField(
+            model_name='bulkimport',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('SUCCEEDED', 'Succeeded'), ('FAILED', 'Failed')], default='PENDING', max_length=100, verbose_name='Status'),
+        ),
+    ]
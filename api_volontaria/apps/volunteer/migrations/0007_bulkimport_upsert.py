@@ -0,0 +1,29 @@
+# Generated by Django 2.2.12 on 2026-10-17 21:39
+
+from django.db import migrations, models
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteer', '0006_bulkimport_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkimport',
+            name='nb_unchanged',
+            field=models.PositiveIntegerField(default=0, verbose_name='Number of unchanged elements'),
+        ),
+        migrations.AddField(
+            model_name='bulkimport',
+            name='nb_updated',
+            field=models.PositiveIntegerField(default=0, verbose_name='Number of updated elements'),
+        ),
+        migrations.AddField(
+            model_name='bulkimport',
+            name='upsert_key',
+            field=jsonfield.fields.JSONField(default=list, verbose_name='Upsert key'),
+        ),
+    ]
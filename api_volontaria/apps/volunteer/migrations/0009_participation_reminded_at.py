@@ -0,0 +1,18 @@
+# Generated by Django 2.2.12 on 2026-10-17 21:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteer', '0008_event_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='participation',
+            name='reminded_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Reminded at'),
+        ),
+    ]
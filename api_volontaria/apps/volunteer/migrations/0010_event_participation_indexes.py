@@ -0,0 +1,29 @@
+# Generated by Django 2.2.12 on 2026-10-17 22:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteer', '0009_participation_reminded_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['cell', 'start_time'], name='event_cell_start_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['start_time', 'end_time'], name='event_start_end_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participation',
+            index=models.Index(fields=['user', 'event'], name='participation_user_event_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participation',
+            index=models.Index(fields=['registered_at'], name='participation_registered_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 2.2.12 on 2026-10-17 22:37
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteer', '0010_event_participation_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cell',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Updated at'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='headcounts_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Headcounts updated at'),
+        ),
+        migrations.AddField(
+            model_name='tasktype',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Updated at'),
+            preserve_default=False,
+        ),
+    ]
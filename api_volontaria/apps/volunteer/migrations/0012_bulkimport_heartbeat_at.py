@@ -0,0 +1,18 @@
+# Generated by Django 2.2.12 on 2026-10-17 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteer', '0011_cell_tasktype_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkimport',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Heartbeat at'),
+        ),
+    ]
@@ -1,20 +1,41 @@
+from collections import Counter
 from datetime import datetime, timedelta
 import pytz
 from babel.dates import format_date
 from django.conf import settings
-from django.db import models
-from django.db.models.signals import post_save, pre_delete
+from django.db import models, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
-from django.template.loader import render_to_string
 from django.utils import timezone
+from django.utils.module_loading import import_string
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.auth import get_user_model
 from dry_rest_permissions.generics import authenticated_users
-from api_volontaria.email import EmailAPI
+from jsonfield import JSONField
+from api_volontaria.apps.volunteer.helpers import (
+    AddBulkConfig,
+    InvalidBulkUpdate,
+    post_bulk_create,
+    post_bulk_update,
+    stream_bulk_from_file,
+)
+from api_volontaria.apps.notification.models import OutboxEmail
+from api_volontaria.apps.notification.workers import enqueue_outbox
+from api_volontaria.caches import LRUCache
+from api_volontaria.response_cache import invalidate_on_change
+from api_volontaria.email import EmailAPI, render_email
 
 
 User = get_user_model()
 
+# Timezone of the dates and times written in the emails
+EMAIL_TIMEZONE = pytz.timezone('US/Eastern')
+
+# Email context of the events, see Event.get_email_context
+_event_email_contexts = LRUCache(maxsize=1024)
+
 
 class Cell(models.Model):
     """
@@ -66,6 +87,11 @@ class Cell(models.Model):
         verbose_name=_("Longitude"),
     )
 
+    updated_at = models.DateTimeField(
+        verbose_name=_("Updated at"),
+        auto_now=True,
+    )
+
     def __str__(self):
         return self.name
 
@@ -106,6 +132,11 @@ class TaskType(models.Model):
         max_length=100,
     )
 
+    updated_at = models.DateTimeField(
+        verbose_name=_("Updated at"),
+        auto_now=True,
+    )
+
     def __str__(self):
         return self.name
 
@@ -137,6 +168,14 @@ class TaskType(models.Model):
         else:
             return False
 
+    @staticmethod
+    @authenticated_users
+    def has_bulk_permission(request):
+        if request.user.is_staff:
+            return True
+        else:
+            return False
+
     @authenticated_users
     def has_object_destroy_permission(self, request):
         if request.user.is_staff:
@@ -152,6 +191,26 @@ class TaskType(models.Model):
             return False
 
 
+class EventQuerySet(models.QuerySet):
+
+    def with_participation_counts(self):
+        """
+        Annotate each event with its number of volunteers and volunteers
+        on standby, computed from the participations in the same query as
+        the events themselves. Used to check the stored headcounts.
+        """
+        return self.annotate(
+            annotated_nb_volunteers=Count(
+                'participations',
+                filter=Q(participations__is_standby=False),
+            ),
+            annotated_nb_volunteers_standby=Count(
+                'participations',
+                filter=Q(participations__is_standby=True),
+            ),
+        )
+
+
 class Event(models.Model):
     """
     This class represents an event where volunteer can come to help.
@@ -160,6 +219,20 @@ class Event(models.Model):
     class Meta:
         verbose_name = _("Event")
         verbose_name_plural = _('Events')
+        # Match the filters of the event list: by cell and period,
+        # or by period alone
+        indexes = [
+            models.Index(
+                fields=['cell', 'start_time'],
+                name='event_cell_start_time_idx',
+            ),
+            models.Index(
+                fields=['start_time', 'end_time'],
+                name='event_start_end_time_idx',
+            ),
+        ]
+
+    objects = EventQuerySet.as_manager()
 
     description = models.TextField(
         verbose_name="Description",
@@ -183,6 +256,20 @@ class Event(models.Model):
         default=0,
     )
 
+    # Headcounts maintained by the Participation signals below,
+    # see update_event_headcounts
+    nb_volunteers = models.PositiveIntegerField(
+        verbose_name=_("Number of volunteers"),
+        default=0,
+        editable=False,
+    )
+
+    nb_volunteers_standby = models.PositiveIntegerField(
+        verbose_name=_("Number of volunteers on hold"),
+        default=0,
+        editable=False,
+    )
+
     volunteers = models.ManyToManyField(
         User,
         verbose_name=_("Volunteers"),
@@ -205,6 +292,20 @@ class Event(models.Model):
         on_delete=models.PROTECT,
     )
 
+    # Not changed by the headcounts updates
+    updated_at = models.DateTimeField(
+        verbose_name=_("Updated at"),
+        auto_now=True,
+    )
+
+    # Changed by the headcounts updates only
+    headcounts_updated_at = models.DateTimeField(
+        verbose_name=_("Headcounts updated at"),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
     def __str__(self):
         return str(self.start_time) + ' - ' + str(self.end_time)
 
@@ -216,24 +317,52 @@ class Event(models.Model):
     def is_finished(self):
         return self.end_time <= timezone.now()
 
-    @property
-    def nb_volunteers(self):
-        return Participation.objects.filter(
-            is_standby=False,
-            event=self,
-        ).count()
-
-    @property
-    def nb_volunteers_standby(self):
-        return Participation.objects.filter(
-            is_standby=True,
-            event=self,
-        ).count()
-
     @property
     def duration(self):
         return self.end_time - self.start_time
 
+    def get_email_context(self):
+        """
+        Part of the context of the emails about the event describing it,
+        its cell and its task type. Built once per process for each
+        version of the event, of its cell and of its task type.
+        The returned context is shared and should not be modified.
+        """
+        key = (
+            self.pk,
+            self.updated_at,
+            self.cell.updated_at,
+            self.task_type.updated_at,
+        )
+        context = _event_email_contexts.get(key)
+        if context is not None:
+            return context
+
+        start_time = self.start_time.astimezone(EMAIL_TIMEZONE)
+        end_time = self.end_time.astimezone(EMAIL_TIMEZONE)
+        context = {
+            'ACTIVITY': {
+                'NAME': self.task_type.name,
+                'START_DATE': format_date(
+                    start_time,
+                    format='long',
+                    locale='fr'
+                ),
+                'START_TIME': start_time.strftime('%-Hh%M'),
+                'END_TIME': end_time.strftime('%-Hh%M'),
+            },
+            'CELL': {
+                'NAME': self.cell.name,
+                'ADDRESS_LINE_1': self.cell.address_line_1,
+                'ADDRESS_LINE_2': self.cell.address_line_2,
+                'POSTAL_CODE': self.cell.postal_code,
+                'CITY': self.cell.city,
+                'STATE_PROVINCE': self.cell.state_province,
+            },
+        }
+        _event_email_contexts.set(key, context)
+        return context
+
     @staticmethod
     def has_list_permission(request):
         return True
@@ -285,6 +414,10 @@ class Event(models.Model):
             return False
 
 
+# Headcount state of the participations whose fields were deferred
+_NOT_LOADED = object()
+
+
 class Participation(models.Model):
     """
     This class represents a participation of a volunteer to a specific event.
@@ -304,6 +437,18 @@ class Participation(models.Model):
         verbose_name = _('Participation')
         verbose_name_plural = _('Participations')
         unique_together = ('event', 'user')
+        # The unique index starts with the event, the participations of
+        # a user (all those of a simple user listing them) need their own
+        indexes = [
+            models.Index(
+                fields=['user', 'event'],
+                name='participation_user_event_idx',
+            ),
+            models.Index(
+                fields=['registered_at'],
+                name='participation_registered_idx',
+            ),
+        ]
 
     event = models.ForeignKey(
         Event,
@@ -340,71 +485,123 @@ class Participation(models.Model):
         auto_now_add=True,
     )
 
-    def send_email_confirmation(self):
-        start_time = self.event.start_time
-        start_time = start_time.astimezone(pytz.timezone('US/Eastern'))
+    # Set once the participation was part of a reminder digest,
+    # see the send_reminder_digests command
+    reminded_at = models.DateTimeField(
+        verbose_name=_("Reminded at"),
+        blank=True,
+        null=True,
+        editable=False,
+    )
 
-        end_time = self.event.end_time
-        end_time = end_time.astimezone(pytz.timezone('US/Eastern'))
+    def __init__(self, *args, **kwargs):
+        super(Participation, self).__init__(*args, **kwargs)
+        # Read from __dict__ so that the fields deferred by .only() or
+        # .defer() are not loaded for each participation, they are
+        # loaded once the participation is saved or deleted
+        if 'event_id' in self.__dict__ and 'is_standby' in self.__dict__:
+            self._counted_as = self._headcount_state()
+        else:
+            self._counted_as = _NOT_LOADED
 
+    def _headcount_state(self):
+        """
+        The (event, is_standby) pair this participation is counted in,
+        None if it has not been saved yet.
+        """
+        if self.pk is None:
+            return None
+        return self.event_id, self.is_standby
+
+    def _load_counted_as(self):
+        if self._counted_as is _NOT_LOADED:
+            self._counted_as = Participation.objects.filter(
+                pk=self.pk,
+            ).values_list('event_id', 'is_standby').first()
+
+    def save(self, *args, **kwargs):
+        # The event headcounts are updated by signals, make sure they
+        # are committed with the participation itself
+        with transaction.atomic():
+            self._load_counted_as()
+            super(Participation, self).save(*args, **kwargs)
+        self._counted_as = self._headcount_state()
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            self._load_counted_as()
+            return super(Participation, self).delete(*args, **kwargs)
+
+    def get_email_context(self):
+        """
+        Part of the context of the emails about the participation
+        describing it and its event
+        """
         type_participation = 'Bénévole'
         if self.is_standby:
             type_participation = 'Remplaçant'
 
-        context = {
+        event_context = self.event.get_email_context()
+        return {
             'PARTICIPATION': {
                 'FIRST_NAME': self.user.first_name,
                 'LAST_NAME': self.user.last_name,
                 'TYPE': type_participation
             },
-            'ACTIVITY': {
-                'NAME': self.event.task_type.name,
-                'START_DATE': format_date(
-                    start_time,
-                    format='long',
-                    locale='fr'
-                ),
-                'START_TIME': start_time.strftime('%-Hh%M'),
-                'END_TIME': end_time.strftime('%-Hh%M'),
-            },
-            'CELL': {
-                'NAME': self.event.cell.name,
-                'ADDRESS_LINE_1': self.event.cell.address_line_1,
-                'ADDRESS_LINE_2': self.event.cell.address_line_2,
-                'POSTAL_CODE': self.event.cell.postal_code,
-                'CITY': self.event.cell.city,
-                'STATE_PROVINCE': self.event.cell.state_province,
-            },
-            'ORGANIZATION_NAME': settings.LOCAL_SETTINGS['ORGANIZATION'],
+            'ACTIVITY': event_context['ACTIVITY'],
+            'CELL': event_context['CELL'],
         }
 
+    def build_email_confirmation(self):
+        """
+        Email confirming the participation to the user, not yet queued
+        :return: The unsaved outbox email
+        """
+        context = self.get_email_context()
+        context['ORGANIZATION_NAME'] = settings.LOCAL_SETTINGS['ORGANIZATION']
+
         TEMPLATES = settings.ANYMAIL.get('TEMPLATES')
         id = TEMPLATES.get('CONFIRMATION_PARTICIPATION')
         if id:
-            EmailAPI().send_template_email(
-                self.user.email,
-                'CONFIRMATION_PARTICIPATION',
-                context,
+            return OutboxEmail(
+                to=[self.user.email],
+                template='CONFIRMATION_PARTICIPATION',
+                context=context,
             )
         else:
-            msg_file_name = 'participation_confirmation_email'
-            plain_msg = render_to_string(
-                '.'.join([msg_file_name, 'txt']),
-                context
-            )
-            msg_html = render_to_string(
-                '.'.join([msg_file_name, 'html']),
-                context
+            plain_msg, msg_html = render_email(
+                'participation_confirmation_email',
+                context,
             )
 
-            EmailAPI().send_email(
-                "Objet: Confirmation de participation",
-                plain_msg,
-                "email_from@mondomain.ca",
-                [self.user.email],
-                html_message=msg_html,
+            return OutboxEmail(
+                to=[self.user.email],
+                subject="Objet: Confirmation de participation",
+                body=plain_msg,
+                from_email="email_from@mondomain.ca",
+                html_body=msg_html,
             )
 
+    def send_email_confirmation(self):
+        """
+        Queue the confirmation email in the outbox, it is sent once the
+        current transaction is committed
+        """
+        self.build_email_confirmation().save()
+        enqueue_outbox()
+
+    @staticmethod
+    def send_email_confirmations(participations):
+        """
+        Queue the confirmation email of many participations with a
+        single insert
+        """
+        OutboxEmail.objects.bulk_create([
+            participation.build_email_confirmation()
+            for participation in participations
+        ])
+        enqueue_outbox()
+
     def send_email_cancellation_emergency(self):
         """
         An email to inform the administrator that a user just cancel his
@@ -412,34 +609,25 @@ class Participation(models.Model):
         :return: message file name (helps determine which type of email
         template has been used, for example when testing application)
         """
-        start_time = self.event.start_time
-        start_time = start_time.astimezone(pytz.timezone('US/Eastern'))
-
-        end_time = self.event.end_time
-        end_time = end_time.astimezone(pytz.timezone('US/Eastern'))
-
         # Headcount is "pre-delete";
         # but email needs to show headcount after deletion.
         # (and this only applies to actual participations
         # (i.e. non-standby) since, when standby participation gets
         # cancelled, no email gets sent)
+        self.event.refresh_from_db(
+            fields=['nb_volunteers', 'nb_volunteers_standby']
+        )
         if not self.is_standby:
             updated_volunteer_count = self.event.nb_volunteers - 1
 
+        event_context = self.event.get_email_context()
         context = {
             'PARTICIPANT': {
                 'FIRST_NAME': self.user.first_name,
                 'LAST_NAME': self.user.last_name,
             },
             'ACTIVITY': {
-                'NAME': self.event.task_type.name,
-                'START_DATE': format_date(
-                    start_time,
-                    format='long',
-                    locale='fr'
-                ),
-                'START_TIME': start_time.strftime('%-Hh%M'),
-                'END_TIME': end_time.strftime('%-Hh%M'),
+                **event_context['ACTIVITY'],
                 'HOURS_BEFORE_EMERGENCY':
                     settings.NUMBER_OF_DAYS_BEFORE_EMERGENCY_CANCELLATION * 24,
 
@@ -450,14 +638,7 @@ class Participation(models.Model):
                 'NUMBER_OF_VOLUNTEERS_STANDBY_NEEDED':
                     self.event.nb_volunteers_standby_needed,
             },
-            'CELL': {
-                'NAME': self.event.cell.name,
-                'ADDRESS_LINE_1': self.event.cell.address_line_1,
-                'ADDRESS_LINE_2': self.event.cell.address_line_2,
-                'POSTAL_CODE': self.event.cell.postal_code,
-                'CITY': self.event.cell.city,
-                'STATE_PROVINCE': self.event.cell.state_province,
-            },
+            'CELL': event_context['CELL'],
         }
 
         TEMPLATES = settings.ANYMAIL.get('TEMPLATES')
@@ -469,14 +650,9 @@ class Participation(models.Model):
                 context,
             )
         else:
-            msg_file_name = 'participation_cancellation_email'
-            plain_msg = render_to_string(
-                '.'.join([msg_file_name, 'txt']),
-                context
-            )
-            msg_html = render_to_string(
-                '.'.join([msg_file_name, 'html']),
-                context
+            plain_msg, msg_html = render_email(
+                'participation_cancellation_email',
+                context,
             )
             EmailAPI().send_email(
                 "Objet: Annulation de participation",
@@ -512,6 +688,14 @@ class Participation(models.Model):
     def has_create_permission(request):
         return True
 
+    @staticmethod
+    @authenticated_users
+    def has_bulk_permission(request):
+        if request.user.is_staff:
+            return True
+        else:
+            return False
+
     @authenticated_users
     @authenticated_users
     def has_object_update_permission(self, request):
@@ -533,12 +717,332 @@ class Participation(models.Model):
             return False
 
 
+class BulkImport(models.Model):
+    """
+    This class represents a bulk adding of elements from a file.
+    Asynchronous bulk imports store the file until a worker runs them,
+    see api_volontaria.apps.volunteer.workers.
+    The ids of the created elements are stored as ranges.
+    """
+
+    STATUS_PENDING = 'PENDING'
+    STATUS_RUNNING = 'RUNNING'
+    STATUS_SUCCEEDED = 'SUCCEEDED'
+    STATUS_FAILED = 'FAILED'
+
+    STATUS_CHOICES = (
+        (STATUS_PENDING, _('Pending')),
+        (STATUS_RUNNING, _('Running')),
+        (STATUS_SUCCEEDED, _('Succeeded')),
+        (STATUS_FAILED, _('Failed')),
+    )
+
+    class Meta:
+        verbose_name = _('Bulk import')
+        verbose_name_plural = _('Bulk imports')
+
+    created_by = models.ForeignKey(
+        User,
+        verbose_name=_("Created by"),
+        related_name='bulk_imports',
+        null=True,
+        on_delete=models.SET_NULL,
+    )
+
+    created_at = models.DateTimeField(
+        verbose_name=_("Created at"),
+        auto_now_add=True,
+    )
+
+    status = models.CharField(
+        verbose_name=_("Status"),
+        max_length=100,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+    )
+
+    file = models.FileField(
+        verbose_name=_("File"),
+        upload_to='bulk_imports',
+        blank=True,
+        null=True,
+    )
+
+    format = models.CharField(
+        verbose_name=_("Format"),
+        max_length=100,
+        default='csv',
+    )
+
+    mapping = JSONField(
+        verbose_name=_("Mapping"),
+        default=dict,
+    )
+
+    # Import path of the serializer used to create the elements
+    serializer_class = models.CharField(
+        verbose_name=_("Serializer class"),
+        max_length=255,
+    )
+
+    # Name of the view giving the details of a created element
+    element_view_name = models.CharField(
+        verbose_name=_("Element view name"),
+        max_length=100,
+    )
+
+    nb_rows_processed = models.PositiveIntegerField(
+        verbose_name=_("Number of processed rows"),
+        default=0,
+    )
+
+    # Fields identifying the existing elements updated by the import
+    upsert_key = JSONField(
+        verbose_name=_("Upsert key"),
+        default=list,
+    )
+
+    nb_created = models.PositiveIntegerField(
+        verbose_name=_("Number of created elements"),
+        default=0,
+    )
+
+    nb_updated = models.PositiveIntegerField(
+        verbose_name=_("Number of updated elements"),
+        default=0,
+    )
+
+    nb_unchanged = models.PositiveIntegerField(
+        verbose_name=_("Number of unchanged elements"),
+        default=0,
+    )
+
+    # List of [first id, last id] ranges of the created elements
+    created_ranges = JSONField(
+        verbose_name=_("Ranges of created ids"),
+        default=list,
+    )
+
+    error = models.TextField(
+        verbose_name=_("Error"),
+        blank=True,
+        null=True,
+    )
+
+    started_at = models.DateTimeField(
+        verbose_name=_("Started at"),
+        blank=True,
+        null=True,
+    )
+
+    finished_at = models.DateTimeField(
+        verbose_name=_("Finished at"),
+        blank=True,
+        null=True,
+    )
+
+    # Updated after each chunk while running, see fail_stale
+    heartbeat_at = models.DateTimeField(
+        verbose_name=_("Heartbeat at"),
+        blank=True,
+        null=True,
+    )
+
+    def __str__(self):
+        return f'{self.element_view_name} - {self.created_at}'
+
+    @classmethod
+    def fail_stale(cls, timeout):
+        """
+        Fail the running bulk imports without progress for timeout
+        seconds, their worker having been stopped, like a recycled or
+        redeployed process. They are not run again, the elements of their
+        committed chunks being kept and listed in created_ranges.
+        :return: The number of failed bulk imports
+        """
+        now = timezone.now()
+        limit = now - timedelta(seconds=timeout)
+        return cls.objects.filter(
+            Q(heartbeat_at__lt=limit) |
+            Q(heartbeat_at__isnull=True, started_at__lt=limit),
+            status=cls.STATUS_RUNNING,
+        ).update(
+            status=cls.STATUS_FAILED,
+            error=f"Interrupted: no progress for {timeout} seconds",
+            finished_at=now,
+        )
+
+    def get_config(self):
+        return AddBulkConfig(
+            import_string(self.serializer_class),
+            self.format,
+            self.mapping,
+            upsert_key=tuple(self.upsert_key),
+        )
+
+    def run(self):
+        """
+        Run a pending bulk import, unless another worker already took it.
+        Each chunk of elements is committed on its own so that the
+        progress is visible while the import runs: if an element is
+        invalid, the elements of the preceding chunks are kept and
+        listed in created_ranges.
+        :return: True if the bulk import was run by this call
+        """
+        is_claimed = BulkImport.objects.filter(
+            pk=self.pk,
+            status=self.STATUS_PENDING,
+        ).update(
+            status=self.STATUS_RUNNING,
+            started_at=timezone.now(),
+            heartbeat_at=timezone.now(),
+        )
+        if not is_claimed:
+            return False
+
+        self.refresh_from_db()
+
+        def save_progress(summary):
+            BulkImport.objects.filter(pk=self.pk).update(
+                nb_rows_processed=summary.nb_rows,
+                nb_created=summary.nb_created,
+                nb_updated=summary.nb_updated,
+                nb_unchanged=summary.nb_unchanged,
+                created_ranges=summary.created_ranges,
+                heartbeat_at=timezone.now(),
+            )
+
+        try:
+            with self.file.open('rb') as file_data_bytes:
+                stream_bulk_from_file(
+                    file_data_bytes,
+                    self.get_config(),
+                    progress=save_progress,
+                    atomic=False,
+                )
+        except InvalidBulkUpdate as e:
+            self.error = e.error
+        except Exception as e:
+            self.error = f"Unexpected error: {e!r}"
+        else:
+            self.file.delete(save=False)
+
+        # Progress saved after the last committed chunk
+        self.refresh_from_db(fields=[
+            'nb_rows_processed',
+            'nb_created',
+            'nb_updated',
+            'nb_unchanged',
+            'created_ranges',
+        ])
+        if self.error:
+            self.status = self.STATUS_FAILED
+        else:
+            self.status = self.STATUS_SUCCEEDED
+        self.finished_at = timezone.now()
+        self.save()
+        return True
+
+
+def _headcount_field(is_standby):
+    if is_standby:
+        return 'nb_volunteers_standby'
+    return 'nb_volunteers'
+
+
+def update_event_headcounts(removed=None, added=None):
+    """
+    Move one participation out of the headcount it was counted in and/or
+    into a new one. Counters are updated with F-expressions so that
+    concurrent participations never overwrite each other's update. They
+    also set headcounts_updated_at, leaving updated_at unchanged.
+    :param removed: (event id, is_standby) pair to decrement
+    :param added: (event id, is_standby) pair to increment
+    """
+    if removed == added:
+        return
+
+    if removed is not None:
+        event_id, is_standby = removed
+        field = _headcount_field(is_standby)
+        Event.objects.filter(pk=event_id).update(
+            headcounts_updated_at=timezone.now(),
+            **{field: Greatest(F(field) - 1, 0)}
+        )
+
+    if added is not None:
+        event_id, is_standby = added
+        field = _headcount_field(is_standby)
+        Event.objects.filter(pk=event_id).update(
+            headcounts_updated_at=timezone.now(),
+            **{field: F(field) + 1}
+        )
+
+
+@receiver(post_save, sender=Participation)
+def update_headcounts_on_save(sender, instance, **kwargs):
+    update_event_headcounts(
+        removed=instance._counted_as,
+        added=instance._headcount_state(),
+    )
+
+    # Keep an already loaded event in sync with the database
+    if Participation.event.is_cached(instance):
+        instance.event.refresh_from_db(
+            fields=['nb_volunteers', 'nb_volunteers_standby']
+        )
+
+
+@receiver(post_delete, sender=Participation)
+def update_headcounts_on_delete(sender, instance, **kwargs):
+    update_event_headcounts(removed=instance._counted_as)
+
+
 @receiver(post_save, sender=Participation)
 def send_participation_confirmation(sender, instance, created, **kwargs):
     if created:
         instance.send_email_confirmation()
 
 
+# The participations change the headcounts of the events
+for model in (Cell, TaskType, Event, Participation):
+    invalidate_on_change(model, signals=[
+        post_save,
+        post_delete,
+        post_bulk_create,
+        post_bulk_update,
+    ])
+
+
+@receiver([post_bulk_create, post_bulk_update], sender=Participation)
+def update_headcounts_on_bulk_save(sender, instances, **kwargs):
+    # One update per changed headcount instead of one per participation
+    changes = Counter()
+    for instance in instances:
+        if instance._counted_as is not None:
+            changes[instance._counted_as] -= 1
+        instance._counted_as = instance._headcount_state()
+        changes[instance._counted_as] += 1
+
+    for (event_id, is_standby), change in changes.items():
+        field = _headcount_field(is_standby)
+        if change > 0:
+            value = F(field) + change
+        elif change < 0:
+            value = Greatest(F(field) + change, 0)
+        else:
+            continue
+        Event.objects.filter(pk=event_id).update(
+            headcounts_updated_at=timezone.now(),
+            **{field: value}
+        )
+
+
+@receiver(post_bulk_create, sender=Participation)
+def send_participation_confirmations(sender, instances, **kwargs):
+    Participation.send_email_confirmations(instances)
+
+
 @receiver(pre_delete, sender=Participation)
 def send_cancellation_email_emergency(sender, instance, using, **kwargs):
     if not instance.is_standby:
@@ -1,4 +1,5 @@
-from rest_framework import serializers
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import permissions, serializers
 
 from api_volontaria.apps.user.serializers import UserLightSerializer
 from api_volontaria.apps.volunteer.models import (
@@ -6,15 +7,281 @@ from api_volontaria.apps.volunteer.models import (
     Participation,
     Cell,
     Event,
+    BulkImport,
 )
 
 
+def cached_representation(serializer_class, instance, context, expand=None):
+    """
+    Representation of an instance nested in another one.
+    The serializer and the resulting representation of each (model, pk)
+    are kept in the serialization context, so that an instance nested
+    in many elements of a response is only serialized once.
+    expand is given to the ExpandableFieldsMixin serializers, see
+    ExpandableFieldsMixin.get_expand.
+    """
+    serializers_cache = context.setdefault('nested_serializers', {})
+    representations = context.setdefault('nested_representations', {})
+
+    serializer_key = (serializer_class, expand)
+    key = (serializer_key, instance._meta.model, instance.pk)
+    if key not in representations:
+        if serializer_key not in serializers_cache:
+            kwargs = {}
+            if issubclass(serializer_class, ExpandableFieldsMixin):
+                kwargs['expand'] = expand
+            serializers_cache[serializer_key] = serializer_class(
+                context=context,
+                **kwargs
+            )
+        serializer = serializers_cache[serializer_key]
+        representations[key] = serializer.to_representation(instance)
+
+    return representations[key]
+
+
+def parse_query_list(request, name):
+    """
+    Comma separated values of a query parameter
+    :return: The set of values, None if the parameter is missing
+    """
+    if request is None or name not in request.query_params:
+        return None
+    return frozenset(
+        value.strip()
+        for value in request.query_params[name].split(',')
+        if value.strip()
+    )
+
+
+def is_expanded(expand, path):
+    """
+    Whether the relation at the dotted path is expanded, expanding a
+    relation expanding its parents
+    """
+    if expand is None:
+        return True
+    return any(
+        value == path or value.startswith(path + '.')
+        for value in expand
+    )
+
+
+class ExpandableFieldsMixin:
+    """
+    Sparse fieldsets and nesting control for the representation of the
+    serializer, driven by query parameters of the request:
+
+    - ?fields=id,start_time only returns these fields.
+    - ?expand=event,event.cell only nests the listed relations of
+      expandable_fields, the others being returned as urls. Without it,
+      all of them are nested.
+
+    The parameters only apply to the serializer of the view, its nested
+    serializers being given the part of expand about them.
+    """
+    expandable_fields = ()
+
+    # expand argument of the serializer of the view
+    EXPAND_FROM_REQUEST = object()
+
+    def __init__(self, *args, expand=EXPAND_FROM_REQUEST, **kwargs):
+        super(ExpandableFieldsMixin, self).__init__(*args, **kwargs)
+        if expand is not self.EXPAND_FROM_REQUEST:
+            self.expand = expand
+            return
+
+        request = self.context.get('request')
+        self.expand = parse_query_list(request, 'expand')
+
+        fields = parse_query_list(request, 'fields')
+        if fields and request.method in permissions.SAFE_METHODS:
+            for field_name in set(self.fields) - fields:
+                self.fields.pop(field_name)
+
+    def get_expand(self, field_name):
+        """
+        Part of expand about the relation, to give to its serializer
+        """
+        if self.expand is None:
+            return None
+        prefix = field_name + '.'
+        return frozenset(
+            value[len(prefix):]
+            for value in self.expand
+            if value.startswith(prefix)
+        )
+
+    def to_representation(self, instance):
+        data = super(ExpandableFieldsMixin, self).to_representation(instance)
+        for field_name, serializer_class in self.expandable_fields:
+            if field_name in data and is_expanded(self.expand, field_name):
+                data[field_name] = cached_representation(
+                    serializer_class,
+                    getattr(instance, field_name),
+                    self.context,
+                    expand=self.get_expand(field_name),
+                )
+        return data
+
+
+class ValuesNotSupported(Exception):
+    """
+    Raised when the representation of a serializer can not be built from
+    QuerySet.values() rows
+    """
+    pass
+
+
+class _UrlTemplate:
+    """
+    Urls of a hyperlinked field, reversed once with a placeholder as pk
+    """
+    PLACEHOLDER = 'pk_placeholder'
+
+    def __init__(self, field, request, format=None):
+        url = field.reverse(
+            field.view_name,
+            kwargs={field.lookup_url_kwarg: self.PLACEHOLDER},
+            request=request,
+            format=format,
+        )
+        self.prefix, self.suffix = url.split(self.PLACEHOLDER)
+
+    def __call__(self, pk):
+        return f'{self.prefix}{pk}{self.suffix}'
+
+
+class ValuesRepresentation:
+    """
+    Read path building the same representations as a hyperlinked
+    serializer from QuerySet.values() rows, without instantiating the
+    models nor calling reverse() for each url.
+
+    The fields of the serializer, ?fields= and ?expand= included, give
+    the columns to fetch (self.columns) and how to represent them.
+    Relations nested by an ExpandableFieldsMixin serializer are fetched
+    in the same rows, their columns being prefixed by the relation.
+    Raises ValuesNotSupported for fields needing the instance, like
+    SerializerMethodField.
+    """
+
+    def __init__(self, serializer, prefix=''):
+        request = serializer.context.get('request')
+        format = serializer.context.get('format')
+        model = serializer.Meta.model
+        expandable_fields = dict(getattr(serializer, 'expandable_fields', ()))
+
+        self.pk_column = prefix + model._meta.pk.name
+        self.columns = [self.pk_column]
+        # (field name, column, function representing the value,
+        # nested ValuesRepresentation)
+        self.fields = []
+
+        for field_name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if isinstance(field, serializers.HyperlinkedIdentityField):
+                column = self.pk_column
+            elif _is_column(model, field.source):
+                column = prefix + field.source
+            else:
+                raise ValuesNotSupported(field_name)
+
+            nested = None
+            if isinstance(field, serializers.ManyRelatedField):
+                raise ValuesNotSupported(field_name)
+            elif isinstance(field, serializers.HyperlinkedRelatedField):
+                if field.lookup_field != 'pk':
+                    raise ValuesNotSupported(field_name)
+                field_format = format
+                if field_format and field.format:
+                    field_format = field.format
+                to_representation = _UrlTemplate(field, request, field_format)
+
+                expanded = (
+                    field_name in expandable_fields and
+                    is_expanded(serializer.expand, field_name)
+                )
+                if expanded:
+                    nested = ValuesRepresentation(
+                        _nested_serializer(
+                            expandable_fields[field_name],
+                            serializer,
+                            field_name,
+                        ),
+                        prefix=column + '__',
+                    )
+                    self.columns += nested.columns
+            elif isinstance(field, (serializers.RelatedField,
+                                    serializers.SerializerMethodField,
+                                    serializers.BaseSerializer)):
+                raise ValuesNotSupported(field_name)
+            else:
+                to_representation = field.to_representation
+
+            if column not in self.columns:
+                self.columns.append(column)
+            self.fields.append((field_name, column, to_representation, nested))
+
+    def to_representation(self, row, nested_representations=None):
+        """
+        Representation of a row, the nested representations of each pk
+        being built once and kept in nested_representations
+        """
+        if nested_representations is None:
+            nested_representations = {}
+
+        ret = {}
+        for field_name, column, to_representation, nested in self.fields:
+            value = row[column]
+            if value is None:
+                ret[field_name] = None
+            elif nested is None:
+                ret[field_name] = to_representation(value)
+            else:
+                representations = nested_representations.setdefault(
+                    column,
+                    {},
+                )
+                if value not in representations:
+                    representations[value] = nested.to_representation(
+                        row,
+                        nested_representations,
+                    )
+                ret[field_name] = representations[value]
+        return ret
+
+    def to_representations(self, rows):
+        nested_representations = {}
+        return [
+            self.to_representation(row, nested_representations)
+            for row in rows
+        ]
+
+
+def _is_column(model, source):
+    try:
+        model_field = model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return False
+    return model_field.concrete and not model_field.many_to_many
+
+
+def _nested_serializer(serializer_class, serializer, field_name):
+    kwargs = {}
+    if issubclass(serializer_class, ExpandableFieldsMixin):
+        kwargs['expand'] = serializer.get_expand(field_name)
+    return serializer_class(context=serializer.context, **kwargs)
+
+
 class CellSerializer(serializers.HyperlinkedModelSerializer):
     id = serializers.ReadOnlyField()
 
     class Meta:
         model = Cell
-        fields = '__all__'
+        exclude = ['updated_at']
 
 
 class TaskTypeSerializer(serializers.HyperlinkedModelSerializer):
@@ -22,21 +289,55 @@ class TaskTypeSerializer(serializers.HyperlinkedModelSerializer):
 
     class Meta:
         model = TaskType
-        fields = '__all__'
+        exclude = ['updated_at']
+
+
+class EventSerializer(ExpandableFieldsMixin,
+                      serializers.HyperlinkedModelSerializer):
+    id = serializers.ReadOnlyField()
+    expandable_fields = (
+        ('task_type', TaskTypeSerializer),
+        ('cell', CellSerializer),
+    )
+
+    class Meta:
+        model = Event
+        fields = [
+            'id',
+            'url',
+            'description',
+            'start_time',
+            'end_time',
+            'nb_volunteers_needed',
+            'nb_volunteers_standby_needed',
+            'nb_volunteers',
+            'nb_volunteers_standby',
+            'cell',
+            'task_type',
+        ]
 
 
-class ParticipationSerializer(serializers.HyperlinkedModelSerializer):
+class ParticipationSerializer(ExpandableFieldsMixin,
+                              serializers.HyperlinkedModelSerializer):
     id = serializers.ReadOnlyField()
+    expandable_fields = (
+        ('user', UserLightSerializer),
+        ('event', EventSerializer),
+    )
 
     class Meta:
         model = Participation
-        fields = '__all__'
+        exclude = ['reminded_at']
 
     def validate_user(self, value):
         """
         Check that the user creating a participation for another user
         either belongs to staff or is user himself.
+        Without request, participations are created by the API itself,
+        like the bulk imports checked when they were submitted.
         """
+        if 'request' not in self.context:
+            return value
         if self.context['request'].user.is_staff:
             return value
         elif value == self.context['request'].user:
@@ -47,46 +348,31 @@ class ParticipationSerializer(serializers.HyperlinkedModelSerializer):
                 "an other user"
             )
 
-    def to_representation(self, instance):
-        data = super(ParticipationSerializer, self).to_representation(instance)
-        data['user'] = UserLightSerializer(
-            instance.user,
-            context={'request': self.context['request']}
-        ).data
-        data['event'] = EventSerializer(
-            instance.event,
-            context={'request': self.context['request']}
-        ).data
-        return data
-
 
-class EventSerializer(serializers.HyperlinkedModelSerializer):
+class BulkImportSerializer(serializers.HyperlinkedModelSerializer):
     id = serializers.ReadOnlyField()
+    upsert_key = serializers.JSONField(read_only=True)
+    created_ranges = serializers.JSONField(read_only=True)
+    created = serializers.HyperlinkedIdentityField(
+        view_name='bulkimport-created',
+    )
 
     class Meta:
-        model = Event
+        model = BulkImport
         fields = [
             'id',
             'url',
-            'description',
-            'start_time',
-            'end_time',
-            'nb_volunteers_needed',
-            'nb_volunteers_standby_needed',
-            'nb_volunteers',
-            'nb_volunteers_standby',
-            'cell',
-            'task_type',
+            'created_by',
+            'created_at',
+            'status',
+            'started_at',
+            'finished_at',
+            'upsert_key',
+            'nb_rows_processed',
+            'nb_created',
+            'nb_updated',
+            'nb_unchanged',
+            'created_ranges',
+            'created',
+            'error',
         ]
-
-    def to_representation(self, instance):
-        data = super(EventSerializer, self).to_representation(instance)
-        data['task_type'] = TaskTypeSerializer(
-            instance.task_type,
-            context={'request': self.context['request']}
-        ).data
-        data['cell'] = CellSerializer(
-            instance.cell,
-            context={'request': self.context['request']}
-        ).data
-        return data
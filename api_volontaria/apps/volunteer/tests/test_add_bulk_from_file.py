@@ -1,14 +1,28 @@
-from io import StringIO
+import json
+from io import BytesIO, StringIO
+from unittest import skipIf
 
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
 
 from api_volontaria.apps.volunteer.helpers import (
+    BulkAddSummary,
     InvalidBulkUpdate,
     add_bulk_from_file,
+    stream_bulk_from_file,
     AddBulkConfig
 )
-from api_volontaria.apps.volunteer.models import TaskType
-from api_volontaria.apps.volunteer.serializers import TaskTypeSerializer
+from api_volontaria.apps.volunteer.models import Cell, Event, TaskType
+from api_volontaria.apps.volunteer.serializers import (
+    EventSerializer,
+    TaskTypeSerializer,
+)
+
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
 
 TASK_TYPE_VALID_CSV_HEADER = "name,"
 TASK_TYPE_INVALID_CSV_HEADER = "name_typo,"
@@ -24,11 +38,25 @@ TASK_TYPE_CUSTOM_MAPPING_MISSING_TARGET_KEY = {
     "name_typo": "name_will_be_missing"
 }
 
+EVENT_VALID_CSV_HEADER = "description,start_time,end_time,cell,task_type"
+EVENT_CSV_LINE = "My event,2140-01-15T08:00:00-05:00," \
+                 "2140-01-15T12:00:00-05:00,{cell},{task_type}"
+
 
 def make_file_data(*lines: str):
     return StringIO("\n".join(lines))
 
 
+def make_xlsx_file_data(*rows: list):
+    workbook = Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    file_data = BytesIO()
+    workbook.save(file_data)
+    file_data.seek(0)
+    return file_data
+
+
 class TestAddBulk(TestCase):
     def test_unknown_format_is_given(self):
         """
@@ -176,3 +204,303 @@ class TestAddBulk(TestCase):
 
         self.assertSetEqual(created_ids, set(ids))
         self.assertEqual(initial_number + 2, TaskType.objects.count())
+
+
+class TestBulkAddSummary(TestCase):
+    def test_created_ids_are_stored_as_ranges(self):
+        """
+        Ensure consecutive ids are merged in ranges that can be indexed
+        and sliced like the list of ids
+        """
+        ids = [1, 2, 3, 7, 8, 10]
+        summary = BulkAddSummary()
+        summary.add_ids(ids[:4])
+        summary.add_ids(ids[4:])
+
+        self.assertEqual(summary.nb_created, 6)
+        self.assertEqual(summary.created_ranges, [[1, 3], [7, 8], [10, 10]])
+        self.assertEqual(len(summary.created_ids), 6)
+        self.assertEqual(list(summary.created_ids), ids)
+        self.assertEqual(summary.created_ids[2:5], ids[2:5])
+        self.assertEqual(summary.created_ids[-1], 10)
+
+
+class TestAddBulkEvents(TestCase):
+
+    def setUp(self):
+        self.cells = [
+            Cell.objects.create(
+                name=f'My new cell {i}',
+                address_line_1='373 Rue villeneuve E',
+                postal_code='H2T 1M1',
+                city='Montreal',
+                state_province='Quebec',
+                longitude='45.540237',
+                latitude='-73.603421',
+            )
+            for i in range(2)
+        ]
+        self.tasktypes = [
+            TaskType.objects.create(name=f'My new tasktype {i}')
+            for i in range(2)
+        ]
+
+    def make_event_line(self, i):
+        return EVENT_CSV_LINE.format(
+            cell=reverse(
+                'cell-detail',
+                args=[self.cells[i % 2].id],
+            ),
+            task_type=reverse(
+                'tasktype-detail',
+                args=[self.tasktypes[i % 2].id],
+            ),
+        )
+
+    def test_events_are_added_with_batched_queries(self):
+        """
+        Ensure that the cells and task types are fetched once for all
+        the lines and that events are inserted by batches
+        """
+        file_data = make_file_data(
+            EVENT_VALID_CSV_HEADER,
+            *[self.make_event_line(i) for i in range(5)]
+        )
+        config = AddBulkConfig(EventSerializer, "csv", {}, batch_size=2)
+
+        # Savepoint and its release, one query for the cells, one for the
+        # task types, and for each of the 3 batches one insert, and one
+        # query to get the ids if the insert can't return them (SQLite)
+        nb_queries = 7
+        if not connection.features.can_return_ids_from_bulk_insert:
+            nb_queries += 3
+        with self.assertNumQueries(nb_queries):
+            ids = add_bulk_from_file(file_data, config)
+
+        self.assertEqual(len(ids), 5)
+        events = Event.objects.in_bulk(ids)
+        for i, id_ in enumerate(ids):
+            self.assertEqual(events[id_].cell, self.cells[i % 2])
+            self.assertEqual(events[id_].task_type, self.tasktypes[i % 2])
+            self.assertEqual(events[id_].description, 'My event')
+
+    def test_invalid_line_is_reported(self):
+        """
+        Ensure the line of the first invalid element is reported and that
+        no element is added
+        """
+        file_data = make_file_data(
+            EVENT_VALID_CSV_HEADER,
+            self.make_event_line(0),
+            self.make_event_line(1),
+            EVENT_CSV_LINE.format(
+                cell='/cells/0',
+                task_type=reverse(
+                    'tasktype-detail',
+                    args=[self.tasktypes[0].id],
+                ),
+            ),
+        )
+        config = AddBulkConfig(EventSerializer, "csv", {})
+
+        with self.assertRaises(InvalidBulkUpdate) as context:
+            add_bulk_from_file(file_data, config)
+
+        self.assertIn("line 4 of the csv file", context.exception.error)
+        self.assertIn("cell", context.exception.error)
+        self.assertEqual(Event.objects.count(), 0)
+
+    def make_event_data(self, i):
+        return dict(zip(
+            EVENT_VALID_CSV_HEADER.split(','),
+            self.make_event_line(i).split(','),
+        ))
+
+    def test_events_are_added_from_jsonl(self):
+        """
+        Ensure that events are added from a JSON Lines file, blank lines
+        being ignored
+        """
+        file_data = make_file_data(
+            json.dumps(self.make_event_data(0)),
+            "",
+            json.dumps(self.make_event_data(1)),
+        )
+        config = AddBulkConfig(EventSerializer, "jsonl", {})
+
+        ids = add_bulk_from_file(file_data, config)
+
+        events = Event.objects.in_bulk(ids)
+        self.assertEqual(len(events), 2)
+        for i, id_ in enumerate(ids):
+            self.assertEqual(events[id_].cell, self.cells[i % 2])
+
+    def test_jsonl_invalid_line_is_reported(self):
+        """
+        Ensure the line of the first invalid element of a JSON Lines file
+        is reported and that no element is added
+        """
+        invalid_data = self.make_event_data(1)
+        invalid_data['cell'] = '/cells/0'
+        file_data = make_file_data(
+            json.dumps(self.make_event_data(0)),
+            "",
+            json.dumps(invalid_data),
+        )
+        config = AddBulkConfig(EventSerializer, "jsonl", {})
+
+        with self.assertRaises(InvalidBulkUpdate) as context:
+            add_bulk_from_file(file_data, config)
+
+        self.assertIn("line 3 of the jsonl file", context.exception.error)
+        self.assertEqual(Event.objects.count(), 0)
+
+    def test_jsonl_line_is_not_an_object(self):
+        """
+        Ensure an InvalidBulkUpdate exception is raised when a line of a
+        JSON Lines file is not a json object
+        """
+        file_data = make_file_data(
+            json.dumps(self.make_event_data(0)),
+            "[1, 2]",
+        )
+        config = AddBulkConfig(EventSerializer, "jsonl", {})
+
+        with self.assertRaises(InvalidBulkUpdate) as context:
+            add_bulk_from_file(file_data, config)
+
+        self.assertIn("Line 2", context.exception.error)
+
+    @skipIf(Workbook is None, 'openpyxl is not installed')
+    def test_events_are_added_from_xlsx(self):
+        """
+        Ensure that events are added from the first worksheet of a xlsx
+        file, with a mapping on its header
+        """
+        header = EVENT_VALID_CSV_HEADER.split(',')
+        file_data = make_xlsx_file_data(
+            [key.upper() for key in header],
+            *[self.make_event_line(i).split(',') for i in range(3)]
+        )
+        config = AddBulkConfig(
+            EventSerializer,
+            "xlsx",
+            {key.upper(): key for key in header},
+        )
+
+        ids = add_bulk_from_file(file_data, config)
+
+        events = Event.objects.in_bulk(ids)
+        self.assertEqual(len(events), 3)
+        for i, id_ in enumerate(ids):
+            self.assertEqual(events[id_].cell, self.cells[i % 2])
+            self.assertEqual(events[id_].task_type, self.tasktypes[i % 2])
+
+    @skipIf(Workbook is None, 'openpyxl is not installed')
+    def test_xlsx_header_is_missing_required_fields(self):
+        """
+        Ensure an InvalidBulkUpdate exception is raised when the header of
+        a xlsx file is missing keys for the creation of the events
+        """
+        file_data = make_xlsx_file_data(['description', 'cell'])
+        config = AddBulkConfig(EventSerializer, "xlsx", {})
+
+        self.assertRaises(
+            InvalidBulkUpdate,
+            add_bulk_from_file,
+            file_data,
+            config,
+        )
+
+    def test_events_are_upserted(self):
+        """
+        Ensure that events matching the upsert key are updated in place,
+        or left unchanged, and that the other ones are inserted
+        """
+        file_data = make_file_data(
+            EVENT_VALID_CSV_HEADER,
+            *[self.make_event_line(i) for i in range(2)]
+        )
+        config = AddBulkConfig(
+            EventSerializer,
+            "csv",
+            {},
+            upsert_key=('cell', 'task_type', 'start_time'),
+        )
+        ids = add_bulk_from_file(file_data, config)
+
+        file_data = make_file_data(
+            EVENT_VALID_CSV_HEADER,
+            self.make_event_line(0),
+            self.make_event_line(1).replace('My event', 'Corrected event'),
+            self.make_event_line(2).replace('08:00:00', '09:00:00'),
+        )
+        # Savepoint and its release, one query for the cells, one for the
+        # task types, one for the matching events, one update, one insert,
+        # and one query to get the id if the insert can't return it
+        nb_queries = 7
+        if not connection.features.can_return_ids_from_bulk_insert:
+            nb_queries += 1
+        with self.assertNumQueries(nb_queries):
+            summary = stream_bulk_from_file(file_data, config)
+
+        self.assertEqual(summary.nb_rows, 3)
+        self.assertEqual(summary.nb_created, 1)
+        self.assertEqual(summary.nb_updated, 1)
+        self.assertEqual(summary.nb_unchanged, 1)
+        self.assertEqual(Event.objects.count(), 3)
+        self.assertEqual(
+            Event.objects.get(pk=ids[1]).description,
+            'Corrected event',
+        )
+        self.assertEqual(
+            Event.objects.get(pk=summary.created_ids[0]).cell,
+            self.cells[0],
+        )
+
+    def test_upsert_key_is_duplicated(self):
+        """
+        Ensure an InvalidBulkUpdate exception is raised when two lines
+        have the same upsert key
+        """
+        file_data = make_file_data(
+            EVENT_VALID_CSV_HEADER,
+            self.make_event_line(0),
+            self.make_event_line(1),
+            self.make_event_line(0),
+        )
+        config = AddBulkConfig(
+            EventSerializer,
+            "csv",
+            {},
+            upsert_key=('cell', 'start_time'),
+        )
+
+        with self.assertRaises(InvalidBulkUpdate) as context:
+            add_bulk_from_file(file_data, config)
+
+        self.assertIn("Line 4", context.exception.error)
+        self.assertEqual(Event.objects.count(), 0)
+
+    def test_upsert_key_is_invalid(self):
+        """
+        Ensure an InvalidBulkUpdate exception is raised when the upsert
+        key contains fields that cannot identify an element
+        """
+        file_data = make_file_data(
+            EVENT_VALID_CSV_HEADER,
+            self.make_event_line(0),
+        )
+        config = AddBulkConfig(
+            EventSerializer,
+            "csv",
+            {},
+            upsert_key=('cell', 'nb_volunteers'),
+        )
+
+        self.assertRaises(
+            InvalidBulkUpdate,
+            add_bulk_from_file,
+            file_data,
+            config,
+        )
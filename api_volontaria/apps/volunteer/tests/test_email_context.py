@@ -0,0 +1,126 @@
+from datetime import datetime
+
+import pytz
+from django.conf import settings
+from django.test import TestCase
+from django.utils import timezone
+
+from api_volontaria.apps.volunteer.models import (
+    Cell,
+    Event,
+    Participation,
+    TaskType,
+)
+from api_volontaria.factories import UserFactory
+
+LOCAL_TIMEZONE = pytz.timezone(settings.TIME_ZONE)
+
+
+class EmailContextTests(TestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+
+        self.cell = Cell.objects.create(
+            name='My new cell',
+            address_line_1='373 Rue villeneuve E',
+            postal_code='H2T 1M1',
+            city='Montreal',
+            state_province='Quebec',
+            longitude='45.540237',
+            latitude='-73.603421',
+        )
+
+        self.tasktype = TaskType.objects.create(
+            name='My new tasktype',
+        )
+
+        self.event = Event.objects.create(
+            start_time=LOCAL_TIMEZONE.localize(datetime(2140, 1, 15, 8)),
+            end_time=LOCAL_TIMEZONE.localize(datetime(2140, 1, 17, 12)),
+            nb_volunteers_needed=10,
+            nb_volunteers_standby_needed=0,
+            cell=self.cell,
+            task_type=self.tasktype,
+        )
+
+    def build_email_confirmation(self):
+        participation = Participation(
+            event=Event.objects.get(pk=self.event.pk),
+            user=self.user,
+            is_standby=False,
+        )
+        return participation.build_email_confirmation()
+
+    def test_event_context_is_cached(self):
+        """
+        Ensure the context describing an event is built once for the
+        next emails.
+        """
+        email = self.build_email_confirmation()
+        self.assertIn('De 8h00 à 12h00', email.body)
+        self.assertIn('My new cell', email.body)
+
+        event = Event.objects.select_related(
+            'cell',
+            'task_type',
+        ).get(pk=self.event.pk)
+        participation = Participation(
+            event=event,
+            user=self.user,
+            is_standby=True,
+        )
+        with self.assertNumQueries(0):
+            email = participation.build_email_confirmation()
+
+        self.assertIn('Remplaçant', email.body)
+        self.assertIn('My new cell', email.body)
+
+    def test_event_context_is_refreshed_on_change(self):
+        """
+        Ensure the context of an event is built again when the event,
+        its cell or its task type changes, but not when its headcounts
+        change.
+        """
+        self.build_email_confirmation()
+
+        Participation.objects.create(
+            event=self.event,
+            user=self.user,
+            is_standby=False,
+        )
+        updated_at = self.event.updated_at
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.updated_at, updated_at)
+
+        self.event.start_time = LOCAL_TIMEZONE.localize(
+            datetime(2140, 1, 15, 9)
+        )
+        self.event.save()
+        email = self.build_email_confirmation()
+        self.assertIn('De 9h00 à 12h00', email.body)
+
+        self.cell.name = 'My renamed cell'
+        self.cell.save()
+        email = self.build_email_confirmation()
+        self.assertIn('My renamed cell', email.body)
+
+        self.tasktype.name = 'My renamed tasktype'
+        self.tasktype.save()
+        email = self.build_email_confirmation()
+        self.assertIn('My renamed tasktype', email.body)
+
+    def test_event_context_is_refreshed_on_change_by_another_process(self):
+        """
+        Ensure the context of an event is built again when its cell
+        changes without the signals of this process, as when it is
+        changed by another process.
+        """
+        self.build_email_confirmation()
+
+        Cell.objects.filter(pk=self.cell.pk).update(
+            name='My renamed cell',
+            updated_at=timezone.now(),
+        )
+        email = self.build_email_confirmation()
+        self.assertIn('My renamed cell', email.body)
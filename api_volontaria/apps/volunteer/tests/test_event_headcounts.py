@@ -0,0 +1,231 @@
+from datetime import datetime
+from io import StringIO
+
+import pytz
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from api_volontaria.apps.volunteer.helpers import (
+    AddBulkConfig,
+    add_bulk_from_file,
+)
+
+from api_volontaria.apps.volunteer.models import (
+    Cell,
+    Event,
+    Participation,
+    TaskType,
+)
+from api_volontaria.apps.volunteer.serializers import (
+    ParticipationSerializer,
+)
+from api_volontaria.factories import UserFactory
+
+LOCAL_TIMEZONE = pytz.timezone(settings.TIME_ZONE)
+
+
+class EventHeadcountsTests(TestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.user2 = UserFactory()
+
+        self.cell = Cell.objects.create(
+            name='My new cell',
+            address_line_1='373 Rue villeneuve E',
+            postal_code='H2T 1M1',
+            city='Montreal',
+            state_province='Quebec',
+            longitude='45.540237',
+            latitude='-73.603421',
+        )
+
+        self.tasktype = TaskType.objects.create(
+            name='My new tasktype',
+        )
+
+        self.event = Event.objects.create(
+            start_time=LOCAL_TIMEZONE.localize(datetime(2140, 1, 15, 8)),
+            end_time=LOCAL_TIMEZONE.localize(datetime(2140, 1, 17, 12)),
+            nb_volunteers_needed=10,
+            nb_volunteers_standby_needed=0,
+            cell=self.cell,
+            task_type=self.tasktype,
+        )
+
+        self.event2 = Event.objects.create(
+            start_time=LOCAL_TIMEZONE.localize(datetime(2140, 1, 15, 8)),
+            end_time=LOCAL_TIMEZONE.localize(datetime(2140, 1, 17, 12)),
+            nb_volunteers_needed=10,
+            nb_volunteers_standby_needed=0,
+            cell=self.cell,
+            task_type=self.tasktype,
+        )
+
+    def assertHeadcounts(self, event, nb_volunteers, nb_volunteers_standby):
+        event.refresh_from_db()
+        self.assertEqual(event.nb_volunteers, nb_volunteers)
+        self.assertEqual(event.nb_volunteers_standby, nb_volunteers_standby)
+
+    def test_headcounts_on_create(self):
+        """
+        Ensure creating participations increments the event headcounts.
+        """
+        Participation.objects.create(
+            event=self.event,
+            user=self.user,
+            is_standby=False,
+        )
+        Participation.objects.create(
+            event=self.event,
+            user=self.user2,
+            is_standby=True,
+        )
+
+        self.assertHeadcounts(self.event, 1, 1)
+        self.assertHeadcounts(self.event2, 0, 0)
+
+    def test_headcounts_on_standby_change(self):
+        """
+        Ensure changing is_standby moves the participation from one
+        headcount to the other.
+        """
+        participation = Participation.objects.create(
+            event=self.event,
+            user=self.user,
+            is_standby=False,
+        )
+
+        participation.is_standby = True
+        participation.save()
+        self.assertHeadcounts(self.event, 0, 1)
+
+        # Saving again without change does not count it twice
+        participation.save()
+        self.assertHeadcounts(self.event, 0, 1)
+
+        participation = Participation.objects.get(pk=participation.pk)
+        participation.is_standby = False
+        participation.save()
+        self.assertHeadcounts(self.event, 1, 0)
+
+    def test_headcounts_on_event_change(self):
+        """
+        Ensure moving a participation to another event updates both events.
+        """
+        participation = Participation.objects.create(
+            event=self.event,
+            user=self.user,
+            is_standby=False,
+        )
+
+        participation.event = self.event2
+        participation.save()
+
+        self.assertHeadcounts(self.event, 0, 0)
+        self.assertHeadcounts(self.event2, 1, 0)
+
+    def test_headcounts_on_delete(self):
+        """
+        Ensure deleting a participation decrements the event headcounts.
+        """
+        participation = Participation.objects.create(
+            event=self.event,
+            user=self.user,
+            is_standby=True,
+        )
+
+        participation.delete()
+
+        self.assertHeadcounts(self.event, 0, 0)
+
+    def test_headcounts_with_deferred_fields(self):
+        """
+        Ensure participations loaded with deferred fields are not
+        refreshed one by one, and still update the headcounts on save.
+        """
+        for user in (self.user, self.user2):
+            Participation.objects.create(
+                event=self.event,
+                user=user,
+                is_standby=False,
+            )
+
+        with self.assertNumQueries(1):
+            participations = list(Participation.objects.only('id'))
+        self.assertEqual(len(participations), 2)
+
+        participation = participations[0]
+        participation.is_standby = True
+        participation.save()
+        self.assertHeadcounts(self.event, 1, 1)
+
+        participations[1].delete()
+        self.assertHeadcounts(self.event, 0, 1)
+
+    def test_headcounts_on_bulk_upsert(self):
+        """
+        Ensure participations added and updated in bulk are counted in
+        the headcounts of their events.
+        """
+        Participation.objects.create(
+            event=self.event,
+            user=self.user,
+            is_standby=False,
+        )
+
+        event_url = reverse('event-detail', args=[self.event.id])
+        file_data = StringIO("\n".join([
+            "event,user,is_standby",
+            f"{event_url},{reverse('user-detail', args=[self.user.id])},"
+            "True",
+            f"{event_url},{reverse('user-detail', args=[self.user2.id])},"
+            "True",
+        ]))
+        config = AddBulkConfig(
+            ParticipationSerializer,
+            "csv",
+            {},
+            upsert_key=('event', 'user'),
+        )
+
+        add_bulk_from_file(file_data, config)
+
+        self.assertHeadcounts(self.event, 0, 2)
+        self.assertEqual(Participation.objects.count(), 2)
+
+    def test_update_event_headcounts_command(self):
+        """
+        Ensure the command reports and fixes drifted headcounts.
+        """
+        Participation.objects.create(
+            event=self.event,
+            user=self.user,
+            is_standby=False,
+        )
+        Participation.objects.create(
+            event=self.event,
+            user=self.user2,
+            is_standby=True,
+        )
+        # Bypass the signals to introduce a drift
+        Event.objects.filter(pk=self.event.pk).update(
+            nb_volunteers=5,
+            nb_volunteers_standby=0,
+        )
+
+        out = StringIO()
+        call_command('update_event_headcounts', '--dry-run', stdout=out)
+
+        self.assertIn(f'Event {self.event.id}:', out.getvalue())
+        self.assertNotIn(f'Event {self.event2.id}:', out.getvalue())
+        self.assertIn('1 event(s) with drifted headcounts', out.getvalue())
+        self.assertHeadcounts(self.event, 5, 0)
+
+        out = StringIO()
+        call_command('update_event_headcounts', stdout=out)
+
+        self.assertIn('1 event(s) headcounts fixed', out.getvalue())
+        self.assertHeadcounts(self.event, 1, 1)
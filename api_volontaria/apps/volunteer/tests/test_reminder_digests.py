@@ -0,0 +1,140 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from api_volontaria.apps.notification.models import OutboxEmail
+from api_volontaria.apps.volunteer.digests import queue_reminder_digests
+from api_volontaria.apps.volunteer.models import (
+    Cell,
+    Event,
+    Participation,
+    TaskType,
+)
+from api_volontaria.factories import UserFactory
+
+
+class ReminderDigestsTests(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.user = UserFactory()
+        self.user.first_name = 'Marie'
+        self.user.save()
+        self.user2 = UserFactory()
+
+        self.cell = Cell.objects.create(
+            name='My new cell',
+            address_line_1='373 Rue villeneuve E',
+            postal_code='H2T 1M1',
+            city='Montreal',
+            state_province='Quebec',
+            longitude='45.540237',
+            latitude='-73.603421',
+        )
+
+        self.tasktype = TaskType.objects.create(
+            name='My new tasktype',
+        )
+
+        self.events = [
+            Event.objects.create(
+                start_time=self.now + timedelta(days=days),
+                end_time=self.now + timedelta(days=days, hours=4),
+                nb_volunteers_needed=10,
+                nb_volunteers_standby_needed=0,
+                cell=self.cell,
+                task_type=self.tasktype,
+            )
+            for days in (1, 3, 20, -2)
+        ]
+
+        for event in self.events:
+            Participation.objects.create(
+                event=event,
+                user=self.user,
+                is_standby=False,
+            )
+        Participation.objects.create(
+            event=self.events[1],
+            user=self.user2,
+            is_standby=True,
+        )
+
+        # Confirmation emails of the participations above
+        OutboxEmail.objects.all().delete()
+
+    def test_one_digest_per_user(self):
+        """
+        Ensure each user gets one email listing all their participations
+        to the events starting within the given period.
+        """
+        nb_digests, nb_reminded = queue_reminder_digests(
+            self.now,
+            self.now + timedelta(days=7),
+        )
+
+        self.assertEqual(nb_digests, 2)
+        self.assertEqual(nb_reminded, 3)
+
+        email = OutboxEmail.objects.get(to=[self.user.email])
+        self.assertIn('Bonjour Marie!', email.body)
+        self.assertEqual(email.body.count('My new tasktype'), 2)
+        self.assertIn('Bénévole', email.body)
+
+        email = OutboxEmail.objects.get(to=[self.user2.email])
+        self.assertEqual(email.body.count('My new tasktype'), 1)
+        self.assertIn('Remplaçant', email.body)
+
+        self.assertEqual(
+            Participation.objects.filter(
+                reminded_at__isnull=False,
+            ).count(),
+            3,
+        )
+
+    def test_participations_are_reminded_once(self):
+        """
+        Ensure running the digests again only reminds the participations
+        that were not reminded yet.
+        """
+        queue_reminder_digests(self.now, self.now + timedelta(days=7))
+
+        nb_digests, nb_reminded = queue_reminder_digests(
+            self.now,
+            self.now + timedelta(days=30),
+        )
+
+        self.assertEqual(nb_digests, 1)
+        self.assertEqual(nb_reminded, 1)
+        self.assertEqual(OutboxEmail.objects.count(), 3)
+
+    def test_digests_are_not_split_between_batches(self):
+        """
+        Ensure a user with more participations than the batch size still
+        gets a single digest.
+        """
+        nb_digests, nb_reminded = queue_reminder_digests(
+            self.now,
+            self.now + timedelta(days=30),
+            batch_size=1,
+        )
+
+        self.assertEqual(nb_digests, 2)
+        self.assertEqual(nb_reminded, 4)
+        self.assertEqual(OutboxEmail.objects.count(), 2)
+
+    def test_command(self):
+        """
+        Ensure the command queues the digests and reports its duration.
+        """
+        stdout = StringIO()
+        call_command('send_reminder_digests', '--days=30', stdout=stdout)
+
+        self.assertRegex(
+            stdout.getvalue(),
+            r'2 digest\(s\) queued for 4 participation\(s\) in [\d.]+s',
+        )
+        self.assertEqual(OutboxEmail.objects.count(), 2)
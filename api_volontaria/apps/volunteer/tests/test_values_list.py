@@ -0,0 +1,126 @@
+import json
+from datetime import datetime
+
+import pytz
+from django.conf import settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase
+
+from api_volontaria.apps.volunteer.models import Cell, Event, TaskType
+from api_volontaria.apps.volunteer.serializers import (
+    CellSerializer,
+    EventSerializer,
+    TaskTypeSerializer,
+)
+
+LOCAL_TIMEZONE = pytz.timezone(settings.TIME_ZONE)
+
+
+class ValuesListTests(APITestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+
+        cells = [
+            Cell.objects.create(
+                name=f'Cell {i}',
+                address_line_1='373 Rue villeneuve E',
+                address_line_2='' if i else 'Local 3',
+                postal_code='H2T 1M1',
+                city='Montreal',
+                state_province='Quebec',
+                longitude=45.540237,
+                latitude=-73.603421,
+            )
+            for i in range(2)
+        ]
+        tasktypes = [
+            TaskType.objects.create(name=f'Task type {i}')
+            for i in range(2)
+        ]
+
+        for i in range(5):
+            Event.objects.create(
+                description=f'Événement {i}',
+                start_time=LOCAL_TIMEZONE.localize(datetime(2140, 1, i + 1)),
+                end_time=LOCAL_TIMEZONE.localize(
+                    datetime(2140, 1, i + 1, 12, 30, 15, 500),
+                ),
+                nb_volunteers_needed=10,
+                nb_volunteers_standby_needed=i,
+                cell=cells[i % 2],
+                task_type=tasktypes[i % 2],
+            )
+
+    def assertSameAsSerializer(self, url, serializer_class, queryset):
+        """
+        Compare the list at the url with the representation of the
+        queryset by the serializer, as JSON
+        """
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        request = Request(APIRequestFactory().get(url))
+        expected = serializer_class(
+            queryset,
+            many=True,
+            context={'request': request},
+        ).data
+        self.assertEqual(
+            json.loads(response.content)['results'],
+            json.loads(JSONRenderer().render(expected)),
+        )
+
+    def test_cells(self):
+        """
+        Ensure the list of cells is the same as with the serializer.
+        """
+        self.assertSameAsSerializer(
+            reverse('cell-list'),
+            CellSerializer,
+            Cell.objects.all(),
+        )
+
+    def test_tasktypes(self):
+        """
+        Ensure the list of task types is the same as with the serializer.
+        """
+        self.assertSameAsSerializer(
+            reverse('tasktype-list'),
+            TaskTypeSerializer,
+            TaskType.objects.all(),
+        )
+
+    def test_events(self):
+        """
+        Ensure the list of events is the same as with the serializer,
+        with and without fields and nested relations.
+        """
+        events = Event.objects.all()
+        for query in ('', '?expand=', '?expand=cell',
+                      '?fields=id,url,end_time,task_type'):
+            with self.subTest(query=query):
+                self.assertSameAsSerializer(
+                    reverse('event-list') + query,
+                    EventSerializer,
+                    events,
+                )
+
+    def test_events_with_cursor(self):
+        """
+        Ensure the pages of events are the same as with the serializer
+        with the cursor pagination.
+        """
+        response = self.client.get(
+            reverse('event-list') + '?pagination=cursor&limit=2',
+        )
+        content = json.loads(response.content)
+
+        self.assertSameAsSerializer(
+            content['next'],
+            EventSerializer,
+            Event.objects.order_by('start_time', 'id')[2:4],
+        )
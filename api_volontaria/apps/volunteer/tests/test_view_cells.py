@@ -1,10 +1,13 @@
 import json
+from io import StringIO
 
+from django.core.management import call_command
 from rest_framework import status
 from rest_framework.test import APIClient
 from django.urls import reverse
 
 from api_volontaria.apps.volunteer.models import Cell
+from api_volontaria.response_cache import get_stats, reset_stats
 from api_volontaria.factories import (
     UserFactory,
     AdminFactory,
@@ -322,3 +325,139 @@ class CellsTests(CustomAPITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(content['results']), 1)
         self.check_attributes(content['results'][0])
+
+    def test_list_cells_not_modified(self):
+        """
+        Ensure an unchanged list of cells is not returned again, and that
+        updating or deleting a cell changes its ETag.
+        """
+        response = self.client.get(reverse('cell-list'))
+        etag = response['ETag']
+
+        response = self.client.get(
+            reverse('cell-list'),
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.cell.name = 'My renamed cell'
+        self.cell.save()
+        response = self.client.get(
+            reverse('cell-list'),
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        self.cell.delete()
+        response = self.client.get(
+            reverse('cell-list'),
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)['results'], [])
+
+    def test_retrieve_cell_not_modified(self):
+        """
+        Ensure an unchanged cell is not returned again, given its ETag or
+        its Last-Modified date.
+        """
+        url = reverse('cell-detail', args=[self.cell.id])
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+
+        for headers in [
+            {'HTTP_IF_NONE_MATCH': response['ETag']},
+            {'HTTP_IF_MODIFIED_SINCE': response['Last-Modified']},
+        ]:
+            response = self.client.get(url, **headers)
+            self.assertEqual(
+                response.status_code,
+                status.HTTP_304_NOT_MODIFIED,
+            )
+
+        self.cell.name = 'My renamed cell'
+        self.cell.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content)['name'],
+            'My renamed cell',
+        )
+
+    def test_list_cells_cached(self):
+        """
+        Ensure the list of cells is cached for the anonymous users until
+        a cell changes, and that the hits and misses are counted.
+        """
+        reset_stats()
+        self.addCleanup(reset_stats)
+
+        response = self.client.get(reverse('cell-list'))
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(1):
+            cached_response = self.client.get(reverse('cell-list'))
+        self.assertEqual(cached_response['X-Cache'], 'HIT')
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(cached_response['ETag'], response['ETag'])
+        self.assertEqual(get_stats(), {'hits': 1, 'misses': 1})
+
+        self.cell.name = 'My renamed cell'
+        self.cell.save()
+        response = self.client.get(reverse('cell-list'))
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(
+            json.loads(response.content)['results'][0]['name'],
+            'My renamed cell',
+        )
+
+        stdout = StringIO()
+        call_command('response_cache_stats', '--reset', stdout=stdout)
+        self.assertIn('1 hit(s), 2 miss(es)', stdout.getvalue())
+        self.assertEqual(get_stats(), {'hits': 0, 'misses': 0})
+
+    def test_retrieve_cell_cached(self):
+        """
+        Ensure a cell is cached for the anonymous users until it changes,
+        without losing its validators.
+        """
+        url = reverse('cell-detail', kwargs={'pk': self.cell.id})
+
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+        # Only the cell, to check its version
+        with self.assertNumQueries(1):
+            cached_response = self.client.get(url)
+        self.assertEqual(cached_response['X-Cache'], 'HIT')
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(cached_response['ETag'], response['ETag'])
+        self.assertEqual(
+            cached_response['Last-Modified'],
+            response['Last-Modified'],
+        )
+
+        self.cell.name = 'My renamed cell'
+        self.cell.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(
+            json.loads(response.content)['name'],
+            'My renamed cell',
+        )
+
+    def test_list_cells_not_cached_for_users(self):
+        """
+        Ensure the responses to the authenticated users are not cached.
+        """
+        self.client.force_authenticate(user=self.admin)
+
+        self.client.get(reverse('cell-list'))
+        response = self.client.get(reverse('cell-list'))
+
+        self.assertNotIn('X-Cache', response)
@@ -1,16 +1,30 @@
 import json
-from io import BytesIO
-from unittest.mock import patch
+import tempfile
+from io import BytesIO, StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test.utils import override_settings
 
 from rest_framework import status
 from rest_framework.test import APIClient, APIRequestFactory
 from django.urls import reverse
 
-from api_volontaria.apps.volunteer.helpers import InvalidBulkUpdate
+from api_volontaria.apps.volunteer.helpers import (
+    AddBulkConfig,
+    InvalidBulkUpdate,
+)
+from api_volontaria.apps.volunteer.serializers import EventSerializer
 from api_volontaria.apps.volunteer.models import (
     Event,
     Cell,
     TaskType,
+    Participation,
+    BulkImport,
 )
 from api_volontaria.factories import (
     UserFactory,
@@ -361,6 +375,343 @@ class EventsTests(CustomAPITestCase):
         self.assertEqual(len(content['results']), 1)
         self.check_attributes(content['results'][0])
 
+    def test_list_events_number_of_queries(self):
+        """
+        Ensure the number of queries needed to list events does not depend
+        on the number of events nor on their participations.
+        """
+        for i in range(5):
+            event = Event.objects.create(
+                start_time=LOCAL_TIMEZONE.localize(datetime(2140, 2, i + 1)),
+                end_time=LOCAL_TIMEZONE.localize(datetime(2140, 2, i + 2)),
+                nb_volunteers_needed=10,
+                nb_volunteers_standby_needed=0,
+                cell=self.cell,
+                task_type=self.tasktype,
+            )
+            Participation.objects.create(
+                event=event,
+                user=self.user,
+                is_standby=False,
+            )
+            Participation.objects.create(
+                event=event,
+                user=self.admin,
+                is_standby=True,
+            )
+
+        # One query for the version of the list, one to count the events,
+        # one to fetch the page
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                reverse('event-list'),
+            )
+
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(content['results']), 6)
+        for event in content['results']:
+            if event['id'] == self.event.id:
+                self.assertEqual(event['nb_volunteers'], 0)
+                self.assertEqual(event['nb_volunteers_standby'], 0)
+            else:
+                self.assertEqual(event['nb_volunteers'], 1)
+                self.assertEqual(event['nb_volunteers_standby'], 1)
+
+    def test_list_events_with_cursor(self):
+        """
+        Ensure we can go through the events ordered by start time with a
+        cursor, one query per page and without counting them.
+        """
+        for day in (3, 1, 1, 2):
+            Event.objects.create(
+                start_time=LOCAL_TIMEZONE.localize(datetime(2140, 2, day)),
+                end_time=LOCAL_TIMEZONE.localize(datetime(2140, 2, day, 4)),
+                nb_volunteers_needed=10,
+                nb_volunteers_standby_needed=0,
+                cell=self.cell,
+                task_type=self.tasktype,
+            )
+        events_ids = list(
+            Event.objects.order_by('start_time', 'id').values_list(
+                'id',
+                flat=True,
+            )
+        )
+
+        ids = []
+        url = reverse('event-list') + '?pagination=cursor&limit=2'
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            content = json.loads(response.content)
+            self.assertNotIn('count', content)
+            ids += [event['id'] for event in content['results']]
+            last_page = content
+            url = content['next']
+
+        self.assertEqual(ids, events_ids)
+
+        response = self.client.get(last_page['previous'])
+        content = json.loads(response.content)
+
+        self.assertEqual(
+            [event['id'] for event in content['results']],
+            events_ids[2:4],
+        )
+        self.assertIsNotNone(content['previous'])
+        self.assertIsNotNone(content['next'])
+
+    def test_list_events_with_invalid_cursor(self):
+        """
+        Ensure we get a 404 with a cursor we did not send.
+        """
+        response = self.client.get(
+            reverse('event-list') + '?cursor=invalid',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_events_without_count(self):
+        """
+        Ensure we can list events without counting them.
+        """
+        Event.objects.create(
+            start_time=LOCAL_TIMEZONE.localize(datetime(2140, 2, 1)),
+            end_time=LOCAL_TIMEZONE.localize(datetime(2140, 2, 2)),
+            nb_volunteers_needed=10,
+            nb_volunteers_standby_needed=0,
+            cell=self.cell,
+            task_type=self.tasktype,
+        )
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse('event-list') + '?count=false&limit=1',
+            )
+
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(content['count'])
+        self.assertEqual(len(content['results']), 1)
+        self.assertIn('offset=1', content['next'])
+
+        response = self.client.get(content['next'])
+        content = json.loads(response.content)
+
+        self.assertEqual(len(content['results']), 1)
+        self.assertIsNone(content['next'])
+
+    @override_settings(PAGINATION={
+        'COUNT': 'estimated',
+        'COUNT_THRESHOLD': 2,
+        'COUNT_CACHE_TIMEOUT': 60,
+    })
+    @patch('api_volontaria.pagination.estimate_count', return_value=None)
+    def test_list_events_with_cached_count(self, estimate_count):
+        """
+        Ensure large counts are cached for each set of filters, the exact
+        count being available on demand.
+        """
+        cache.clear()
+        self.addCleanup(cache.clear)
+        Event.objects.create(
+            start_time=LOCAL_TIMEZONE.localize(datetime(2140, 2, 1)),
+            end_time=LOCAL_TIMEZONE.localize(datetime(2140, 2, 2)),
+            nb_volunteers_needed=10,
+            nb_volunteers_standby_needed=0,
+            cell=self.cell,
+            task_type=self.tasktype,
+        )
+
+        response = self.client.get(reverse('event-list'))
+        self.assertEqual(json.loads(response.content)['count'], 2)
+
+        Event.objects.create(
+            start_time=LOCAL_TIMEZONE.localize(datetime(2140, 2, 3)),
+            end_time=LOCAL_TIMEZONE.localize(datetime(2140, 2, 4)),
+            nb_volunteers_needed=10,
+            nb_volunteers_standby_needed=0,
+            cell=self.cell,
+            task_type=self.tasktype,
+        )
+
+        # Without statistics to estimate the count from. One query for
+        # the version of the list, one to fetch the page.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('event-list'))
+        self.assertEqual(json.loads(response.content)['count'], 2)
+        self.assertEqual(response['X-Count-Exact'], 'false')
+
+        response = self.client.get(reverse('event-list') + '?count=exact')
+        self.assertEqual(json.loads(response.content)['count'], 3)
+        self.assertNotIn('X-Count-Exact', response)
+
+        # Other filters, other count
+        response = self.client.get(
+            reverse('event-list') + f'?cell={self.cell.id}',
+        )
+        self.assertEqual(json.loads(response.content)['count'], 3)
+
+    @override_settings(PAGINATION={
+        'COUNT': 'estimated',
+        'COUNT_THRESHOLD': 2,
+        'COUNT_CACHE_TIMEOUT': 60,
+    })
+    def test_list_events_with_estimated_count(self):
+        """
+        Ensure large counts are read from the json plan of PostgreSQL,
+        decoded by psycopg2.
+        """
+        postgresql = MagicMock(vendor='postgresql')
+        cursor = postgresql.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = ([{'Plan': {'Plan Rows': 1234}}],)
+
+        with patch(
+            'api_volontaria.pagination.connections',
+            {'default': postgresql},
+        ):
+            response = self.client.get(
+                reverse('event-list') + f'?cell={self.cell.id}',
+            )
+
+        self.assertEqual(json.loads(response.content)['count'], 1234)
+        self.assertEqual(response['X-Count-Exact'], 'false')
+        sql, params = cursor.execute.call_args[0]
+        self.assertTrue(sql.startswith('EXPLAIN (FORMAT JSON) SELECT'))
+        self.assertIn(self.cell.id, params)
+
+    def test_list_events_with_fields(self):
+        """
+        Ensure we can only ask for some fields, without fetching the
+        relations not returned.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('event-list') +
+                '?fields=id,start_time,end_time,nb_volunteers',
+            )
+
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(content['results'][0]),
+            {'id', 'start_time', 'end_time', 'nb_volunteers'},
+        )
+        self.assertNotIn('volunteer_cell', queries[-1]['sql'])
+        self.assertNotIn('volunteer_tasktype', queries[-1]['sql'])
+
+    def test_list_events_with_expand(self):
+        """
+        Ensure we can choose the nested relations, the others being
+        returned as urls.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('event-list') + '?expand=cell',
+            )
+
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.check_attributes(content['results'][0])
+        self.assertEqual(content['results'][0]['cell']['id'], self.cell.id)
+        self.assertEqual(
+            content['results'][0]['task_type'],
+            'http://testserver' + reverse(
+                'tasktype-detail',
+                args=[self.tasktype.id],
+            ),
+        )
+        self.assertIn('volunteer_cell', queries[-1]['sql'])
+        self.assertNotIn('volunteer_tasktype', queries[-1]['sql'])
+
+    def test_list_events_not_modified(self):
+        """
+        Ensure an unchanged list of events is not returned again, and that
+        a change of an event, of its headcounts or of its relations
+        changes its ETag.
+        """
+        response = self.client.get(reverse('event-list'))
+        etag = response['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse('event-list'),
+                HTTP_IF_NONE_MATCH=etag,
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+        changes = [
+            lambda: Participation.objects.create(
+                event=self.event,
+                user=self.user,
+                is_standby=False,
+            ),
+            lambda: self.tasktype.save(),
+            lambda: self.cell.save(),
+            lambda: self.event.save(),
+            lambda: self.event.delete(),
+        ]
+        for change in changes:
+            change()
+            response = self.client.get(
+                reverse('event-list'),
+                HTTP_IF_NONE_MATCH=etag,
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response['ETag'], etag)
+            etag = response['ETag']
+
+    def test_list_events_with_cursor_not_versioned(self):
+        """
+        Ensure the lists without total count do not have an ETag, its
+        version costing as much as the count.
+        """
+        response = self.client.get(
+            reverse('event-list') + '?pagination=cursor',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('ETag', response)
+
+    def test_list_events_cached(self):
+        """
+        Ensure the cached list of events is invalidated by the changes of
+        its headcounts and of its relations.
+        """
+        response = self.client.get(reverse('event-list') + '?expand=cell')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        response = self.client.get(reverse('event-list') + '?expand=cell')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+        Participation.objects.create(
+            event=self.event,
+            user=self.user,
+            is_standby=False,
+        )
+        response = self.client.get(reverse('event-list') + '?expand=cell')
+        content = json.loads(response.content)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(content['results'][0]['nb_volunteers'], 1)
+
+        self.cell.name = 'My renamed cell'
+        self.cell.save()
+        response = self.client.get(reverse('event-list') + '?expand=cell')
+        content = json.loads(response.content)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(
+            content['results'][0]['cell']['name'],
+            'My renamed cell',
+        )
+
     def test_bulk_events_as_users(self):
         """
         Ensure we can't bulk add events if we are a simple user.
@@ -521,3 +872,270 @@ class EventsTests(CustomAPITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(content, {'created': url_ids})
+
+    def make_bulk_file(self, nb_events, invalid_line=None):
+        cell_url = reverse('cell-detail', args=[self.cell.id])
+        tasktype_url = reverse('tasktype-detail', args=[self.tasktype.id])
+        lines = ["description,start_time,end_time,cell,task_type"] + [
+            f"Event {i},2140-01-15T08:00:00-05:00,"
+            f"2140-01-15T12:00:00-05:00,{cell_url},{tasktype_url}"
+            for i in range(nb_events)
+        ]
+        if invalid_line is not None:
+            lines[invalid_line - 1] = "Invalid event,not a date,,,"
+        return BytesIO("\n".join(lines).encode())
+
+    def test_bulk_events_stream_mode(self):
+        """
+        Ensure a summary of the created events is returned in stream mode
+        and that the urls of the events can be listed afterwards
+        """
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.post(
+            reverse('event-bulk'),
+            data={
+                "file": self.make_bulk_file(3),
+                "mode": "stream",
+            },
+            format='multipart'
+        )
+
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(content['nb_created'], 3)
+        ids = list(
+            Event.objects.exclude(pk=self.event.pk).order_by('pk')
+            .values_list('pk', flat=True)
+        )
+        self.assertEqual(content['created_ranges'], [[ids[0], ids[-1]]])
+
+        response = self.client.get(content['created'], {'limit': 2})
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(content['count'], 3)
+        self.assertEqual(
+            content['results'],
+            [reverse('event-detail', kwargs={'pk': id_}) for id_ in ids[:2]]
+        )
+
+    def test_bulk_events_upsert(self):
+        """
+        Ensure events matching the upsert key are not added again when a
+        file is uploaded twice, and that the counts are returned
+        """
+        self.client.force_authenticate(user=self.admin)
+
+        for _ in range(2):
+            response = self.client.post(
+                reverse('event-bulk'),
+                data={
+                    "file": self.make_bulk_file(3),
+                    "upsert_key": "cell,description",
+                },
+                format='multipart'
+            )
+
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(content, {
+            'created': [],
+            'nb_created': 0,
+            'nb_updated': 0,
+            'nb_unchanged': 3,
+        })
+        self.assertEqual(Event.objects.exclude(pk=self.event.pk).count(), 3)
+
+    def test_bulk_events_invalid_upsert_key(self):
+        """
+        Ensure bad request is returned if the upsert key contains fields
+        which cannot identify an event
+        """
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.post(
+            reverse('event-bulk'),
+            data={"file": BytesIO(), "upsert_key": "id,url"},
+            format='multipart'
+        )
+
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('upsert_key', content)
+
+    def test_bulk_events_invalid_mode(self):
+        """
+        Ensure bad request is returned if the given mode is unknown
+        """
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.post(
+            reverse('event-bulk'),
+            data={"file": BytesIO(), "mode": "unknown"},
+            format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"mode": ["Mode should be either default, stream or async"]}
+        )
+
+    def test_bulk_events_unknown_format(self):
+        """
+        Ensure bad request is returned if the given format is unknown,
+        before any bulk import is stored
+        """
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.post(
+            reverse('event-bulk'),
+            data={"file": BytesIO(), "format": "xml", "mode": "async"},
+            format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json.loads(response.content),
+            {"format": ["Format should be one of csv, jsonl, xlsx"]}
+        )
+        self.assertFalse(BulkImport.objects.exists())
+
+    def test_bulk_imports_as_user(self):
+        """
+        Ensure we can't see bulk imports if we are a simple user.
+        """
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(reverse('bulkimport-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(
+        MEDIA_ROOT=tempfile.mkdtemp(),
+        BULK_IMPORTS={
+            'WORKER': 'command',
+            'MAX_WORKERS': 1,
+            'STALE_TIMEOUT': 600,
+        },
+    )
+    def test_bulk_events_async_mode(self):
+        """
+        Ensure the file is stored for a worker in async mode, and that the
+        progress of the import can be followed
+        """
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.post(
+            reverse('event-bulk'),
+            data={
+                "file": self.make_bulk_file(3),
+                "mode": "async",
+            },
+            format='multipart'
+        )
+
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(content['status'], BulkImport.STATUS_PENDING)
+        self.assertEqual(content['nb_rows_processed'], 0)
+        self.assertEqual(Event.objects.count(), 1)
+
+        call_command('run_bulk_imports', stdout=StringIO())
+
+        response = self.client.get(content['url'])
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(content['status'], BulkImport.STATUS_SUCCEEDED)
+        self.assertEqual(content['nb_rows_processed'], 3)
+        self.assertEqual(content['nb_created'], 3)
+        self.assertIsNone(content['error'])
+        self.assertEqual(Event.objects.count(), 4)
+
+    @override_settings(
+        MEDIA_ROOT=tempfile.mkdtemp(),
+        BULK_IMPORTS={
+            'WORKER': 'command',
+            'MAX_WORKERS': 1,
+            'STALE_TIMEOUT': 600,
+        },
+    )
+    def test_bulk_events_async_mode_failure(self):
+        """
+        Ensure an asynchronous import reports the invalid line and keeps
+        the events of the chunks committed before it
+        """
+        bulk_import = BulkImport.objects.create(
+            created_by=self.admin,
+            file=SimpleUploadedFile(
+                'events.csv',
+                self.make_bulk_file(5, invalid_line=5).read(),
+            ),
+            serializer_class='api_volontaria.apps.volunteer.serializers.'
+                             'EventSerializer',
+            element_view_name='event-detail',
+        )
+
+        with patch.object(BulkImport, 'get_config') as get_config:
+            config = AddBulkConfig(EventSerializer, 'csv', {}, batch_size=2)
+            get_config.return_value = config
+            self.assertTrue(bulk_import.run())
+
+        bulk_import.refresh_from_db()
+
+        self.assertEqual(bulk_import.status, BulkImport.STATUS_FAILED)
+        self.assertIn("line 5 of the csv file", bulk_import.error)
+        self.assertEqual(bulk_import.nb_rows_processed, 2)
+        self.assertEqual(bulk_import.nb_created, 2)
+        self.assertEqual(Event.objects.count(), 3)
+
+        # A bulk import is only run once
+        self.assertFalse(bulk_import.run())
+
+    @override_settings(
+        MEDIA_ROOT=tempfile.mkdtemp(),
+        BULK_IMPORTS={
+            'WORKER': 'command',
+            'MAX_WORKERS': 1,
+            'STALE_TIMEOUT': 600,
+        },
+    )
+    def test_bulk_events_async_mode_stale(self):
+        """
+        Ensure the command fails the bulk imports left running by a
+        stopped worker, and only those
+        """
+        stale, alive = [
+            BulkImport.objects.create(
+                created_by=self.admin,
+                file=SimpleUploadedFile('events.csv', b''),
+                serializer_class='api_volontaria.apps.volunteer.'
+                                 'serializers.EventSerializer',
+                element_view_name='event-detail',
+                status=BulkImport.STATUS_RUNNING,
+                started_at=LOCAL_TIMEZONE.localize(datetime.now()),
+                heartbeat_at=heartbeat_at,
+            )
+            for heartbeat_at in (
+                LOCAL_TIMEZONE.localize(datetime(2000, 1, 1)),
+                LOCAL_TIMEZONE.localize(datetime.now()),
+            )
+        ]
+
+        stdout = StringIO()
+        call_command('run_bulk_imports', stdout=stdout)
+
+        stale.refresh_from_db()
+        alive.refresh_from_db()
+
+        self.assertIn('1 stale bulk import(s) failed', stdout.getvalue())
+        self.assertEqual(stale.status, BulkImport.STATUS_FAILED)
+        self.assertIn('Interrupted', stale.error)
+        self.assertIsNotNone(stale.finished_at)
+        self.assertEqual(alive.status, BulkImport.STATUS_RUNNING)
@@ -1,5 +1,6 @@
 import json
 from datetime import datetime
+from io import BytesIO, StringIO
 from decouple import config
 
 from rest_framework import status
@@ -7,12 +8,16 @@ from rest_framework.test import APIClient
 from django.urls import reverse
 
 from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.test.utils import override_settings
 
 import responses
 
 from api_volontaria.email import EmailAPI
 from api_volontaria.apps.log_management.models import EmailLog
+from api_volontaria.apps.notification.models import OutboxEmail
 
 from api_volontaria.apps.volunteer.models import (
     Participation,
@@ -103,6 +108,9 @@ class ParticipationsTests(CustomAPITestCase):
             is_standby=False,
         )
 
+        # Confirmations of the participations above
+        call_command('send_outbox_emails', stdout=StringIO())
+
     def test_create_new_participation_as_admin(self):
         """
         Ensure we can create a new participation if we are an admin.
@@ -502,6 +510,229 @@ class ParticipationsTests(CustomAPITestCase):
 
         self.assertTrue(at_least_one_participation_is_owned_by_somebody_else)
 
+    def test_list_participations_number_of_queries(self):
+        """
+        Ensure the number of queries needed to list participations does
+        not depend on the number of participations.
+        """
+        for i in range(5):
+            event = Event.objects.create(
+                start_time=LOCAL_TIMEZONE.localize(datetime(2140, 2, i + 1)),
+                end_time=LOCAL_TIMEZONE.localize(datetime(2140, 2, i + 2)),
+                nb_volunteers_needed=10,
+                nb_volunteers_standby_needed=0,
+                cell=self.cell,
+                task_type=self.tasktype,
+            )
+            Participation.objects.create(
+                event=event,
+                user=self.user,
+                is_standby=False,
+            )
+            Participation.objects.create(
+                event=event,
+                user=self.user2,
+                is_standby=True,
+            )
+
+        self.client.force_authenticate(user=self.admin)
+
+        # One query to count the participations, one to fetch the page
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse('participation-list'),
+            )
+
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(content['results']), 12)
+        for participation in content['results']:
+            self.check_attributes(participation)
+            if participation['event']['id'] != self.event2.id:
+                self.assertEqual(participation['event']['nb_volunteers'], 1)
+                self.assertEqual(
+                    participation['event']['nb_volunteers_standby'],
+                    1,
+                )
+
+    def test_list_participations_with_cursor(self):
+        """
+        Ensure we can go through our participations ordered by
+        registration date with a cursor, one query per page.
+        """
+        for i in range(5):
+            event = Event.objects.create(
+                start_time=LOCAL_TIMEZONE.localize(datetime(2140, 2, i + 1)),
+                end_time=LOCAL_TIMEZONE.localize(datetime(2140, 2, i + 2)),
+                nb_volunteers_needed=10,
+                nb_volunteers_standby_needed=0,
+                cell=self.cell,
+                task_type=self.tasktype,
+            )
+            Participation.objects.create(
+                event=event,
+                user=self.user,
+                is_standby=False,
+            )
+            Participation.objects.create(
+                event=event,
+                user=self.user2,
+                is_standby=True,
+            )
+        # Participations registered at the same time are ordered by id
+        Participation.objects.filter(event__start_time__day__gt=3).update(
+            registered_at=LOCAL_TIMEZONE.localize(datetime(2020, 1, 1)),
+        )
+        participations_ids = list(
+            Participation.objects.filter(
+                user=self.user,
+            ).order_by('registered_at', 'id').values_list('id', flat=True)
+        )
+
+        self.client.force_authenticate(user=self.user)
+
+        ids = []
+        url = reverse('participation-list') + '?pagination=cursor&limit=2'
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            content = json.loads(response.content)
+            ids += [
+                participation['id'] for participation in content['results']
+            ]
+            url = content['next']
+
+        self.assertEqual(ids, participations_ids)
+
+    def test_list_participations_with_expand(self):
+        """
+        Ensure we can only nest some relations of the participations,
+        the others being returned as urls without being fetched.
+        """
+        self.client.force_authenticate(user=self.admin)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('participation-list') +
+                '?expand=event&fields=id,event,user',
+            )
+
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        participation = content['results'][0]
+        self.assertEqual(set(participation), {'id', 'event', 'user'})
+        self.assertIsInstance(participation['user'], str)
+        self.assertIsInstance(participation['event'], dict)
+        self.assertIn('nb_volunteers', participation['event'])
+        self.assertIsInstance(participation['event']['cell'], str)
+
+        self.assertIn('volunteer_event', queries[-1]['sql'])
+        self.assertNotIn('volunteer_cell', queries[-1]['sql'])
+        self.assertNotIn('user_user', queries[-1]['sql'])
+
+    def make_bulk_file(self, *participations):
+        lines = ["event,user,is_standby"]
+        lines.extend(
+            f"{reverse('event-detail', args=[event.id])},"
+            f"{reverse('user-detail', args=[user.id])},"
+            f"{is_standby}"
+            for event, user, is_standby in participations
+        )
+        return BytesIO("\n".join(lines).encode())
+
+    def test_bulk_participations_as_admin(self):
+        """
+        Ensure staff can assign participations in bulk, the headcounts
+        of the events being updated and the confirmations queued in the
+        outbox with a single insert
+        """
+        self.client.force_authenticate(user=self.admin)
+        outbox_initial_email_count = len(mail.outbox)
+
+        response = self.client.post(
+            reverse('participation-bulk'),
+            data={
+                "file": self.make_bulk_file(
+                    (self.event, self.user, False),
+                    (self.event, self.user2, True),
+                    (self.event, self.admin, False),
+                ),
+            },
+            format='multipart'
+        )
+
+        content = json.loads(response.content)
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_201_CREATED,
+            content
+        )
+        self.assertEqual(len(content['created']), 3)
+        self.assertEqual(
+            Participation.objects.filter(event=self.event).count(),
+            3,
+        )
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.nb_volunteers, 2)
+        self.assertEqual(self.event.nb_volunteers_standby, 1)
+        self.assertEqual(
+            OutboxEmail.objects.filter(
+                status=OutboxEmail.STATUS_PENDING,
+            ).count(),
+            3,
+        )
+
+        call_command('send_outbox_emails', stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox) - outbox_initial_email_count, 3)
+
+    def test_bulk_participations_duplicated_line(self):
+        """
+        Ensure bad request is returned if the file assigns twice the same
+        user to an event, and that no participation is added
+        """
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.post(
+            reverse('participation-bulk'),
+            data={
+                "file": self.make_bulk_file(
+                    (self.event, self.user, False),
+                    (self.event, self.user, True),
+                ),
+            },
+            format='multipart'
+        )
+
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("lines 2 to 3", content['non_field_errors'][0])
+        self.assertFalse(Participation.objects.filter(event=self.event))
+
+    def test_bulk_participations_as_user(self):
+        """
+        Ensure users cannot assign participations in bulk, even to
+        themselves
+        """
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(
+            reverse('participation-bulk'),
+            data={
+                "file": self.make_bulk_file((self.event, self.user, False)),
+            },
+            format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Participation.objects.filter(event=self.event))
+
     @override_settings(
         EMAIL_BACKEND='anymail.backends.test.EmailBackend',
         ANYMAIL={
@@ -572,6 +803,11 @@ class ParticipationsTests(CustomAPITestCase):
             format='json',
         )
 
+        # The email is queued in the outbox, and sent by a worker once
+        # the participation is committed
+        self.assertEqual(len(mail.outbox), outbox_initial_email_count)
+        call_command('send_outbox_emails', stdout=StringIO())
+
         # 1. email sent?
         nb_email_sent = len(mail.outbox) - outbox_initial_email_count
 
@@ -649,6 +885,11 @@ class ParticipationsTests(CustomAPITestCase):
             format='json',
         )
 
+        # The email is queued in the outbox, and sent by a worker once
+        # the participation is committed
+        self.assertEqual(len(mail.outbox), outbox_initial_email_count)
+        call_command('send_outbox_emails', stdout=StringIO())
+
         # 1. email sent?
         nb_email_sent = len(mail.outbox) - outbox_initial_email_count
 
@@ -1,4 +1,5 @@
 import json
+from io import BytesIO
 
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -295,3 +296,41 @@ class TaskTypesTests(CustomAPITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(content['results']), 1)
         self.check_attributes(content['results'][0])
+
+    def test_bulk_task_types_as_admin(self):
+        """
+        Ensure we can add task types in bulk if we are an admin.
+        """
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.post(
+            reverse('tasktype-bulk'),
+            data={
+                "file": BytesIO(b"name\nFirst tasktype\nSecond tasktype"),
+            },
+            format='multipart'
+        )
+
+        content = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(content['created']), 2)
+        self.assertEqual(TaskType.objects.count(), 3)
+        self.assertTrue(
+            content['created'][0].startswith(reverse('tasktype-list'))
+        )
+
+    def test_bulk_task_types(self):
+        """
+        Ensure we can't add task types in bulk if we are a simple user.
+        """
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(
+            reverse('tasktype-bulk'),
+            data={"file": BytesIO(b"name\nFirst tasktype")},
+            format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(TaskType.objects.count(), 1)
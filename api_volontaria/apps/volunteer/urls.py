@@ -21,6 +21,7 @@ router.register('cells', views.CellViewSet)
 router.register('task_types', views.TaskTypeViewSet)
 router.register('events', views.EventViewSet)
 router.register('participations', views.ParticipationViewSet)
+router.register('bulk_imports', views.BulkImportViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),  # includes router generated URL
@@ -1,5 +1,4 @@
 import json
-from io import TextIOWrapper
 
 from django.urls import reverse
 from django_filters.rest_framework import DjangoFilterBackend
@@ -9,73 +8,129 @@ from dry_rest_permissions.generics import DRYPermissions, \
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
-from rest_framework.permissions import IsAdminUser
+from rest_framework.permissions import IsAdminUser, SAFE_METHODS
 from rest_framework.response import Response
 
+from api_volontaria.conditional import ConditionalGetMixin
+from api_volontaria.response_cache import CachedResponseMixin
 from api_volontaria.apps.volunteer.helpers import (
+    BULK_READERS,
     InvalidBulkUpdate,
     add_bulk_from_file,
-    AddBulkConfig
+    check_upsert_key,
+    stream_bulk_from_file,
+    AddBulkConfig,
+    IdRanges,
 )
 from api_volontaria.apps.volunteer.models import (
     Cell,
     Event,
     TaskType,
     Participation,
+    BulkImport,
 )
+from api_volontaria.apps.volunteer.workers import enqueue_bulk_import
 from api_volontaria.apps.volunteer.serializers import (
     CellSerializer,
     EventSerializer,
     TaskTypeSerializer,
     ParticipationSerializer,
+    BulkImportSerializer,
+    ValuesNotSupported,
+    ValuesRepresentation,
+    is_expanded,
+    parse_query_list,
 )
 
 
-class CellViewSet(viewsets.ModelViewSet):
+def _select_related_paths(select_related, prefix=''):
+    for name, nested in select_related.items():
+        path = prefix + name
+        yield path
+        yield from _select_related_paths(nested, path + '__')
 
-    serializer_class = CellSerializer
-    queryset = Cell.objects.all()
-    filter_fields = '__all__'
-    permission_classes = (DRYPermissions,)
 
-    def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
-            permission_classes = []
-        else:
-            permission_classes = [IsAdminUser]
+class ExpandableQuerysetMixin:
+    """
+    Only join the relations of the queryset that are in the response,
+    given the ?fields= and ?expand= query parameters of the serializer,
+    see ExpandableFieldsMixin.
+    """
 
-        return [permission() for permission in permission_classes]
+    def get_queryset(self):
+        queryset = super(ExpandableQuerysetMixin, self).get_queryset()
+        select_related = queryset.query.select_related
+        if (self.request.method not in SAFE_METHODS or
+                not isinstance(select_related, dict)):
+            return queryset
 
+        fields = parse_query_list(self.request, 'fields')
+        expand = parse_query_list(self.request, 'expand')
+        related = [
+            path for path in _select_related_paths(select_related)
+            if (not fields or path.split('__')[0] in fields) and
+            is_expanded(expand, path.replace('__', '.'))
+        ]
+        queryset = queryset.select_related(None)
+        if related:
+            # Without arguments, select_related follows all the relations
+            queryset = queryset.select_related(*related)
+        return queryset
 
-class TaskTypeViewSet(viewsets.ModelViewSet):
 
-    serializer_class = TaskTypeSerializer
-    queryset = TaskType.objects.all()
-    filter_fields = '__all__'
-    permission_classes = (DRYPermissions,)
+class ValuesListMixin:
+    """
+    List action building the representations from QuerySet.values() rows
+    with ValuesRepresentation instead of the serializer, for the public
+    and high-traffic lists. The output is the same.
+    """
 
+    def list(self, request, *args, **kwargs):
+        try:
+            representation = ValuesRepresentation(self.get_serializer())
+        except ValuesNotSupported:
+            return super(ValuesListMixin, self).list(request, *args, **kwargs)
 
-class EventViewSet(viewsets.ModelViewSet):
+        columns = list(representation.columns)
+        # Read by the cursor pagination to build its links
+        for field in getattr(self, 'cursor_ordering', None) or ():
+            if field.lstrip('-') not in columns:
+                columns.append(field.lstrip('-'))
+        queryset = self.filter_queryset(self.get_queryset()).values(*columns)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                representation.to_representations(page)
+            )
+        return Response(representation.to_representations(queryset))
+
+
+class BulkCreateMixin:
+    """
+    Add a bulk action creating elements of the viewset from a file,
+    using the serializer of the viewset.
+    Permissions of the action are checked like the other actions of the
+    viewset, with has_bulk_permission for DRYPermissions.
+    """
 
-    serializer_class = EventSerializer
-    queryset = Event.objects.all()
-    filterset_fields = {
-        'start_time': ['exact', 'gte', 'lte'],
-        'end_time': ['exact', 'gte', 'lte'],
-        'cell': ['exact'],
-    }
-    permission_classes = (DRYPermissions, )
     parser_classes = (JSONParser, FormParser, MultiPartParser)
 
     @action(detail=False, methods=['post'])
     def bulk(self, request):
         """
-        Bulk add of events using a file
+        Bulk add of elements using a file
         """
+        serializer_class = self.get_serializer_class()
+        model_name = serializer_class.Meta.model._meta.model_name
+        element_view_name = f'{self.basename}-detail'
+
         file_data_bytes = request.data.get("file", None)
         if not file_data_bytes:
             return Response(
-                {'file': ["No file was provided for bulk event creation"]},
+                {'file': [
+                    f"No file was provided for bulk {model_name} creation"
+                ]},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
@@ -98,22 +153,162 @@ class EventViewSet(viewsets.ModelViewSet):
             return Response(message, status=status.HTTP_400_BAD_REQUEST)
 
         config = AddBulkConfig(
-            EventSerializer,
+            serializer_class,
             request.data.get("format", "csv"),
-            mapping
+            mapping,
+            # Comma separated fields identifying the elements to update
+            upsert_key=tuple(
+                key.strip()
+                for key in request.data.get("upsert_key", "").split(",")
+                if key.strip()
+            ),
+            context=self.get_serializer_context(),
         )
 
-        file_data = TextIOWrapper(file_data_bytes, encoding='utf-8')
+        if config.format not in BULK_READERS:
+            formats = ", ".join(BULK_READERS)
+            return Response(
+                {"format": [f"Format should be one of {formats}"]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            check_upsert_key(config)
+        except InvalidBulkUpdate as e:
+            return Response(
+                {"upsert_key": [e.error]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        mode = request.data.get("mode", "default")
+        if mode not in ("default", "stream", "async"):
+            return Response(
+                {"mode": ["Mode should be either default, stream or async"]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if mode == "async":
+            # The file is stored and imported by a worker
+            bulk_import = BulkImport.objects.create(
+                created_by=request.user,
+                file=file_data_bytes,
+                format=config.format,
+                mapping=config.mapping,
+                upsert_key=list(config.upsert_key),
+                serializer_class=f'{serializer_class.__module__}.'
+                                 f'{serializer_class.__qualname__}',
+                element_view_name=element_view_name,
+            )
+            enqueue_bulk_import(bulk_import)
+            serializer = BulkImportSerializer(
+                bulk_import,
+                context={'request': request},
+            )
+            return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
         try:
-            ids = add_bulk_from_file(file_data, config)
+            if mode == "stream" or config.upsert_key:
+                summary = stream_bulk_from_file(file_data_bytes, config)
+                ids = summary.created_ids
+            else:
+                ids = add_bulk_from_file(file_data_bytes, config)
         except InvalidBulkUpdate as e:
             return Response(
                 {"non_field_errors": [e.error]},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        url_ids = [reverse('event-detail', kwargs={'pk': id_}) for id_ in ids]
-        return Response({"created": url_ids}, status=status.HTTP_201_CREATED)
+        if mode == "stream":
+            # Summary of the created elements instead of an url for each
+            # one of them, the urls can be listed from the bulk import
+            bulk_import = BulkImport.objects.create(
+                created_by=request.user,
+                status=BulkImport.STATUS_SUCCEEDED,
+                format=config.format,
+                mapping=config.mapping,
+                upsert_key=list(config.upsert_key),
+                serializer_class=f'{serializer_class.__module__}.'
+                                 f'{serializer_class.__qualname__}',
+                element_view_name=element_view_name,
+                nb_rows_processed=summary.nb_rows,
+                nb_created=summary.nb_created,
+                nb_updated=summary.nb_updated,
+                nb_unchanged=summary.nb_unchanged,
+                created_ranges=summary.created_ranges,
+            )
+            serializer = BulkImportSerializer(
+                bulk_import,
+                context={'request': request},
+            )
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+        url_ids = [
+            reverse(element_view_name, kwargs={'pk': id_}) for id_ in ids
+        ]
+        content = {"created": url_ids}
+        if config.upsert_key:
+            content.update(
+                nb_created=summary.nb_created,
+                nb_updated=summary.nb_updated,
+                nb_unchanged=summary.nb_unchanged,
+            )
+        return Response(content, status=status.HTTP_201_CREATED)
+
+
+class CellViewSet(ConditionalGetMixin, CachedResponseMixin, ValuesListMixin,
+                  BulkCreateMixin, viewsets.ModelViewSet):
+
+    serializer_class = CellSerializer
+    queryset = Cell.objects.all()
+    cached_models = (Cell,)
+    filter_fields = '__all__'
+    permission_classes = (DRYPermissions,)
+
+    def get_permissions(self):
+        if self.action in ['list', 'retrieve']:
+            permission_classes = []
+        else:
+            permission_classes = [IsAdminUser]
+
+        return [permission() for permission in permission_classes]
+
+
+class TaskTypeViewSet(ConditionalGetMixin, CachedResponseMixin,
+                      ValuesListMixin, BulkCreateMixin,
+                      viewsets.ModelViewSet):
+
+    serializer_class = TaskTypeSerializer
+    queryset = TaskType.objects.all()
+    cached_models = (TaskType,)
+    filter_fields = '__all__'
+    permission_classes = (DRYPermissions,)
+
+
+class EventViewSet(ConditionalGetMixin, CachedResponseMixin,
+                   ValuesListMixin, ExpandableQuerysetMixin, BulkCreateMixin,
+                   viewsets.ModelViewSet):
+
+    serializer_class = EventSerializer
+    queryset = Event.objects.select_related(
+        'cell',
+        'task_type',
+    )
+    filterset_fields = {
+        'start_time': ['exact', 'gte', 'lte'],
+        'end_time': ['exact', 'gte', 'lte'],
+        'cell': ['exact'],
+    }
+    permission_classes = (DRYPermissions, )
+    cursor_ordering = ('start_time', 'id')
+    # The headcounts and the expandable relations are in the
+    # representations
+    version_fields = (
+        'updated_at',
+        'headcounts_updated_at',
+        'cell__updated_at',
+        'task_type__updated_at',
+    )
+    cached_models = (Event, Cell, TaskType, Participation)
 
 
 class ParticipationFilterBackend(DRYPermissionFiltersBase):
@@ -128,10 +323,18 @@ class ParticipationFilterBackend(DRYPermissionFiltersBase):
             return queryset.filter(user=request.user)
 
 
-class ParticipationViewSet(viewsets.ModelViewSet):
+class ParticipationViewSet(ExpandableQuerysetMixin, BulkCreateMixin,
+                           viewsets.ModelViewSet):
 
     serializer_class = ParticipationSerializer
-    queryset = Participation.objects.all()
+    # Everything the nested representation of a participation needs,
+    # the event headcounts being stored on the event itself
+    queryset = Participation.objects.select_related(
+        'user',
+        'event',
+        'event__cell',
+        'event__task_type',
+    )
     filterset_fields = {
         'registered_at': ['exact', 'gte', 'lte'],
         'event__start_time': ['exact', 'gte', 'lte'],
@@ -141,3 +344,26 @@ class ParticipationViewSet(viewsets.ModelViewSet):
     }
     permission_classes = (DRYPermissions,)
     filter_backends = (ParticipationFilterBackend, DjangoFilterBackend)
+    cursor_ordering = ('registered_at', 'id')
+
+
+class BulkImportViewSet(viewsets.ReadOnlyModelViewSet):
+
+    serializer_class = BulkImportSerializer
+    queryset = BulkImport.objects.all()
+    permission_classes = (IsAdminUser,)
+
+    @action(detail=True, methods=['get'])
+    def created(self, request, pk=None):
+        """
+        Paginated list of the urls of the elements created by a bulk import
+        """
+        bulk_import = self.get_object()
+        ids = IdRanges(bulk_import.created_ranges)
+
+        page = self.paginate_queryset(ids)
+        url_ids = [
+            reverse(bulk_import.element_view_name, kwargs={'pk': id_})
+            for id_ in page
+        ]
+        return self.get_paginated_response(url_ids)
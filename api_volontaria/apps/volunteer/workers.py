@@ -0,0 +1,76 @@
+"""
+Workers running the asynchronous bulk imports.
+
+With BULK_IMPORTS['WORKER'] set to 'thread', pending bulk imports are run
+by a pool of threads of the process that received them, once the
+transaction creating them is committed. With 'command', they are left to
+the run_bulk_imports management command.
+
+Bulk imports left running by a stopped worker are failed after
+BULK_IMPORTS['STALE_TIMEOUT'] seconds without progress, by the
+run_bulk_imports command and when a new bulk import is scheduled.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from api_volontaria.apps.volunteer.models import BulkImport
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.BULK_IMPORTS['MAX_WORKERS'],
+            thread_name_prefix='bulk_import',
+        )
+    return _executor
+
+
+def _run_in_thread(bulk_import_id):
+    close_old_connections()
+    try:
+        BulkImport.objects.get(pk=bulk_import_id).run()
+    finally:
+        # Threads of the pool do not go through the request cycle
+        # which closes the connections they open
+        close_old_connections()
+
+
+def enqueue_bulk_import(bulk_import):
+    """
+    Schedule a pending bulk import on the configured worker
+    """
+    fail_stale_bulk_imports()
+    if settings.BULK_IMPORTS['WORKER'] == 'thread':
+        transaction.on_commit(
+            lambda: _get_executor().submit(_run_in_thread, bulk_import.pk)
+        )
+
+
+def fail_stale_bulk_imports():
+    """
+    Fail the bulk imports left running by a stopped worker
+    :return: The number of failed bulk imports
+    """
+    return BulkImport.fail_stale(settings.BULK_IMPORTS['STALE_TIMEOUT'])
+
+
+def run_pending_bulk_imports():
+    """
+    Run all the pending bulk imports, oldest first
+    :return: The number of bulk imports run
+    """
+    nb_run = 0
+    pending_imports = BulkImport.objects.filter(
+        status=BulkImport.STATUS_PENDING,
+    ).order_by('created_at')
+
+    for bulk_import in pending_imports:
+        if bulk_import.run():
+            nb_run += 1
+
+    return nb_run
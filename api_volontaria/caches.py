@@ -0,0 +1,92 @@
+"""
+Caches of the API: in-process caches, local to each process, and the
+helpers invalidating the cached entries across the processes.
+"""
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from uuid import uuid4
+
+from django.db import transaction
+
+
+def get_generation(cache, key):
+    """
+    Token of the current state of what the key stands for, kept in the
+    given cache of the Django cache framework and changed by
+    new_generations. Entries are cached with the tokens they were built
+    under, so changing a token invalidates them in every process sharing
+    the cache.
+    """
+    generation = cache.get(key)
+    if generation is None:
+        # An evicted token is replaced by a new one and not by a counter
+        # starting over, which could match the token of stale entries
+        cache.add(key, uuid4().hex, None)
+        generation = cache.get(key)
+    return generation
+
+
+def new_generations(cache, keys):
+    """
+    Change the tokens of the keys, see get_generation
+    """
+    cache.set_many({key: uuid4().hex for key in keys}, None)
+
+
+def invalidate_on_commit(invalidate):
+    """
+    Run the invalidate function now, and again once the current
+    transaction is committed, the entries cached by other requests before
+    the commit being the previous ones
+    """
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+class LRUCache:
+    """
+    Thread-safe mapping keeping at most maxsize entries, the least
+    recently used entries being evicted first. With a timeout, entries
+    also expire that many seconds after being set, which bounds how long
+    a process keeps a value changed by another one.
+    """
+
+    def __init__(self, maxsize=1024, timeout=None):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, expires_at = self._entries[key]
+            except KeyError:
+                return default
+            if expires_at is not None and expires_at <= monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = None
+        if self.timeout is not None:
+            expires_at = monotonic() + self.timeout
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
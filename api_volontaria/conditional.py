@@ -0,0 +1,140 @@
+"""
+Conditional GET of the lists and elements of the API, answered with a
+304 Not Modified from a version of the rows, before fetching and
+serializing them.
+"""
+from calendar import timegm
+from hashlib import md5
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+def get_version(queryset, fields):
+    """
+    Version of the rows of the queryset, computed with one aggregate
+    query: their number, which changes when rows are deleted, and the
+    latest value of each of the datetime fields
+    :param fields: Datetime fields, relations can be followed with __
+    :return: The version, and the latest of the datetimes, None if there
+    is no row
+    """
+    aggregates = {
+        f'max_{index}': Max(field) for index, field in enumerate(fields)
+    }
+    values = queryset.order_by().aggregate(count=Count('pk'), **aggregates)
+    datetimes = [values[f'max_{index}'] for index in range(len(fields))]
+    return (values['count'], *datetimes), _latest(datetimes)
+
+
+def get_instance_version(instance, fields):
+    """
+    Version of a single element, read from its fields and relations
+    :return: The version, and the latest of its datetimes
+    """
+    datetimes = []
+    for field in fields:
+        value = instance
+        for name in field.split('__'):
+            value = getattr(value, name, None)
+        datetimes.append(value)
+    return (instance.pk, *datetimes), _latest(datetimes)
+
+
+def _latest(datetimes):
+    datetimes = [value for value in datetimes if value is not None]
+    return max(datetimes) if datetimes else None
+
+
+class ConditionalGetMixin:
+    """
+    ETag header on the list and retrieve actions, and Last-Modified
+    header on the retrieve action. Requests with a matching
+    If-None-Match or If-Modified-Since get a 304 without serialization.
+
+    The version_fields are the datetime fields changed with the
+    representations of the elements, including the ones of the
+    relations in the representations. As deleted rows leave no date
+    behind, the lists only have an ETag, built with their number of
+    rows, and only when their pages have the total count.
+    """
+    version_fields = ('updated_at',)
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_versioned(request):
+            return super(ConditionalGetMixin, self).list(
+                request, *args, **kwargs
+            )
+
+        version, _ = get_version(
+            self.filter_queryset(self.get_queryset()),
+            self.version_fields,
+        )
+        etag = self.get_etag(version)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super(ConditionalGetMixin, self).list(
+                request, *args, **kwargs
+            )
+        return self._set_validators(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_instance_response(request, self.get_object())
+
+    def get_instance_response(self, request, instance):
+        """
+        Response of the serialized instance, or 304 if it is not modified
+        """
+        version, last_modified = get_instance_version(
+            instance,
+            self.version_fields,
+        )
+        etag = self.get_etag(version)
+
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified and timegm(
+                last_modified.utctimetuple()
+            ),
+        )
+        if response is None:
+            response = self.get_serialized_response(request, instance)
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(
+                timegm(last_modified.utctimetuple())
+            )
+        return self._set_validators(response, etag)
+
+    def get_serialized_response(self, request, instance):
+        def serialize(request):
+            return Response(self.get_serializer(instance).data)
+
+        # Cached like the lists when the view has a CachedResponseMixin
+        get_cached_response = getattr(self, 'get_cached_response', None)
+        if get_cached_response is None:
+            return serialize(request)
+        return get_cached_response(request, serialize)
+
+    def is_versioned(self, request):
+        # The version costs as much as the total count, the pages without
+        # it are not versioned
+        is_counted = getattr(self.paginator, 'is_counted', None)
+        return is_counted is None or is_counted(request, self)
+
+    def get_etag(self, version):
+        # The representations differ between the renderers, like the
+        # browsable API
+        return quote_etag(md5(repr((
+            version,
+            self.request.accepted_media_type,
+        )).encode()).hexdigest())
+
+    @staticmethod
+    def _set_validators(response, etag):
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+        return response
@@ -1,5 +1,8 @@
-from django.core.mail import send_mail as django_send_mail
-from django.core.mail import EmailMessage
+from functools import lru_cache
+
+from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.core.mail import get_connection
+from django.template.loader import get_template
 
 from api_volontaria import settings
 
@@ -8,6 +11,24 @@ from api_volontaria.apps.log_management.models import EmailLog
 TEMPLATES = settings.ANYMAIL.get('TEMPLATES')
 
 
+@lru_cache(maxsize=None)
+def get_email_template(template_name):
+    ''' template compiled once per process, whatever the template
+    loaders configuration
+    '''
+    return get_template(template_name)
+
+
+def render_email(template_name, context):
+    ''' plain text and html versions of an email, rendered from the
+    template_name.txt and template_name.html templates
+    '''
+    return (
+        get_email_template(f'{template_name}.txt').render(context),
+        get_email_template(f'{template_name}.html').render(context),
+    )
+
+
 class EmailAPI:
 
     def send_email(
@@ -17,19 +38,22 @@ class EmailAPI:
             connection=None, html_message=None):
         ''' sending and logging emails '''
 
-        nb_email_successfully_sent = django_send_mail(
-                subject, message, from_email, recipient_list,
-                fail_silently, auth_user, auth_password,
-                connection, html_message
-            )
-
-        EmailLog.add(
-            user_email=recipient_list,
-            nb_email_sent=nb_email_successfully_sent,
-            type_email=subject,
+        connection = connection or get_connection(
+            username=auth_user,
+            password=auth_password,
+            fail_silently=fail_silently,
         )
 
-        return nb_email_successfully_sent
+        return self.send_messages(
+            [
+                self.build_email(
+                    subject, message, from_email, recipient_list,
+                    html_message=html_message,
+                )
+            ],
+            connection=connection,
+            fail_silently=fail_silently,
+        )
 
     def get_generic_information(self):
         contact_email = settings.LOCAL_SETTINGS['CONTACT_EMAIL']
@@ -39,11 +63,40 @@ class EmailAPI:
             "VOLONTARIA_WEBSITE_URL": 'https://volontaria.github.io/'
         }
 
-    def send_template_email(self, email, template, context):
+    def send_template_email(self, email, template, context, connection=None):
         ''' sending email using SendinBlue templates,
         and logging email
         '''
 
+        return self.send_messages(
+            [self.build_template_email(email, template, context)],
+            connection=connection,
+        )
+
+    def build_email(
+            self,
+            subject, message, from_email, recipient_list,
+            html_message=None):
+        ''' message to send with send_messages, the arguments being the
+        ones of send_email
+        '''
+
+        email = EmailMultiAlternatives(
+            subject, message, from_email, recipient_list,
+        )
+        if html_message:
+            email.attach_alternative(html_message, 'text/html')
+
+        # logged as
+        email.type_email = subject
+
+        return email
+
+    def build_template_email(self, email, template, context):
+        ''' message using a SendinBlue template to send with
+        send_messages, the arguments being the ones of send_template_email
+        '''
+
         email_context = context
         email_context['GENERIC'] = self.get_generic_information()
 
@@ -59,13 +112,51 @@ class EmailAPI:
 
         message.merge_global_data = email_context
 
-        nb_email_successfully_sent = message.send()
+        # logged as
+        message.type_email = template
 
-        EmailLog.add(
-            user_email=[email],
-            type_email=template,
-            nb_email_sent=nb_email_successfully_sent,
-            template_id=TEMPLATES.get(template),
-        )
+        return message
+
+    def send_messages(self, messages, connection=None, fail_silently=False):
+        ''' sending many messages over a single backend connection,
+        and logging them with a single insert
+
+        With fail_silently, the messages that could not be sent are
+        skipped and their error is available as message.send_error
+        (None for the messages sent).
+        :return: number of messages sent
+        '''
 
-        return nb_email_successfully_sent
+        connection = connection or get_connection()
+        email_logs = []
+
+        # Like the Django backends, only close the connection if it was
+        # opened here
+        new_connection = connection.open()
+        try:
+            for message in messages:
+                message.send_error = None
+                try:
+                    nb_email_sent = connection.send_messages([message])
+                except Exception as e:
+                    if not fail_silently:
+                        raise
+                    message.send_error = e
+                    nb_email_sent = 0
+
+                email_logs.append(EmailLog(
+                    user_email=message.to,
+                    type_email=getattr(
+                        message,
+                        'type_email',
+                        message.subject,
+                    ),
+                    nb_email_sent=nb_email_sent or 0,
+                    template_id=getattr(message, 'template_id', None),
+                ))
+        finally:
+            if new_connection:
+                connection.close()
+            EmailLog.objects.bulk_create(email_logs)
+
+        return sum(email_log.nb_email_sent for email_log in email_logs)
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from api_volontaria.response_cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = 'Show the hits and misses of the cache of the responses to ' \
+           'the anonymous users. The counters of the API processes are ' \
+           'only seen with a cache backend shared with them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after showing them.',
+        )
+
+    def handle(self, *args, **options):
+        stats = get_stats()
+        total = stats['hits'] + stats['misses']
+        hit_rate = stats['hits'] / total if total else 0
+        self.stdout.write(
+            f'{stats["hits"]} hit(s), {stats["misses"]} miss(es), '
+            f'hit rate {hit_rate:.1%}'
+        )
+
+        if options['reset']:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset'))
@@ -0,0 +1,319 @@
+"""
+Pagination of the lists of the API.
+"""
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from hashlib import md5
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+COUNT_EXACT = 'exact'
+COUNT_CACHED = 'cached'
+COUNT_ESTIMATED = 'estimated'
+
+
+def estimate_count(queryset):
+    """
+    Number of rows of the queryset estimated by the query planner from
+    the statistics of the database, without running the query
+    :return: The estimate, None if the database does not provide one
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    # Not with QuerySet.explain, which joins the plan decoded by psycopg2
+    # back into a string that is not json
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def cached_count(queryset):
+    """
+    Number of rows of the queryset, the large counts being cached for a
+    short time per query, so for each set of filters
+    """
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    key = 'pagination_count:' + md5(
+        repr((queryset.db, sql, params)).encode(),
+    ).hexdigest()
+
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        if count >= settings.PAGINATION['COUNT_THRESHOLD']:
+            cache.set(key, count, settings.PAGINATION['COUNT_CACHE_TIMEOUT'])
+    return count
+
+
+def get_count(queryset, mode):
+    """
+    Total count of a paginated list in the given mode, see the
+    PAGINATION setting. Counts under the COUNT_THRESHOLD are always
+    exact.
+    :return: The count and whether it is exact
+    """
+    if not isinstance(queryset, QuerySet):
+        return len(queryset), True
+
+    if mode == COUNT_ESTIMATED:
+        count = estimate_count(queryset)
+        if count is not None and \
+                count >= settings.PAGINATION['COUNT_THRESHOLD']:
+            return count, False
+        mode = COUNT_CACHED
+
+    if mode == COUNT_CACHED:
+        count = cached_count(queryset)
+        return count, count < settings.PAGINATION['COUNT_THRESHOLD']
+
+    return queryset.count(), True
+
+
+class CountPaginator(Paginator):
+    """
+    Paginator of the admin counting the rows like the API, in the mode
+    of the PAGINATION setting
+    """
+
+    @cached_property
+    def count(self):
+        return get_count(self.object_list, settings.PAGINATION['COUNT'])[0]
+
+
+class CursorOrLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination, with two opt-in modes for large lists:
+
+    - ?pagination=cursor: keyset pagination on the cursor_ordering fields
+      of the view, the last one being unique. Pages are fetched in
+      constant time by following the next and previous links, and the
+      total count is not computed. The ordering of the list is then
+      always the cursor_ordering.
+    - ?count=false: limit/offset pagination without the total count,
+      returned as null.
+
+    Large total counts are otherwise cached or estimated as configured by
+    the PAGINATION setting, with a X-Count-Exact: false header. The
+    exact count can be asked with ?count=exact.
+    """
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = _('Invalid cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.cursor_ordering = getattr(view, 'cursor_ordering', None)
+        self.use_cursor = self._use_cursor(request, view)
+        count_mode = request.query_params.get(self.count_query_param)
+        self.skip_count = count_mode in ('false', '0')
+        self.count_mode = settings.PAGINATION['COUNT']
+        if count_mode == COUNT_EXACT:
+            self.count_mode = COUNT_EXACT
+        self.count_is_exact = True
+
+        if self.use_cursor:
+            return self.paginate_queryset_by_cursor(queryset, request)
+        if not self.skip_count:
+            return super(CursorOrLimitOffsetPagination, self) \
+                .paginate_queryset(queryset, request, view)
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.count = None
+
+        # One more row tells if there is a next page
+        page = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(page) > self.limit
+        return page[:self.limit]
+
+    def is_counted(self, request, view=None):
+        """
+        Whether the pages of the request have the total count of the list
+        """
+        return not self._use_cursor(request, view) and \
+            request.query_params.get(self.count_query_param) not in (
+                'false', '0',
+            )
+
+    def _use_cursor(self, request, view):
+        return bool(getattr(view, 'cursor_ordering', None)) and (
+            request.query_params.get(self.mode_query_param) == 'cursor' or
+            self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset_by_cursor(self, queryset, request):
+        self.limit = self.get_limit(request) or self.default_limit
+        self.page_model = queryset.model
+        position, reverse = self.decode_cursor(request)
+
+        ordering = [
+            self._reverse_ordering(field) if reverse else field
+            for field in self.cursor_ordering
+        ]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+
+        page = list(queryset[:self.limit + 1])
+        has_more = len(page) > self.limit
+        page = page[:self.limit]
+        if reverse:
+            page.reverse()
+
+        # Pages are only reached from a cursor pointing at a row of the
+        # neighbouring page
+        if reverse:
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.page = page
+        return page
+
+    def get_paginated_response(self, data):
+        if self.use_cursor:
+            return Response(OrderedDict([
+                ('next', self.get_next_link()),
+                ('previous', self.get_previous_link()),
+                ('results', data),
+            ]))
+        response = super(CursorOrLimitOffsetPagination, self) \
+            .get_paginated_response(data)
+        if not self.count_is_exact:
+            response['X-Count-Exact'] = 'false'
+        return response
+
+    def get_count(self, queryset):
+        count, self.count_is_exact = get_count(queryset, self.count_mode)
+        return count
+
+    def get_next_link(self):
+        if self.use_cursor:
+            if not self.has_next or not self.page:
+                return None
+            return self.encode_cursor(self.page[-1], reverse=False)
+        if self.skip_count:
+            if not self.has_next:
+                return None
+            url = self.request.build_absolute_uri()
+            url = replace_query_param(url, self.limit_query_param, self.limit)
+            return replace_query_param(
+                url,
+                self.offset_query_param,
+                self.offset + self.limit,
+            )
+        return super(CursorOrLimitOffsetPagination, self).get_next_link()
+
+    def get_previous_link(self):
+        if self.use_cursor:
+            if not self.has_previous or not self.page:
+                return None
+            return self.encode_cursor(self.page[0], reverse=True)
+        return super(CursorOrLimitOffsetPagination, self).get_previous_link()
+
+    def decode_cursor(self, request):
+        """
+        :return: The values of the cursor_ordering fields of the row the
+        page starts after, None for the first page, and whether the page
+        is before this row rather than after
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')))
+            position = [
+                self._get_field(field).to_python(value)
+                for field, value in zip(self.cursor_ordering, cursor['p'])
+            ]
+            reverse = bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if len(position) != len(self.cursor_ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, instance, reverse):
+        """
+        Link to the page after or before the instance, or the row when
+        paginating QuerySet.values()
+        """
+        if isinstance(instance, dict):
+            # value_to_string only reads the attribute of the field
+            instance = SimpleNamespace(**instance)
+        cursor = {
+            'p': [
+                self._get_field(field).value_to_string(instance)
+                for field in self.cursor_ordering
+            ],
+            'r': int(reverse),
+        }
+        encoded = b64encode(json.dumps(cursor).encode('ascii'))
+
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            encoded.decode('ascii'),
+        )
+
+    def _get_field(self, field):
+        return self.page_model._meta.get_field(field.lstrip('-'))
+
+    @staticmethod
+    def _reverse_ordering(field):
+        return field[1:] if field.startswith('-') else '-' + field
+
+    @staticmethod
+    def _after(ordering, position):
+        """
+        Rows after the position in the ordering:
+        (a > x) or (a = x and b > y) or ...
+        The condition on the first field alone lets the database use an
+        index starting with it.
+        """
+        condition = None
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            term = equal & Q(**{f'{name}__{lookup}': value})
+            condition = term if condition is None else condition | term
+            equal &= Q(**{name: value})
+
+        name = ordering[0].lstrip('-')
+        lookup = 'lte' if ordering[0].startswith('-') else 'gte'
+        return Q(**{f'{name}__{lookup}': position[0]}) & condition
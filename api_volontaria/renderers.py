@@ -0,0 +1,74 @@
+"""
+Renderers of the responses of the API.
+"""
+from moneyed import Money
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    """
+    Encoder of Django REST framework, also encoding the Money values of
+    djmoney like their amount, as its serializer fields do
+    """
+
+    def default(self, obj):
+        if isinstance(obj, Money):
+            obj = obj.amount
+        return super(JSONEncoder, self).default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson when it is installed, with the same
+    output. Falls back to the json module without orjson, when an
+    indented output is asked for, or for values orjson can't encode
+    (like integers over 64 bits).
+
+    Unlike JSONRenderer with STRICT_JSON, NaN and infinite floats are not
+    rejected but rendered as null by orjson, finding them costing more
+    than the rendering.
+    """
+    encoder_class = JSONEncoder
+
+    # orjson encodes datetimes like JSONEncoder with this option, the
+    # other values it does not know being given to JSONEncoder
+    orjson_options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS \
+        if orjson else 0
+
+    def __init__(self):
+        super(FastJSONRenderer, self).__init__()
+        self._encoder = self.encoder_class()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or
+                self.ensure_ascii or not self.compact or
+                self.get_indent(accepted_media_type, renderer_context or {})):
+            return super(FastJSONRenderer, self).render(
+                data,
+                accepted_media_type,
+                renderer_context,
+            )
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self._encoder.default,
+                option=self.orjson_options,
+            )
+        except orjson.JSONEncodeError:
+            return super(FastJSONRenderer, self).render(
+                data,
+                accepted_media_type,
+                renderer_context,
+            )
+
+        # Like JSONRenderer, escape the line separators which are valid
+        # in JSON but not in javascript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028') \
+            .replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,169 @@
+"""
+Shared cache of the rendered responses of the public lists and elements
+to the anonymous users, invalidated when the models they show change.
+
+The cache is the RESPONSE_CACHE['CACHE'] alias of the Django cache
+framework. With a backend shared by the processes of the API, like
+memcached or redis, a change made by any process invalidates the
+responses of all of them. The default local-memory backend only
+invalidates the responses of the process making the change, the others
+being refreshed after the timeout of the cache.
+"""
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from api_volontaria import caches as api_caches
+
+HITS_KEY = 'response_cache:hits'
+MISSES_KEY = 'response_cache:misses'
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE['CACHE']]
+
+
+def _generation_key(model):
+    return f'response_cache:generation:{model._meta.label_lower}'
+
+
+def get_generation(model):
+    """
+    Token of the current state of the model, changed on each change of
+    its rows. The responses are cached under the tokens of the models
+    they show, so changing a token invalidates them.
+    """
+    return api_caches.get_generation(get_cache(), _generation_key(model))
+
+
+def invalidate(*models):
+    """
+    Invalidate the cached responses showing the models
+    """
+    api_caches.new_generations(
+        get_cache(),
+        [_generation_key(model) for model in models],
+    )
+
+
+def invalidate_on_change(model, signals=(post_save, post_delete)):
+    """
+    Invalidate the cached responses showing the model when the signals
+    are sent for it
+    """
+    def receiver(sender, **kwargs):
+        api_caches.invalidate_on_commit(lambda: invalidate(sender))
+
+    for signal in signals:
+        signal.connect(
+            receiver,
+            sender=model,
+            weak=False,
+            dispatch_uid=f'response_cache_{model._meta.label_lower}',
+        )
+
+
+def _count(key):
+    cache = get_cache()
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted in the meantime
+        cache.add(key, 1, None)
+
+
+def get_stats():
+    """
+    :return: The number of hits and misses of the cache since the last
+    reset
+    """
+    cache = get_cache()
+    values = cache.get_many([HITS_KEY, MISSES_KEY])
+    return {
+        'hits': values.get(HITS_KEY, 0),
+        'misses': values.get(MISSES_KEY, 0),
+    }
+
+
+def reset_stats():
+    get_cache().delete_many([HITS_KEY, MISSES_KEY])
+
+
+class CachedResponseMixin:
+    """
+    Cache the rendered responses of the list and retrieve actions to the
+    anonymous users, by url and media type. The cached_models are the
+    models shown in the responses, see invalidate_on_change.
+    The responses have a X-Cache: HIT or MISS header.
+    """
+    cached_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            request,
+            super(CachedResponseMixin, self).list,
+            *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            request,
+            super(CachedResponseMixin, self).retrieve,
+            *args, **kwargs
+        )
+
+    def get_cached_response(self, request, action, *args, **kwargs):
+        self.response_cache_key = None
+        if not settings.RESPONSE_CACHE['ENABLED'] or \
+                not request.user.is_anonymous:
+            return action(request, *args, **kwargs)
+
+        self.response_cache_key = self.get_response_cache_key(request)
+        cached = get_cache().get(self.response_cache_key)
+        if cached is None:
+            _count(MISSES_KEY)
+            return action(request, *args, **kwargs)
+
+        _count(HITS_KEY)
+        content, headers = cached
+        response = HttpResponse(content)
+        for header, value in headers:
+            response[header] = value
+        response['X-Cache'] = 'HIT'
+        self.response_cache_key = None
+        return response
+
+    def get_response_cache_key(self, request):
+        generations = [get_generation(model) for model in self.cached_models]
+        return 'response_cache:' + md5(repr((
+            # Absolute, as are the urls in the responses
+            request.build_absolute_uri(),
+            request.accepted_media_type,
+            generations,
+        )).encode()).hexdigest()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super(CachedResponseMixin, self).finalize_response(
+            request, response, *args, **kwargs
+        )
+        key = getattr(self, 'response_cache_key', None)
+        if key is not None and isinstance(response, Response) and \
+                response.status_code == 200:
+            response['X-Cache'] = 'MISS'
+            response.add_post_render_callback(
+                lambda rendered: self._store(key, rendered)
+            )
+        return response
+
+    @staticmethod
+    def _store(key, response):
+        headers = [
+            (header, value) for header, value in response.items()
+            if header != 'X-Cache'
+        ]
+        get_cache().set(key, (response.content, headers))
@@ -175,13 +175,14 @@ USE_TZ = True
 # Django Rest Framework
 
 REST_FRAMEWORK = {
+    # Renders like JSONRenderer, except for the NaN and infinite floats:
+    # rendered as null with orjson, while STRICT_JSON rejects them
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'api_volontaria.renderers.FastJSONRenderer',
     ),
+    # API tokens, tokens and sessions, see DispatchingAuthentication
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'api_volontaria.apps.user.authentication.APITokenAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
-        'rest_framework.authentication.SessionAuthentication',
+        'api_volontaria.apps.user.authentication.DispatchingAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -191,11 +192,86 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter'
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.'
-                                'LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api_volontaria.pagination.'
+                                'CursorOrLimitOffsetPagination',
     'PAGE_SIZE': 100
 }
 
+# Total counts of the paginated lists, in the API and the admin
+# COUNT: 'exact', 'cached' to cache the counts of each set of filters for
+# COUNT_CACHE_TIMEOUT seconds, or 'estimated' to use the statistics of the
+# database (PostgreSQL only, cached counts otherwise)
+# COUNT_THRESHOLD: counts under this number of rows are always exact
+PAGINATION = {
+    'COUNT': config('PAGINATION_COUNT', default='cached'),
+    'COUNT_THRESHOLD': config(
+        'PAGINATION_COUNT_THRESHOLD',
+        default=10000,
+        cast=int,
+    ),
+    'COUNT_CACHE_TIMEOUT': config(
+        'PAGINATION_COUNT_CACHE_TIMEOUT',
+        default=60,
+        cast=int,
+    ),
+}
+
+# Caches
+# The responses of the public endpoints to the anonymous users are cached
+# in the 'responses' cache, see api_volontaria.response_cache. Use a
+# backend shared by the processes of the API, like memcached or redis, for
+# their changes to invalidate the responses of every process.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': config(
+            'RESPONSE_CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': config('RESPONSE_CACHE_LOCATION', default='responses'),
+        'TIMEOUT': config('RESPONSE_CACHE_TIMEOUT', default=60, cast=int),
+    },
+}
+
+RESPONSE_CACHE = {
+    'ENABLED': config('RESPONSE_CACHE_ENABLED', default=True, cast=bool),
+    'CACHE': 'responses',
+}
+
+# Pages looked up by key, see Page.get_by_key
+# MAXSIZE: pages kept in memory by each process, for LOCAL_TIMEOUT
+# seconds, after which the changes made by the other processes are seen
+# SHARED_CACHE: alias of a cache shared by the processes, as a second
+# tier before the database, None for none
+PAGE_CACHE = {
+    'MAXSIZE': config('PAGE_CACHE_MAXSIZE', default=256, cast=int),
+    'LOCAL_TIMEOUT': config('PAGE_CACHE_LOCAL_TIMEOUT', default=10, cast=int),
+    'SHARED_CACHE': config('PAGE_CACHE_SHARED_CACHE', default=None),
+    'SHARED_TIMEOUT': config(
+        'PAGE_CACHE_SHARED_TIMEOUT',
+        default=3600,
+        cast=int,
+    ),
+}
+
+# API tokens with their users, cached by key in the memory of each
+# process, see APIToken.get_by_key
+# MAXSIZE: number of tokens cached by each process
+# TIMEOUT: seconds after which the tokens are read again
+# SHARED_CACHE: alias of the cache holding the generations of the tokens,
+# changed when a token is deleted or its user deactivated. Each use of a
+# cached token checks it, so with a cache shared by the processes, like
+# memcached or redis, a revocation is seen at once by all of them. With
+# a local-memory cache or None, the other processes only see it after
+# TIMEOUT.
+API_TOKEN_CACHE = {
+    'MAXSIZE': config('API_TOKEN_CACHE_MAXSIZE', default=10000, cast=int),
+    'TIMEOUT': config('API_TOKEN_CACHE_TIMEOUT', default=10, cast=int),
+    'SHARED_CACHE': config('API_TOKEN_CACHE_SHARED_CACHE', default='default'),
+}
 
 # CORS Header Django Rest Framework
 
@@ -235,6 +311,11 @@ ANYMAIL = {
             'RESET_PASSWORD_EMAIL_TEMPLATE',
             default=0
         ),
+        'REMINDER_DIGEST': config(
+            'TEMPLATE_ID_REMINDER_DIGEST',
+            default=0,
+            cast=int
+        ),
     }
 }
 
@@ -263,12 +344,57 @@ LOCAL_SETTINGS = {
 
 NUMBER_OF_DAYS_BEFORE_EMERGENCY_CANCELLATION = 2
 
+# Asynchronous bulk imports
+# WORKER: 'thread' to run them in a thread pool of the API process,
+# 'command' to leave them to the run_bulk_imports management command
+# STALE_TIMEOUT: seconds without progress after which a running bulk
+# import is failed, its worker having been stopped
+BULK_IMPORTS = {
+    'WORKER': config('BULK_IMPORTS_WORKER', default='thread'),
+    'MAX_WORKERS': config('BULK_IMPORTS_MAX_WORKERS', default=2, cast=int),
+    'STALE_TIMEOUT': config(
+        'BULK_IMPORTS_STALE_TIMEOUT',
+        default=600,
+        cast=int,
+    ),
+}
+
+# Outbox of the emails sent after an action, like a participation
+# WORKER: 'thread' to send them from a thread of the API process,
+# 'command' to leave them to the send_outbox_emails management command,
+# which retries the failed emails when run with --loop
+# RETRY_DELAY: seconds before retrying a failed email, doubled after
+# each attempt
+# SENDING_TIMEOUT: seconds after which an email still being sent is
+# considered lost, its worker having been stopped, and is sent again
+EMAIL_OUTBOX = {
+    'WORKER': config('EMAIL_OUTBOX_WORKER', default='thread'),
+    'MAX_ATTEMPTS': config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5, cast=int),
+    'RETRY_DELAY': config('EMAIL_OUTBOX_RETRY_DELAY', default=60, cast=int),
+    'SENDING_TIMEOUT': config(
+        'EMAIL_OUTBOX_SENDING_TIMEOUT',
+        default=600,
+        cast=int,
+    ),
+}
+
+# Digests reminding the volunteers of their upcoming participations
+# DAYS: participations starting within this number of days are reminded
+# BATCH_SIZE: number of users whose digests are queued per transaction
+REMINDER_DIGESTS = {
+    'DAYS': config('REMINDER_DIGESTS_DAYS', default=7, cast=int),
+    'BATCH_SIZE': config('REMINDER_DIGESTS_BATCH_SIZE', default=500, cast=int),
+}
+
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
 STATIC_ROOT = './static/'
 STATIC_DIR = os.path.join(BASE_DIR, 'static')
 STATICFILES_DIR = (os.path.join(BASE_DIR, "static"),)
 
+# Uploaded files
+MEDIA_ROOT = config('MEDIA_ROOT', default=os.path.join(BASE_DIR, 'media'))
+
 try:
     from api_volontaria.local_settings import *
 except ImportError:
@@ -0,0 +1,95 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytz
+from django.test import SimpleTestCase
+from django.utils.translation import ugettext_lazy as _
+from djmoney.money import Money
+from rest_framework.renderers import JSONRenderer
+
+from api_volontaria import renderers
+from api_volontaria.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+
+    DATA = {
+        'results': [
+            {
+                'id': 1,
+                'name': 'Événement\u2028',
+                'start_time': datetime(2140, 1, 15, 8, 30, tzinfo=pytz.utc),
+                'end_time': pytz.timezone('US/Eastern').localize(
+                    datetime(2140, 1, 15, 12, 0, 0, 500),
+                ),
+                'day': date(2140, 1, 15),
+                'duration': timedelta(hours=4),
+                'wage': Money('15.50', 'CAD'),
+                'ratio': Decimal('0.5'),
+                'label': _('Name'),
+                'nested': {2: None, 'ok': True},
+            },
+        ],
+    }
+
+    def test_render_like_json_renderer(self):
+        """
+        Ensure the responses are the same as with the default renderer
+        of Django REST framework, Money values being rendered like their
+        amount.
+        """
+        expected = JSONRenderer().render(
+            dict(self.DATA, results=[
+                dict(self.DATA['results'][0], wage=Decimal('15.50')),
+            ]),
+        )
+
+        self.assertEqual(FastJSONRenderer().render(self.DATA), expected)
+
+    def test_render_without_orjson(self):
+        """
+        Ensure the json module is used when orjson is not installed.
+        """
+        with patch.object(renderers, 'orjson', None):
+            content = FastJSONRenderer().render(self.DATA)
+
+        self.assertIn(b'"wage":15.5', content)
+
+    def test_render_indented(self):
+        """
+        Ensure an indented response can still be asked for.
+        """
+        content = FastJSONRenderer().render(
+            {'id': 1},
+            accepted_media_type='application/json; indent=4',
+        )
+
+        self.assertEqual(content, b'{\n    "id": 1\n}')
+
+    def test_render_large_integers(self):
+        """
+        Ensure the integers orjson can't encode are still rendered.
+        """
+        self.assertEqual(
+            FastJSONRenderer().render({'id': 2 ** 70}),
+            b'{"id":1180591620717411303424}',
+        )
+
+    def test_render_non_finite_floats(self):
+        """
+        Ensure the NaN and infinite floats, rejected by the default
+        renderer, are rendered as null with orjson and rejected without.
+        """
+        for value in [float('nan'), float('inf'), -float('inf')]:
+            data = {'results': [{'ratio': value}]}
+            with self.assertRaises(ValueError):
+                JSONRenderer().render(data)
+
+            self.assertEqual(
+                FastJSONRenderer().render(data),
+                b'{"results":[{"ratio":null}]}',
+            )
+            with patch.object(renderers, 'orjson', None):
+                with self.assertRaises(ValueError):
+                    FastJSONRenderer().render(data)
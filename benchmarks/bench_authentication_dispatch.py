@@ -0,0 +1,97 @@
+"""
+Time of the authentication of the requests to a public endpoint, the
+list of cells, with the chain of authentication classes and with
+DispatchingAuthentication, given no credentials, a session cookie or an
+API token.
+
+Usage: python benchmarks/bench_authentication_dispatch.py
+"""
+from utils import (
+    report,
+    setup_django,
+    test_database,
+    timeit,
+)
+
+NB_REQUESTS = 1000
+
+
+def main():
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.middleware import AuthenticationMiddleware
+    from django.contrib.sessions.middleware import SessionMiddleware
+    from django.test import Client
+    from rest_framework.authentication import (
+        SessionAuthentication,
+        TokenAuthentication,
+    )
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from api_volontaria.apps.user.authentication import (
+        APITokenAuthentication,
+        DispatchingAuthentication,
+    )
+    from api_volontaria.apps.user.models import APIToken
+    from api_volontaria.apps.volunteer.views import CellViewSet
+
+    User = get_user_model()
+
+    user = User.objects.create(email='volunteer@example.org')
+    token = APIToken.objects.create(user=user, purpose='Integration')
+    client = Client()
+    client.force_login(user)
+    session_cookie = client.cookies['sessionid'].value
+
+    factory = APIRequestFactory()
+    middlewares = [
+        SessionMiddleware(lambda request: None),
+        AuthenticationMiddleware(lambda request: None),
+    ]
+    view = CellViewSet(action='list', format_kwarg=None)
+
+    def authenticate(authenticators, **headers):
+        def run():
+            for _ in range(NB_REQUESTS):
+                request = factory.get('/cells', **headers)
+                for middleware in middlewares:
+                    middleware.process_request(request)
+                request = Request(
+                    request,
+                    authenticators=authenticators,
+                    parser_context={'view': view},
+                )
+                view.request = request
+                request.user
+        return run
+
+    chains = [
+        ('chain', [
+            APITokenAuthentication(),
+            TokenAuthentication(),
+            SessionAuthentication(),
+        ]),
+        ('dispatch', [DispatchingAuthentication()]),
+    ]
+    requests = [
+        ('no credentials', {}),
+        ('session cookie', {'HTTP_COOKIE': f'sessionid={session_cookie}'}),
+        ('API token', {'HTTP_AUTHORIZATION': f'APIToken {token.key}'}),
+    ]
+
+    results = []
+    for label, headers in requests:
+        for name, authenticators in chains:
+            duration = timeit(authenticate(authenticators, **headers))
+            results.append((
+                f'{label}, {name}',
+                f'{duration / NB_REQUESTS * 1e6:.1f}us per request',
+            ))
+
+    report('Authentication of the requests to the list of cells', results)
+
+
+if __name__ == '__main__':
+    setup_django()
+    with test_database():
+        main()
@@ -0,0 +1,113 @@
+"""
+Throughput of the bulk import of events for each supported file format,
+on the same rows. Reading alone and the whole import (reading, validation
+and insertion) are measured separately.
+
+Usage: python benchmarks/bench_bulk_formats.py [--rows 100000]
+"""
+import argparse
+import json
+import time
+from io import BytesIO
+
+from utils import (
+    create_events,
+    report,
+    setup_django,
+    test_database,
+)
+
+HEADER = ['description', 'start_time', 'end_time', 'cell', 'task_type']
+
+
+def make_files(rows):
+    from openpyxl import Workbook
+
+    csv_lines = [','.join(HEADER)]
+    csv_lines.extend(','.join(row) for row in rows)
+
+    jsonl_lines = [json.dumps(dict(zip(HEADER, row))) for row in rows]
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+    worksheet.append(HEADER)
+    for row in rows:
+        worksheet.append(row)
+    xlsx_file = BytesIO()
+    workbook.save(xlsx_file)
+
+    return {
+        'csv': '\n'.join(csv_lines).encode(),
+        'jsonl': '\n'.join(jsonl_lines).encode(),
+        'xlsx': xlsx_file.getvalue(),
+    }
+
+
+def main(nb_rows):
+    from django.db import transaction
+    from django.urls import reverse
+
+    from api_volontaria.apps.volunteer.helpers import (
+        BULK_READERS,
+        AddBulkConfig,
+        stream_bulk_from_file,
+    )
+    from api_volontaria.apps.volunteer.models import Cell, Event, TaskType
+    from api_volontaria.apps.volunteer.serializers import EventSerializer
+
+    create_events(0)
+    cells = [reverse('cell-detail', args=[pk])
+             for pk in Cell.objects.values_list('pk', flat=True)]
+    task_types = [reverse('tasktype-detail', args=[pk])
+                  for pk in TaskType.objects.values_list('pk', flat=True)]
+    rows = [
+        [
+            f'Event {i}',
+            '2140-01-15T08:00:00-05:00',
+            '2140-01-15T12:00:00-05:00',
+            cells[i % len(cells)],
+            task_types[i % len(task_types)],
+        ]
+        for i in range(nb_rows)
+    ]
+    files = make_files(rows)
+
+    results = []
+    for format_, content in files.items():
+        config = AddBulkConfig(EventSerializer, format_, {})
+
+        start = time.perf_counter()
+        nb_read = sum(1 for _ in BULK_READERS[format_](
+            BytesIO(content),
+            config,
+        ))
+        read_duration = time.perf_counter() - start
+        assert nb_read == nb_rows
+
+        start = time.perf_counter()
+        with transaction.atomic():
+            summary = stream_bulk_from_file(BytesIO(content), config)
+            import_duration = time.perf_counter() - start
+            assert summary.nb_created == nb_rows
+            # Same starting point for every format
+            transaction.set_rollback(True)
+        assert not Event.objects.exists()
+
+        results.append((
+            format_,
+            f'{len(content) / 1e6:.1f} MB, '
+            f'read {nb_rows / read_duration:,.0f} rows/s, '
+            f'import {nb_rows / import_duration:,.0f} rows/s',
+        ))
+
+    report(f'Bulk import of {nb_rows:,} events', results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        main(args.rows)
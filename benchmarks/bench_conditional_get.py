@@ -0,0 +1,71 @@
+"""
+Time of a page of 1,000 events and of the list of 100 cells returned in
+full and answered with a 304 Not Modified given their ETag.
+
+Usage: python benchmarks/bench_conditional_get.py
+"""
+from utils import (
+    create_events,
+    report,
+    setup_django,
+    test_database,
+    timeit,
+)
+
+NB_EVENTS = 1000
+NB_CELLS = 100
+
+
+def main():
+    from rest_framework.test import APIRequestFactory
+
+    from api_volontaria.apps.volunteer.models import Cell
+    from api_volontaria.apps.volunteer.views import CellViewSet, EventViewSet
+
+    create_events(NB_EVENTS)
+    cell = Cell.objects.first()
+    Cell.objects.bulk_create([
+        Cell(
+            name=f'Cell {i}',
+            address_line_1=cell.address_line_1,
+            postal_code=cell.postal_code,
+            city=cell.city,
+            state_province=cell.state_province,
+            longitude=cell.longitude,
+            latitude=cell.latitude,
+        )
+        for i in range(NB_CELLS - Cell.objects.count())
+    ])
+
+    factory = APIRequestFactory()
+    lists = [
+        (f'{NB_EVENTS:,} events', EventViewSet.as_view({'get': 'list'})),
+        (f'{NB_CELLS:,} cells', CellViewSet.as_view({'get': 'list'})),
+    ]
+
+    def get(view, **headers):
+        response = view(factory.get('/', {'limit': NB_EVENTS}, **headers))
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    results = []
+    for label, view in lists:
+        etag = get(view)['ETag']
+        assert get(view, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        full = timeit(lambda: get(view))
+        not_modified = timeit(lambda: get(view, HTTP_IF_NONE_MATCH=etag))
+        results += [
+            (f'{label}, 200', f'{full * 1000:.1f}ms'),
+            (f'{label}, 304', f'{not_modified * 1000:.1f}ms'),
+            ('speedup', f'x{full / not_modified:.1f}'),
+        ]
+
+    report('Conditional GET', results)
+
+
+if __name__ == '__main__':
+    setup_django()
+    with test_database():
+        main()
@@ -0,0 +1,87 @@
+"""
+Time of the total count of the participation list on 200,000
+participations, exact and cached, for a few sets of filters. The
+estimated counts need PostgreSQL, they are measured when DATABASE_URL
+points to one.
+
+Usage: python benchmarks/bench_counts.py [--participations 200000]
+"""
+import argparse
+
+from utils import (
+    create_events,
+    report,
+    setup_django,
+    test_database,
+    timeit,
+)
+
+NB_EVENTS = 2000
+
+
+def main(nb_participations):
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+
+    from api_volontaria.apps.volunteer.models import Event, Participation
+    from api_volontaria.apps.volunteer.views import ParticipationViewSet
+    from api_volontaria.pagination import (
+        cached_count,
+        estimate_count,
+    )
+
+    User = get_user_model()
+
+    create_events(NB_EVENTS)
+    event_ids = list(Event.objects.values_list('pk', flat=True))
+    nb_users = nb_participations // NB_EVENTS
+    User.objects.bulk_create(
+        [User(email=f'volunteer{i}@example.org') for i in range(nb_users)],
+        batch_size=500,
+    )
+    Participation.objects.bulk_create(
+        [
+            Participation(
+                event_id=event_id,
+                user_id=user_id,
+                is_standby=bool(user_id % 2),
+            )
+            for user_id in User.objects.values_list('pk', flat=True)
+            for event_id in event_ids
+        ],
+        batch_size=500,
+    )
+
+    participations = ParticipationViewSet.queryset
+    filters = [
+        ('all', participations.all()),
+        ('on standby', participations.filter(is_standby=True)),
+        ('events of 2140', participations.filter(
+            event__start_time__year=2140,
+        )),
+    ]
+
+    results = []
+    for label, queryset in filters:
+        exact = timeit(queryset.count)
+        cache.clear()
+        count = cached_count(queryset)
+        cached = timeit(lambda: cached_count(queryset))
+        line = f'{count:,} rows  exact {exact * 1000:.2f}ms  ' \
+               f'cached {cached * 1000:.2f}ms'
+        if estimate_count(queryset) is not None:
+            estimated = timeit(lambda: estimate_count(queryset))
+            line += f'  estimated {estimated * 1000:.2f}ms'
+        results.append((label, line))
+
+    report(f'Counts of {nb_participations:,} participations', results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--participations', type=int, default=200000)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        main(args.participations)
@@ -0,0 +1,122 @@
+"""
+Confirmation emails built per second for 10,000 participations spread
+over 100 events, compared with the previous implementation which rendered
+both templates with render_to_string and rebuilt the context of the event
+for every email.
+
+Usage: python benchmarks/bench_email_rendering.py
+"""
+import time
+
+from utils import (
+    create_events,
+    report,
+    setup_django,
+    test_database,
+)
+
+NB_EVENTS = 100
+NB_USERS = 100
+
+
+def main():
+    import pytz
+    from babel.dates import format_date
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.template.loader import render_to_string
+
+    from api_volontaria.apps.volunteer.models import Event, Participation
+
+    User = get_user_model()
+
+    def build_email_confirmation(participation):
+        """
+        Participation.build_email_confirmation as it was before templates
+        and event contexts were cached
+        """
+        start_time = participation.event.start_time
+        start_time = start_time.astimezone(pytz.timezone('US/Eastern'))
+
+        end_time = participation.event.end_time
+        end_time = end_time.astimezone(pytz.timezone('US/Eastern'))
+
+        context = {
+            'PARTICIPATION': {
+                'FIRST_NAME': participation.user.first_name,
+                'LAST_NAME': participation.user.last_name,
+                'TYPE': 'Bénévole',
+            },
+            'ACTIVITY': {
+                'NAME': participation.event.task_type.name,
+                'START_DATE': format_date(
+                    start_time,
+                    format='long',
+                    locale='fr'
+                ),
+                'START_TIME': start_time.strftime('%-Hh%M'),
+                'END_TIME': end_time.strftime('%-Hh%M'),
+            },
+            'CELL': {
+                'NAME': participation.event.cell.name,
+                'ADDRESS_LINE_1': participation.event.cell.address_line_1,
+                'ADDRESS_LINE_2': participation.event.cell.address_line_2,
+                'POSTAL_CODE': participation.event.cell.postal_code,
+                'CITY': participation.event.cell.city,
+                'STATE_PROVINCE': participation.event.cell.state_province,
+            },
+            'ORGANIZATION_NAME': settings.LOCAL_SETTINGS['ORGANIZATION'],
+        }
+        msg_file_name = 'participation_confirmation_email'
+        return (
+            render_to_string('.'.join([msg_file_name, 'txt']), context),
+            render_to_string('.'.join([msg_file_name, 'html']), context),
+        )
+
+    create_events(NB_EVENTS)
+    User.objects.bulk_create([
+        User(
+            email=f'volunteer{i}@example.org',
+            first_name=f'First name {i}',
+            last_name=f'Last name {i}',
+        )
+        for i in range(NB_USERS)
+    ])
+    # Inserted without signals, so no email is queued
+    Participation.objects.bulk_create([
+        Participation(event=event, user=user, is_standby=False)
+        for event in Event.objects.all()
+        for user in User.objects.all()
+    ])
+    participations = list(Participation.objects.select_related(
+        'user',
+        'event__cell',
+        'event__task_type',
+    ))
+    nb_emails = len(participations)
+
+    email = participations[0].build_email_confirmation()
+    assert (email.body, email.html_body) == \
+        build_email_confirmation(participations[0])
+
+    start = time.perf_counter()
+    for participation in participations:
+        build_email_confirmation(participation)
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for participation in participations:
+        participation.build_email_confirmation()
+    after = time.perf_counter() - start
+
+    report(f'Confirmation emails of {nb_emails:,} participations', [
+        ('render_to_string', f'{nb_emails / before:,.0f} emails/s'),
+        ('cached', f'{nb_emails / after:,.0f} emails/s'),
+        ('speedup', f'x{before / after:.2f}'),
+    ])
+
+
+if __name__ == '__main__':
+    setup_django()
+    with test_database():
+        main()
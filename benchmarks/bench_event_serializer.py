@@ -0,0 +1,78 @@
+"""
+Serialization time of 1,000 events with EventSerializer, compared with the
+previous implementation which built a new CellSerializer and
+TaskTypeSerializer for each event.
+
+Usage: python benchmarks/bench_event_serializer.py
+"""
+from utils import (
+    create_events,
+    report,
+    setup_django,
+    test_database,
+    timeit,
+)
+
+NB_EVENTS = 1000
+
+
+def main():
+    from rest_framework.request import Request
+    from rest_framework.serializers import HyperlinkedModelSerializer
+    from rest_framework.test import APIRequestFactory
+
+    from api_volontaria.apps.volunteer.models import Event
+    from api_volontaria.apps.volunteer.serializers import (
+        CellSerializer,
+        EventSerializer,
+        TaskTypeSerializer,
+    )
+
+    class UncachedEventSerializer(EventSerializer):
+        """
+        EventSerializer as it was before nested representations were cached
+        """
+
+        def to_representation(self, instance):
+            data = HyperlinkedModelSerializer.to_representation(
+                self,
+                instance,
+            )
+            data['task_type'] = TaskTypeSerializer(
+                instance.task_type,
+                context={'request': self.context['request']}
+            ).data
+            data['cell'] = CellSerializer(
+                instance.cell,
+                context={'request': self.context['request']}
+            ).data
+            return data
+
+    create_events(NB_EVENTS)
+    events = list(Event.objects.select_related('cell', 'task_type'))
+    request = Request(APIRequestFactory().get('/events'))
+
+    def serialize(serializer_class):
+        return lambda: serializer_class(
+            events,
+            many=True,
+            context={'request': request},
+        ).data
+
+    assert serialize(UncachedEventSerializer)() == \
+        serialize(EventSerializer)()
+
+    before = timeit(serialize(UncachedEventSerializer))
+    after = timeit(serialize(EventSerializer))
+
+    report(f'Serialization of {NB_EVENTS} events', [
+        ('without cache', f'{before * 1000:.1f} ms'),
+        ('with cache', f'{after * 1000:.1f} ms'),
+        ('speedup', f'x{before / after:.2f}'),
+    ])
+
+
+if __name__ == '__main__':
+    setup_django()
+    with test_database():
+        main()
@@ -0,0 +1,80 @@
+"""
+Render time of a page of 1,000 participations with their nested user,
+event, cell and task type, with the JSONRenderer of Django REST
+framework and with FastJSONRenderer (with and without orjson).
+
+Usage: python benchmarks/bench_json_renderer.py
+"""
+from unittest.mock import patch
+
+from utils import (
+    create_events,
+    report,
+    setup_django,
+    test_database,
+    timeit,
+)
+
+NB_PARTICIPATIONS = 1000
+
+
+def main():
+    from django.contrib.auth import get_user_model
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from api_volontaria import renderers
+    from api_volontaria.apps.volunteer.models import Event, Participation
+    from api_volontaria.apps.volunteer.serializers import (
+        ParticipationSerializer,
+    )
+    from api_volontaria.renderers import FastJSONRenderer
+
+    User = get_user_model()
+
+    create_events(NB_PARTICIPATIONS)
+    user = User.objects.create(email='volunteer@example.org')
+    Participation.objects.bulk_create([
+        Participation(event=event, user=user, is_standby=False)
+        for event in Event.objects.all()
+    ])
+    participations = Participation.objects.select_related(
+        'user',
+        'event__cell',
+        'event__task_type',
+    )
+    request = Request(APIRequestFactory().get('/participations'))
+    data = {
+        'count': NB_PARTICIPATIONS,
+        'next': None,
+        'previous': None,
+        'results': ParticipationSerializer(
+            participations,
+            many=True,
+            context={'request': request},
+        ).data,
+    }
+
+    assert JSONRenderer().render(data) == FastJSONRenderer().render(data)
+
+    def render_without_orjson():
+        with patch.object(renderers, 'orjson', None):
+            FastJSONRenderer().render(data)
+
+    json_renderer = timeit(lambda: JSONRenderer().render(data))
+    fast_renderer = timeit(lambda: FastJSONRenderer().render(data))
+    fallback = timeit(render_without_orjson)
+
+    report(f'Rendering of {NB_PARTICIPATIONS:,} nested participations', [
+        ('JSONRenderer', f'{json_renderer * 1000:.1f} ms'),
+        ('FastJSONRenderer', f'{fast_renderer * 1000:.1f} ms'),
+        ('without orjson', f'{fallback * 1000:.1f} ms'),
+        ('speedup', f'x{json_renderer / fast_renderer:.1f}'),
+    ])
+
+
+if __name__ == '__main__':
+    setup_django()
+    with test_database():
+        main()
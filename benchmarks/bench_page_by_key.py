@@ -0,0 +1,71 @@
+"""
+Request rate of the page of a key through the whole Django stack, with
+the /page/by-key/<key> route and its caches, and with the list filtered
+by key.
+
+Usage: python benchmarks/bench_page_by_key.py
+"""
+from utils import (
+    report,
+    setup_django,
+    test_database,
+    timeit,
+)
+
+NB_REQUESTS = 1000
+
+
+def main():
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    from api_volontaria.apps.page.models import Page, _pages_by_key
+
+    Page.objects.create(key='home', content='Welcome ' * 200)
+    client = Client()
+
+    def by_key(clear_local):
+        def run():
+            for _ in range(NB_REQUESTS):
+                if clear_local:
+                    _pages_by_key.clear()
+                client.get('/page/by-key/home')
+        return run
+
+    def filtered_list():
+        for _ in range(NB_REQUESTS):
+            client.get('/page', {'key': 'home'})
+
+    no_shared_cache = {
+        'MAXSIZE': 256,
+        'LOCAL_TIMEOUT': 10,
+        'SHARED_CACHE': None,
+        'SHARED_TIMEOUT': 3600,
+    }
+    shared_cache = dict(no_shared_cache, SHARED_CACHE='default')
+    no_response_cache = {'ENABLED': False, 'CACHE': 'responses'}
+    cases = [
+        ('?key=, no response cache', filtered_list, {
+            'RESPONSE_CACHE': no_response_cache,
+        }),
+        ('?key=, response cache', filtered_list, {}),
+        ('by-key, database', by_key(True), {
+            'PAGE_CACHE': no_shared_cache,
+        }),
+        ('by-key, shared cache', by_key(True), {'PAGE_CACHE': shared_cache}),
+        ('by-key, process memory', by_key(False), {}),
+    ]
+
+    results = []
+    for label, run, overrides in cases:
+        with override_settings(**overrides):
+            duration = timeit(run, repeat=3)
+        results.append((label, f'{NB_REQUESTS / duration:,.0f} requests/s'))
+
+    report('Anonymous requests of a page by key', results)
+
+
+if __name__ == '__main__':
+    setup_django()
+    with test_database():
+        main()
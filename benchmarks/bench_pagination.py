@@ -0,0 +1,82 @@
+"""
+Time to fetch a page of 100 events at increasing depths of a list of
+100,000 events, with the limit/offset pagination (with and without the
+total count) and with the cursor pagination.
+
+Usage: python benchmarks/bench_pagination.py [--events 100000]
+"""
+import argparse
+
+from utils import (
+    create_events,
+    report,
+    setup_django,
+    test_database,
+    timeit,
+)
+
+PAGE_SIZE = 100
+
+
+def main(nb_events):
+    from urllib.parse import parse_qs, urlparse
+
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from api_volontaria.apps.volunteer.models import Event
+    from api_volontaria.apps.volunteer.views import EventViewSet
+    from api_volontaria.pagination import CursorOrLimitOffsetPagination
+
+    create_events(nb_events)
+    factory = APIRequestFactory()
+    view = EventViewSet()
+    queryset = Event.objects.order_by(*EventViewSet.cursor_ordering)
+
+    def fetch_page(query):
+        paginator = CursorOrLimitOffsetPagination()
+        request = Request(factory.get('/events', query))
+        return paginator.paginate_queryset(queryset, request, view)
+
+    def cursor_at(offset):
+        """
+        Cursor of the page starting at offset, as found in the next link
+        of the previous page
+        """
+        paginator = CursorOrLimitOffsetPagination()
+        request = Request(factory.get('/events', {'pagination': 'cursor'}))
+        paginator.paginate_queryset(queryset, request, view)
+        instance = queryset[offset - 1]
+        link = paginator.encode_cursor(instance, reverse=False)
+        return parse_qs(urlparse(link).query)['cursor'][0]
+
+    results = []
+    for offset in (0, nb_events // 10, nb_events // 2, nb_events - PAGE_SIZE):
+        offset_query = {'limit': PAGE_SIZE, 'offset': offset}
+        if offset:
+            cursor_query = {'limit': PAGE_SIZE, 'cursor': cursor_at(offset)}
+        else:
+            cursor_query = {'limit': PAGE_SIZE, 'pagination': 'cursor'}
+        assert fetch_page(offset_query) == fetch_page(cursor_query)
+
+        limit_offset = timeit(lambda: fetch_page(offset_query))
+        no_count = timeit(lambda: fetch_page(dict(offset_query, count=0)))
+        cursor = timeit(lambda: fetch_page(cursor_query))
+        results.append((
+            f'offset {offset:,}',
+            f'limit/offset {limit_offset * 1000:.1f}ms  '
+            f'without count {no_count * 1000:.1f}ms  '
+            f'cursor {cursor * 1000:.1f}ms',
+        ))
+
+    report(f'Pages of {PAGE_SIZE} events out of {nb_events:,}', results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=100000)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        main(args.events)
@@ -0,0 +1,102 @@
+"""
+Duration and peak memory of the reminder digests of 100,000 participations
+of 10,000 users, queued by the send_reminder_digests command.
+
+Usage: python benchmarks/bench_reminder_digests.py [--users 10000]
+"""
+import argparse
+import time
+import tracemalloc
+
+from utils import (
+    create_events,
+    report,
+    setup_django,
+    test_database,
+)
+
+NB_EVENTS = 200
+PARTICIPATIONS_PER_USER = 10
+
+
+def main(nb_users):
+    from datetime import datetime
+
+    import pytz
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+
+    from api_volontaria.apps.notification.models import OutboxEmail
+    from api_volontaria.apps.volunteer.digests import queue_reminder_digests
+    from api_volontaria.apps.volunteer.models import Event, Participation
+
+    User = get_user_model()
+
+    # Only measure the queuing of the digests, not their sending
+    settings.EMAIL_OUTBOX['WORKER'] = 'command'
+
+    create_events(NB_EVENTS)
+    event_ids = list(Event.objects.values_list('pk', flat=True))
+    User.objects.bulk_create(
+        [
+            User(
+                email=f'volunteer{i}@example.org',
+                first_name=f'First name {i}',
+                last_name=f'Last name {i}',
+            )
+            for i in range(nb_users)
+        ],
+        batch_size=500,
+    )
+    # Inserted without signals, so no email is queued
+    Participation.objects.bulk_create(
+        [
+            Participation(
+                event_id=event_ids[(i + j) % len(event_ids)],
+                user_id=user_id,
+                is_standby=False,
+            )
+            for i, user_id in enumerate(
+                User.objects.values_list('pk', flat=True)
+            )
+            for j in range(PARTICIPATIONS_PER_USER)
+        ],
+        batch_size=500,
+    )
+    nb_participations = Participation.objects.count()
+
+    def run():
+        Participation.objects.update(reminded_at=None)
+        OutboxEmail.objects.all().delete()
+        start = time.perf_counter()
+        # All the events created start in 2140
+        result = queue_reminder_digests(
+            datetime(2100, 1, 1, tzinfo=pytz.utc),
+            datetime(2200, 1, 1, tzinfo=pytz.utc),
+        )
+        return result, time.perf_counter() - start
+
+    (nb_digests, nb_reminded), duration = run()
+    assert nb_digests == nb_users and nb_reminded == nb_participations
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    report(f'Reminder digests of {nb_participations:,} participations', [
+        ('digests queued', f'{nb_digests:,}'),
+        ('duration', f'{duration:.1f}s'),
+        ('participations', f'{nb_participations / duration:,.0f}/s'),
+        ('peak memory', f'{peak / 2 ** 20:.1f} MiB'),
+    ])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=10000)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        main(args.users)
@@ -0,0 +1,61 @@
+"""
+Time of the anonymous requests of a page of 1,000 events and of the list
+of cells, computed and served from the response cache.
+
+Usage: python benchmarks/bench_response_cache.py
+"""
+from utils import (
+    create_events,
+    report,
+    setup_django,
+    test_database,
+    timeit,
+)
+
+NB_EVENTS = 1000
+
+
+def main():
+    from django.test.utils import override_settings
+    from rest_framework.test import APIRequestFactory
+
+    from api_volontaria.apps.volunteer.views import CellViewSet, EventViewSet
+
+    create_events(NB_EVENTS)
+
+    factory = APIRequestFactory()
+    lists = [
+        (f'{NB_EVENTS:,} events', EventViewSet.as_view({'get': 'list'})),
+        ('cells', CellViewSet.as_view({'get': 'list'})),
+    ]
+
+    def get(view):
+        response = view(factory.get('/', {'limit': NB_EVENTS}))
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    results = []
+    for label, view in lists:
+        with override_settings(RESPONSE_CACHE={
+            'ENABLED': False,
+            'CACHE': 'responses',
+        }):
+            computed = timeit(lambda: get(view))
+
+        assert get(view)['X-Cache'] in ('HIT', 'MISS')
+        assert get(view)['X-Cache'] == 'HIT'
+        cached = timeit(lambda: get(view))
+        results += [
+            (f'{label}, computed', f'{computed * 1000:.1f}ms'),
+            (f'{label}, cached', f'{cached * 1000:.1f}ms'),
+            ('speedup', f'x{computed / cached:.1f}'),
+        ]
+
+    report('Anonymous requests', results)
+
+
+if __name__ == '__main__':
+    setup_django()
+    with test_database():
+        main()
@@ -0,0 +1,83 @@
+"""
+Time and payload size of a page of 1,000 events and of 1,000
+participations, with all their nested relations and with the ?fields=
+and ?expand= parameters of a calendar only needing the times and the
+headcounts.
+
+Usage: python benchmarks/bench_sparse_fields.py
+"""
+from utils import (
+    create_events,
+    report,
+    setup_django,
+    test_database,
+    timeit,
+)
+
+NB_EVENTS = 1000
+CALENDAR_FIELDS = 'id,start_time,end_time,nb_volunteers,nb_volunteers_standby'
+
+
+def main():
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from api_volontaria.apps.volunteer.models import Event, Participation
+    from api_volontaria.apps.volunteer.views import (
+        EventViewSet,
+        ParticipationViewSet,
+    )
+
+    User = get_user_model()
+
+    create_events(NB_EVENTS)
+    admin = User.objects.create(email='admin@example.org', is_staff=True)
+    Participation.objects.bulk_create([
+        Participation(event=event, user=admin, is_standby=False)
+        for event in Event.objects.all()
+    ])
+
+    factory = APIRequestFactory()
+    event_list = EventViewSet.as_view({'get': 'list'})
+    participation_list = ParticipationViewSet.as_view({'get': 'list'})
+
+    def get(view, query):
+        request = factory.get('/', dict(query, limit=NB_EVENTS))
+        force_authenticate(request, user=admin)
+        response = view(request)
+        response.render()
+        return response
+
+    requests = [
+        ('events', event_list, {}),
+        ('events, calendar fields', event_list, {
+            'fields': CALENDAR_FIELDS,
+        }),
+        ('participations', participation_list, {}),
+        ('participations, event without relations', participation_list, {
+            'fields': 'id,is_standby,event',
+            'expand': 'event',
+        }),
+    ]
+
+    results = []
+    for label, view, query in requests:
+        with CaptureQueriesContext(connection) as queries:
+            response = get(view, query)
+        duration = timeit(lambda: get(view, query))
+        results.append((
+            label,
+            f'{duration * 1000:.1f}ms  {len(response.content):,} bytes  '
+            f'{len(queries)} queries, '
+            f'{queries[-1]["sql"].count(" JOIN ")} joins',
+        ))
+
+    report(f'Pages of {NB_EVENTS:,} elements', results)
+
+
+if __name__ == '__main__':
+    setup_django()
+    with test_database():
+        main()
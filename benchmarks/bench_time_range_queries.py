@@ -0,0 +1,153 @@
+"""
+EXPLAIN plans and latency of the filters of the event and participation
+lists on 100,000 events and 100,000 participations, with and without the
+indexes matching them.
+
+Each filter is measured as the list view runs it: a count and a page of
+100 rows.
+
+Usage: python benchmarks/bench_time_range_queries.py [--events 100000]
+"""
+import argparse
+
+from utils import (
+    create_events,
+    report,
+    setup_django,
+    test_database,
+    timeit,
+)
+
+NB_USERS = 1000
+PARTICIPATIONS_PER_USER = 100
+PAGE_SIZE = 100
+
+
+def main(nb_events):
+    from datetime import datetime, timedelta
+
+    import pytz
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+
+    from api_volontaria.apps.volunteer.models import (
+        Cell,
+        Event,
+        Participation,
+    )
+
+    User = get_user_model()
+    local_timezone = pytz.timezone(settings.TIME_ZONE)
+
+    create_events(nb_events)
+    event_ids = list(Event.objects.values_list('pk', flat=True))
+    User.objects.bulk_create(
+        [
+            User(email=f'volunteer{i}@example.org')
+            for i in range(NB_USERS)
+        ],
+        batch_size=500,
+    )
+    user_ids = list(User.objects.values_list('pk', flat=True))
+    Participation.objects.bulk_create(
+        [
+            Participation(
+                event_id=event_ids[
+                    (i * PARTICIPATIONS_PER_USER + j) % len(event_ids)
+                ],
+                user_id=user_id,
+                is_standby=False,
+            )
+            for i, user_id in enumerate(user_ids)
+            for j in range(PARTICIPATIONS_PER_USER)
+        ],
+        batch_size=500,
+    )
+    # Spread the registrations over a year instead of the seeding time
+    registered_at = local_timezone.localize(datetime(2139, 1, 1))
+    for i, user_id in enumerate(user_ids):
+        Participation.objects.filter(user_id=user_id).update(
+            registered_at=registered_at + timedelta(hours=i * 8),
+        )
+
+    # A week of events, the events being created one per hour
+    week_start = local_timezone.localize(datetime(2140, 3, 1))
+    week_end = week_start + timedelta(days=7)
+    cell = Cell.objects.first()
+    user_id = user_ids[len(user_ids) // 2]
+
+    events = Event.objects.all()
+    participations = Participation.objects.all()
+    filters = [
+        ('event start_time range', events.filter(
+            start_time__gte=week_start,
+            start_time__lte=week_end,
+        )),
+        ('event start_time and end_time range', events.filter(
+            start_time__gte=week_start,
+            end_time__lte=week_end,
+        )),
+        ('event cell and start_time range', events.filter(
+            cell=cell,
+            start_time__gte=week_start,
+            start_time__lte=week_end,
+        )),
+        ('participation user', participations.filter(
+            user_id=user_id,
+        )),
+        ('participation user and event start_time', participations.filter(
+            user_id=user_id,
+            event__start_time__gte=week_start,
+        )),
+        ('participation event start_time range', participations.filter(
+            event__start_time__gte=week_start,
+            event__start_time__lte=week_end,
+        )),
+        ('participation registered_at range', participations.filter(
+            registered_at__gte=registered_at + timedelta(days=100),
+            registered_at__lte=registered_at + timedelta(days=107),
+        )),
+    ]
+
+    indexes = [
+        (model, index)
+        for model in (Event, Participation)
+        for index in model._meta.indexes
+    ]
+
+    def run(title):
+        results = []
+        for label, queryset in filters:
+            def list_page():
+                queryset.count()
+                list(queryset[:PAGE_SIZE])
+
+            results.append((label, f'{timeit(list_page) * 1000:.2f}ms'))
+
+        report(f'{title}: latency of a count and a page', results)
+        for label, queryset in filters:
+            print(f'{label}:')
+            for line in queryset[:PAGE_SIZE].explain().splitlines():
+                print(f'    {line}')
+        print()
+
+    with connection.schema_editor() as schema_editor:
+        for model, index in indexes:
+            schema_editor.remove_index(model, index)
+    run('Without indexes')
+
+    with connection.schema_editor() as schema_editor:
+        for model, index in indexes:
+            schema_editor.add_index(model, index)
+    run('With indexes')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=100000)
+    args = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        main(args.events)
@@ -0,0 +1,58 @@
+"""
+Time of the authentication of a request with an API token, reading the
+token from the database and from the token cache.
+
+Usage: python benchmarks/bench_token_authentication.py
+"""
+from utils import (
+    report,
+    setup_django,
+    test_database,
+    timeit,
+)
+
+NB_REQUESTS = 10000
+
+
+def main():
+    from django.contrib.auth import get_user_model
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from api_volontaria.apps.user.authentication import (
+        APITokenAuthentication,
+    )
+    from api_volontaria.apps.user.models import APIToken, _api_tokens
+
+    User = get_user_model()
+
+    user = User.objects.create(email='integration@example.org')
+    token = APIToken.objects.create(user=user, purpose='Integration')
+    request = Request(APIRequestFactory().get(
+        '/',
+        HTTP_AUTHORIZATION=f'APIToken {token.key}',
+    ))
+    authentication = APITokenAuthentication()
+
+    def authenticate(clear_cache):
+        def run():
+            for _ in range(NB_REQUESTS):
+                if clear_cache:
+                    _api_tokens.clear()
+                authentication.authenticate(request)
+        return run
+
+    database = timeit(authenticate(True))
+    cached = timeit(authenticate(False))
+
+    report(f'Authentication of {NB_REQUESTS:,} requests', [
+        ('database', f'{database / NB_REQUESTS * 1e6:.1f}us per request'),
+        ('cache', f'{cached / NB_REQUESTS * 1e6:.1f}us per request'),
+        ('speedup', f'x{database / cached:.1f}'),
+    ])
+
+
+if __name__ == '__main__':
+    setup_django()
+    with test_database():
+        main()
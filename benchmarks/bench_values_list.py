@@ -0,0 +1,58 @@
+"""
+Time of a page of 1,000 events built by the serializer from model
+instances and from QuerySet.values() rows, with all the fields and with
+their cell and task type expanded.
+
+Usage: python benchmarks/bench_values_list.py
+"""
+from utils import (
+    create_events,
+    report,
+    setup_django,
+    test_database,
+    timeit,
+)
+
+NB_EVENTS = 1000
+
+
+def main():
+    from rest_framework import mixins
+    from rest_framework.test import APIRequestFactory
+
+    from api_volontaria.apps.volunteer.views import EventViewSet
+
+    class SerializerEventViewSet(EventViewSet):
+        list = mixins.ListModelMixin.list
+
+    create_events(NB_EVENTS)
+
+    factory = APIRequestFactory()
+    views = [
+        ('serializer', SerializerEventViewSet.as_view({'get': 'list'})),
+        ('values()', EventViewSet.as_view({'get': 'list'})),
+    ]
+
+    def get(view, query):
+        response = view(factory.get('/', dict(query, limit=NB_EVENTS)))
+        response.render()
+        return response
+
+    results = []
+    for query in ({}, {'expand': 'cell,task_type'}):
+        durations = []
+        for label, view in views:
+            durations.append(timeit(lambda: get(view, query)))
+            results.append((
+                f'{label} {query or ""}',
+                f'{durations[-1] * 1000:.1f}ms',
+            ))
+        results.append(('speedup', f'x{durations[0] / durations[1]:.1f}'))
+
+    report(f'Pages of {NB_EVENTS:,} events', results)
+
+
+if __name__ == '__main__':
+    setup_django()
+    with test_database():
+        main()
@@ -0,0 +1,111 @@
+"""
+Helpers shared by the benchmark scripts.
+
+The benchmarks run against a throwaway test database created from the
+configured DATABASE_URL (like `manage.py test` does), so they never touch
+existing data.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+REPOSITORY_PATH = Path(__file__).absolute().parent.parent
+
+
+def setup_django():
+    sys.path.insert(0, str(REPOSITORY_PATH))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_volontaria.settings')
+
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+def timeit(function, repeat=5):
+    """
+    Best wall-clock time of `repeat` calls of function, in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return best
+
+
+def report(title, results):
+    """
+    Print a table of (label, value) results under a title
+    """
+    print(title)
+    print('-' * len(title))
+    width = max(len(label) for label, _ in results)
+    for label, value in results:
+        print(f'{label.ljust(width)}  {value}')
+    print()
+
+
+def create_events(nb_events, nb_cells=10, nb_task_types=5):
+    """
+    Bulk create nb_events events spread over a few cells and task types
+    """
+    from datetime import datetime, timedelta
+
+    import pytz
+    from django.conf import settings
+
+    from api_volontaria.apps.volunteer.models import Cell, Event, TaskType
+
+    local_timezone = pytz.timezone(settings.TIME_ZONE)
+
+    Cell.objects.bulk_create([
+        Cell(
+            name=f'Cell {i}',
+            address_line_1='373 Rue villeneuve E',
+            postal_code='H2T 1M1',
+            city='Montreal',
+            state_province='Quebec',
+            longitude=45.540237,
+            latitude=-73.603421,
+        )
+        for i in range(nb_cells)
+    ])
+    cells = list(Cell.objects.all())
+    TaskType.objects.bulk_create([
+        TaskType(name=f'Task type {i}') for i in range(nb_task_types)
+    ])
+    task_types = list(TaskType.objects.all())
+
+    start = local_timezone.localize(datetime(2140, 1, 1, 8))
+    Event.objects.bulk_create([
+        Event(
+            description=f'Event {i}',
+            start_time=start + timedelta(hours=i),
+            end_time=start + timedelta(hours=i + 3),
+            nb_volunteers_needed=10,
+            cell=cells[i % len(cells)],
+            task_type=task_types[i % len(task_types)],
+        )
+        for i in range(nb_events)
+    ])